@@ -0,0 +1,301 @@
+# benchmarks/run.py
+"""
+Offline benchmarks of the framework itself: core BasePage/Waiter operations and complete
+page-object flows, timed against the local replica of the YuvanBank pages (benchmarks/site,
+served by benchmarks/server.py) in headless Chrome. Results, with per-benchmark variance
+statistics and the raw samples, are written as JSON.
+
+    python -m benchmarks.run                                  # -> benchmarks/results/latest.json
+    python -m benchmarks.run --repeat 50 --only type,fill_form --wait-mode observe --out before.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from argparse import BooleanOptionalAction
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import selenium
+
+from benchmarks.server import ReplicaServer
+from core.base_page import BasePage
+from core.driver_factory import DriverFactory
+from core.navigation import NavigationPlanner, set_planner
+from core.retry import RetryPolicy, set_policy
+from core.stable_ui import StableUI
+from core.user_seed import seed_users
+from core.wait import Waiter
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+from utils.config_reader import Config
+from utils.perf_history import git_sha
+
+PASSWORD = "Bench@1234"
+
+
+class Context:
+    """What every benchmark gets: the session, the replica's base URL and page objects on it."""
+
+    def __init__(self, driver, base_url: str):
+        self.driver = driver
+        self.base_url = base_url
+        self.home = HomePage(driver, base_url)
+        self.register = RegisterPage(driver, base_url)
+        self.login = LoginPage(driver, base_url)
+        self._ids = count(1)
+        self.user: Optional[Dict[str, str]] = None
+
+    def next_email(self) -> str:
+        return f"bench.user{next(self._ids)}.{int(time.time())}@example.com"
+
+    def on_register_page(self) -> None:
+        if not self.driver.current_url.endswith("/register.html"):
+            self.register.open_register_page(plan=False)
+
+
+class Benchmark:
+    __slots__ = ("name", "group", "run", "setup")
+
+    def __init__(self, name: str, group: str, run: Callable[[Context], Any],
+                 setup: Optional[Callable[[Context], Any]] = None):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.setup = setup
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, group: str = "operation", setup: Optional[Callable[[Context], Any]] = None):
+    """Register `fn(ctx)` as a benchmark; `setup(ctx)` runs untimed before every iteration."""
+    def deco(fn):
+        BENCHMARKS.append(Benchmark(name, group, fn, setup))
+        return fn
+    return deco
+
+
+# ---------------- operations ----------------
+def _fresh_register(ctx: Context) -> None:
+    ctx.register.open_register_page(plan=False)
+
+
+def _register_with_errors(ctx: Context) -> None:
+    ctx.register.open_register_page(plan=False)
+    ctx.register.click_register_button()
+    ctx.register.wait_visible(ctx.register.EMAIL_VALIDATION_ERROR)
+
+
+@benchmark("open")
+def _open(ctx: Context) -> None:
+    ctx.register.open_register_page(plan=False)
+
+
+@benchmark("type", setup=Context.on_register_page)
+def _type(ctx: Context) -> None:
+    ctx.register.type(ctx.register.EMAIL, "bench.user@example.com")
+
+
+@benchmark("fill_form", setup=Context.on_register_page)
+def _fill_form(ctx: Context) -> None:
+    ctx.register.fill_registration_form("Bench", "User", "bench.user@example.com", PASSWORD, PASSWORD)
+
+
+@benchmark("click", setup=_fresh_register)
+def _click(ctx: Context) -> None:
+    ctx.register.click(ctx.register.REGISTER_BTN)
+
+
+@benchmark("text_of", setup=_register_with_errors)
+def _text_of(ctx: Context) -> None:
+    assert ctx.register.email_validation_error() == "Email is required."
+
+
+@benchmark("wait_visible", setup=Context.on_register_page)
+def _wait_visible(ctx: Context) -> None:
+    ctx.register.wait_visible(ctx.register.REGISTER_BTN)
+
+
+@benchmark("wait_visible (after submit)", setup=_fresh_register)
+def _wait_after_submit(ctx: Context) -> None:
+    ctx.driver.execute_script("document.getElementById('registerForm').requestSubmit();")
+    ctx.register.wait_visible(ctx.register.EMAIL_VALIDATION_ERROR)
+
+
+@benchmark("wait_url_contains", setup=Context.on_register_page)
+def _wait_url(ctx: Context) -> None:
+    ctx.register.wait_url_contains("/register.html")
+
+
+@benchmark("is_visible (absent, now)", setup=Context.on_register_page)
+def _is_visible_absent(ctx: Context) -> None:
+    assert not ctx.register.is_visible(ctx.login.SETTINGS_BTN, mode="now")
+
+
+# ---------------- page-object flows ----------------
+def _seed_login_user(ctx: Context) -> None:
+    if ctx.user is None:
+        ctx.user = {"FirstName": "Bench", "LastName": "User", "Email": ctx.next_email(), "Password": PASSWORD}
+        seed_users(ctx.driver, [ctx.user], ctx.base_url)
+
+
+@benchmark("register flow", group="flow")
+def _register_flow(ctx: Context) -> None:
+    ctx.home.open_home()
+    ctx.register.open_register_page()
+    ctx.register.fill_registration_form("Bench", "User", ctx.next_email(), PASSWORD, PASSWORD)
+    ctx.register.click_register_button()
+    ctx.login.wait_visible(ctx.login.WELCOME_TITLE)
+
+
+@benchmark("login flow", group="flow", setup=_seed_login_user)
+def _login_flow(ctx: Context) -> None:
+    ctx.login.open_login_page()
+    ctx.login.fill_credentials(ctx.user["Email"], ctx.user["Password"])
+    ctx.login.click_login_btn()
+    ctx.login.wait_visible(ctx.login.SETTINGS_BTN)
+
+
+@benchmark("register validation flow", group="flow")
+def _register_validation_flow(ctx: Context) -> None:
+    ctx.register.open_register_page()
+    ctx.register.fill_registration_form("Bench", "User", "not-an-email", PASSWORD, PASSWORD)
+    ctx.register.click_register_button()
+    assert ctx.register.email_validation_error() == "Enter a valid email address."
+
+
+@benchmark("login validation flow", group="flow")
+def _login_validation_flow(ctx: Context) -> None:
+    ctx.login.open_login_page()
+    ctx.login.click_login_btn()
+    assert ctx.login.empty_form_errors() == ("Please fix the errors above.", "Email is required.",
+                                             "Password is required.")
+
+
+# ---------------- running ----------------
+def summarize(samples_ms: List[float]) -> Dict[str, Any]:
+    """Variance statistics of one benchmark's samples (ms)."""
+    n = len(samples_ms)
+    mean = statistics.fmean(samples_ms)
+    stdev = statistics.stdev(samples_ms) if n > 1 else 0.0
+    p95 = statistics.quantiles(samples_ms, n=20, method="inclusive")[18] if n > 1 else samples_ms[0]
+    return {
+        "n": n,
+        "mean_ms": round(mean, 2),
+        "median_ms": round(statistics.median(samples_ms), 2),
+        "stdev_ms": round(stdev, 2),
+        "cv": round(stdev / mean, 4) if mean else 0.0,
+        "ci95_ms": round(1.96 * stdev / math.sqrt(n), 2),
+        "p95_ms": round(p95, 2),
+        "min_ms": round(min(samples_ms), 2),
+        "max_ms": round(max(samples_ms), 2),
+        "samples_ms": [round(s, 3) for s in samples_ms],
+    }
+
+
+def run_benchmark(ctx: Context, bench: Benchmark, repeat: int, warmup: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    for i in range(warmup + repeat):
+        if bench.setup is not None:
+            bench.setup(ctx)
+        started = time.perf_counter()
+        bench.run(ctx)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    return {"name": bench.name, "group": bench.group, **summarize(samples)}
+
+
+def configure(args) -> Dict[str, Any]:
+    """Framework settings as conftest would apply them; returned for the results' metadata."""
+    cfg = Config()
+    Waiter.default_mode = args.wait_mode
+    BasePage.query_mode = cfg.query_mode
+    BasePage.negative_grace = cfg.negative_grace
+    BasePage.element_cache = args.element_cache
+    set_policy(RetryPolicy(timeout=cfg.action_timeout, backoff=cfg.retry_backoff, backoff_max=cfg.retry_backoff_max))
+    set_planner(NavigationPlanner(defer=args.defer_navigation) if args.plan_navigation else None)
+    return {"wait_mode": args.wait_mode, "element_cache": args.element_cache,
+            "plan_navigation": args.plan_navigation, "defer_navigation": args.defer_navigation, "stable_ui": args.stable_ui}
+
+
+def _parse(argv: Optional[List[str]]) -> argparse.Namespace:
+    cfg = Config()
+    p = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    p.add_argument("--repeat", type=int, default=20, help="Timed iterations per benchmark.")
+    p.add_argument("--warmup", type=int, default=3, help="Untimed iterations first.")
+    p.add_argument("--only", default="", help="Comma-separated benchmark names (default: all).")
+    p.add_argument("--browser", default="chrome")
+    p.add_argument("--headed", action="store_true", help="Show the browser (default: headless).")
+    p.add_argument("--wait-mode", choices=["poll", "observe"], default=cfg.wait_mode)
+    p.add_argument("--element-cache", action=BooleanOptionalAction, default=cfg.element_cache)
+    p.add_argument("--plan-navigation", action=BooleanOptionalAction, default=cfg.navigation_planner)
+    p.add_argument("--defer-navigation", action=BooleanOptionalAction, default=cfg.navigation_defer)
+    p.add_argument("--stable-ui", action=BooleanOptionalAction, default=cfg.stable_ui)
+    p.add_argument("--out", default="benchmarks/results/latest.json")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse(argv)
+    only = {n.strip() for n in args.only.split(",") if n.strip()}
+    selected = [b for b in BENCHMARKS if not only or b.name in only]
+    if not selected:
+        print(f"No benchmark named {sorted(only)}; available: {[b.name for b in BENCHMARKS]}", file=sys.stderr)
+        return 2
+    settings = configure(args)
+
+    results: List[Dict[str, Any]] = []
+    failed = 0
+    with ReplicaServer() as base_url:
+        driver = DriverFactory.create_driver(browser=args.browser, headless=not args.headed,
+                                             stable_ui=StableUI() if args.stable_ui else None)
+        caps = dict(driver.capabilities or {})
+        try:
+            ctx = Context(driver, base_url)
+            for bench in selected:
+                try:
+                    results.append(run_benchmark(ctx, bench, args.repeat, args.warmup))
+                except Exception as e:
+                    failed += 1
+                    results.append({"name": bench.name, "group": bench.group, "error": f"{type(e).__name__}: {e}"})
+                r = results[-1]
+                print(f"{bench.group:<9} {bench.name:<28} " + (
+                    f"median {r['median_ms']:8.1f}ms  p95 {r['p95_ms']:8.1f}ms  cv {r['cv']:.1%}"
+                    if "error" not in r else f"ERROR {r['error']}"), flush=True)
+        finally:
+            driver.quit()
+
+    doc = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_sha": git_sha(),
+            "python": platform.python_version(),
+            "selenium": selenium.__version__,
+            "browser": caps.get("browserName", args.browser),
+            "browser_version": caps.get("browserVersion", ""),
+            "platform": platform.platform(),
+            "headless": not args.headed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "settings": settings,
+        },
+        "results": results,
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=1), "utf-8")
+    print(f"-> {out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
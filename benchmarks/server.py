@@ -0,0 +1,69 @@
+# benchmarks/server.py
+from __future__ import annotations
+
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Union
+
+SITE_DIR = Path(__file__).resolve().parent / "site"
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def end_headers(self):
+        # every open() really loads the page, as a first visit to the QA site would
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplicaServer:
+    """
+    Serves the local replica of the YuvanBank pages (benchmarks/site) on 127.0.0.1 from a
+    background thread; port 0 picks a free port. Use as a context manager:
+
+        with ReplicaServer() as base_url:
+            RegisterPage(driver, base_url).open_register_page()
+    """
+
+    def __init__(self, root: Union[str, Path] = SITE_DIR, host: str = "127.0.0.1", port: int = 0):
+        self.root = Path(root)
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        self._httpd = ThreadingHTTPServer((self.host, self.port), partial(_QuietHandler, directory=str(self.root)))
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replica-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":  # browse the replica by hand: python -m benchmarks.server
+    server = ReplicaServer(port=8000)
+    print(f"Serving {server.root} at {server.start()} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
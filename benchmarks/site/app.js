@@ -0,0 +1,44 @@
+// Users live in localStorage, as on the real site (same key and record shape as core/user_seed.py).
+var USERS_KEY = 'yuvanbank_users';
+var EMAIL_RE = /^[^\s@]+@[^\s@]+\.[^\s@]{2,}$/;
+var NAME_RE = /^[A-Za-z]{3,25}$/;
+
+function getUsers() {
+  try { return JSON.parse(localStorage.getItem(USERS_KEY) || '[]') || []; } catch (e) { return []; }
+}
+function findUser(email) {
+  email = email.trim().toLowerCase();
+  return getUsers().filter(function (u) { return (u.email || '').toLowerCase() === email; })[0] || null;
+}
+function addUser(user) {
+  var users = getUsers();
+  users.push(user);
+  localStorage.setItem(USERS_KEY, JSON.stringify(users));
+}
+function setError(id, text) {
+  document.getElementById(id).textContent = text || '';
+  return !text;
+}
+
+function validateRegistration(v) {
+  var errors = {firstErr: '', lastErr: '', emailErr: '', passErr: '', confirmErr: ''};
+  if (!NAME_RE.test(v.first)) errors.firstErr = 'Use 3–25 letters (A–Z only).';
+  if (!NAME_RE.test(v.last)) errors.lastErr = 'Use 3–25 letters (A–Z only).';
+  if (!v.email) errors.emailErr = 'Email is required.';
+  else if (!EMAIL_RE.test(v.email)) errors.emailErr = 'Enter a valid email address.';
+  else if (findUser(v.email)) errors.emailErr = 'Email already exists';
+  if (!v.pass) errors.passErr = 'Password is required.';
+  if (!v.confirm) errors.confirmErr = 'Confirm Password is required.';
+  else if (v.pass && v.confirm !== v.pass) errors.confirmErr = 'Passwords do not match.';
+  return errors;
+}
+
+function validateLogin(v) {
+  var errors = {emailError: '', passwordError: ''};
+  if (!v.email) errors.emailError = 'Email is required.';
+  else if (!EMAIL_RE.test(v.email)) errors.emailError = 'Invalid email format.';
+  if (!v.password) errors.passwordError = 'Password is required.';
+  return errors;
+}
+
+if (typeof module !== 'undefined') module.exports = {validateRegistration: validateRegistration, validateLogin: validateLogin};
@@ -1,8 +1,9 @@
 # core/base_page.py
 from __future__ import annotations
 
+import time
 from pathlib import Path
-from typing import Tuple, List, Optional, Union, Any
+from typing import Tuple, List, Optional, Union, Any, Callable, Dict, Sequence, Mapping
 from urllib.parse import urljoin
 
 import allure
@@ -20,7 +21,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
 
 from core.logger import get_logger
+from core.navigation import get_planner
+from core.negative_checks import get_lint
+from core.retry import get_policy
 from core.wait import Waiter
+from core.dom_scripts import JS_STRATEGIES, ALL_MATCHES_JS, CACHED_STATE_JS, FILL_JS, VISUAL_RECTS_JS
+from utils.screenshots import get_snapshots
+from utils.visual import get_visual
 from config.config import ENVIRONMENTS, DEFAULT_ENV
 
 Locator = Tuple[str, str]
@@ -38,61 +45,202 @@ def _resolve_base_url(value: str) -> str:
     return ENVIRONMENTS[DEFAULT_ENV].rstrip("/")
 
 
+def _preview(text: Any, secret: bool = False) -> str:
+    """Value as shown in allure step names / logs: secrets masked, long values cut."""
+    if secret:
+        return "***"
+    if text is None or len(str(text)) <= 80:
+        return text
+    return str(text)[:77] + "..."
+
+
+def _form_text(value: Any) -> str:
+    # Excel rows come through pandas: empty cells are None/NaN
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+class FormValue:
+    """A fill_form() value with per-field options.
+
+    real_keys=True -> typed with real keystrokes (clear + send_keys) instead of the value setter
+    secret=True    -> masked in allure steps/logs (password inputs are masked automatically)
+    """
+
+    __slots__ = ("value", "real_keys", "secret")
+
+    def __init__(self, value: Any, real_keys: bool = False, secret: bool = False):
+        self.value = value
+        self.real_keys = real_keys
+        self.secret = secret
+
+
+QUERY_MODES = ("wait", "expect_absent", "now")
+
+
 class BasePage:
     logger = get_logger("BasePage")
 
-    def __init__(self, driver: WebDriver, base_url: str = "", timeout: int = 15, poll: float = 0.3):
+    # Session-wide query defaults, set from Config by conftest
+    query_mode = "wait"
+    negative_grace = 1.0
+
+    # Opt-in element handle cache (per page object); totals across all pages for the run summary
+    element_cache = False
+    cache_totals = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        base_url: str = "",
+        timeout: int = 15,
+        poll: float = 0.3,
+        cache: Optional[bool] = None,
+    ):
         self.driver = driver
         self.base_url = _resolve_base_url(base_url)
         # IMPORTANT: only use self.w (a Waiter). Do not set/override self.wait.
         self.w = Waiter(driver, timeout=timeout, poll=poll)
+        self.cache_enabled = self.element_cache if cache is None else cache
+        self.cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._elements: Dict[Tuple[str, Locator], WebElement] = {}
+        self._elements_url: Optional[str] = None
 
     # ------------------ Navigation ------------------
-    def open(self, path: str = "/") -> None:
+    def open(self, path: str = "/", ready: Optional[Callable[[], Any]] = None, plan: Optional[bool] = None) -> None:
+        """
+        Load `path`, then run `ready()` (the page's own "I'm loaded" checks). Goes through the
+        NavigationPlanner when one is active: skipped when the session is already on the page
+        (and, with NavigationPlanner(defer=True), deferred until the page is used). plan=False
+        always navigates.
+        """
         url = urljoin(self.base_url + "/", path.lstrip("/"))
+        self.invalidate_cache()
+        planner = get_planner()
+        if planner is None or plan is False:
+            started = time.perf_counter()
+            self._load(url, ready)
+            if planner is not None:
+                planner.record_load(url, time.perf_counter() - started)
+            return
+        planner.open(self.driver, url, lambda: self._load(url, ready), ready)
+
+    def _load(self, url: str, ready: Optional[Callable[[], Any]] = None) -> None:
         self.logger.info(f"Navigating to: {url}")
         self.driver.get(url)
-        self.w.js_ready()
+        # fast_mode sessions load eagerly; don't give the saving back by waiting for 'complete'
+        self.w.js_ready(interactive_ok=getattr(self.driver, "fast_mode", None) is not None)
+        stable_ui = getattr(self.driver, "stable_ui", None)
+        if stable_ui is not None:
+            stable_ui.after_load()
+        if ready is not None:
+            ready()
 
     # ------------------ Low-level finds ------------------
     def find(self, locator: Locator) -> WebElement:
-        # Use the underlying WebDriverWait exposed at self.w.wait
-        return self.w.wait.until(EC.presence_of_element_located(locator))
+        # Waiter picks polling or MutationObserver waits (see Waiter.mode)
+        return self._resolve("present", locator)
 
     def finds(self, locator: Locator) -> List[WebElement]:
         return self.driver.find_elements(*locator)
 
     def find_visible(self, locator: Locator) -> WebElement:
-        return self.w.wait.until(EC.visibility_of_element_located(locator))
+        return self._resolve("visible", locator)
 
     def find_clickable(self, locator: Locator) -> WebElement:
-        return self.w.wait.until(EC.element_to_be_clickable(locator))
+        return self._resolve("clickable", locator)
+
+    # ------------------ Element cache ------------------
+    def _resolve(self, kind: str, locator: Locator) -> WebElement:
+        wait = {"present": self.w.present, "visible": self.w.visible, "clickable": self.w.clickable}[kind]
+        if not self.cache_enabled:
+            return wait(locator)
+        key = (kind, locator)
+        el = self._elements.get(key)
+        if el is not None:
+            # one round trip re-checks the handle instead of find + is_displayed (+ is_enabled)
+            try:
+                state = self.driver.execute_script(CACHED_STATE_JS, el, kind)
+            except StaleElementReferenceException:
+                state = None
+            if state and state["url"] != self._elements_url:
+                self.invalidate_cache()
+            elif state and state["ok"]:
+                self._count("hits")
+                return el
+            else:
+                self.invalidate_cache(locator)
+        self._count("misses")
+        el = wait(locator)
+        if not self._elements:
+            self._elements_url = self.driver.current_url
+        self._elements[key] = el
+        return el
+
+    def _with_element(self, kind: str, locator: Locator, action):
+        """Run action(el); a handle that went stale meanwhile is dropped and re-resolved once."""
+        try:
+            return action(self._resolve(kind, locator))
+        except StaleElementReferenceException:
+            if not self.cache_enabled:
+                raise
+            self.invalidate_cache(locator)
+            return action(self._resolve(kind, locator))
+
+    def _count(self, what: str) -> None:
+        self.cache_stats[what] += 1
+        BasePage.cache_totals[what] += 1
+
+    def invalidate_cache(self, locator: Optional[Locator] = None) -> None:
+        """Forget cached handles: all of them (navigation/URL change) or those of one locator."""
+        if not self._elements:
+            return
+        if locator is None:
+            self._elements.clear()
+        else:
+            for key in [k for k in self._elements if k[1] == locator]:
+                del self._elements[key]
+        self._count("invalidations")
 
     # ------------------ Clicks with waits ------------------
-    def click(self, locator: Locator, retry: int = 2) -> WebElement:
+    def click(self, locator: Locator, retry: int = 2, timeout: Optional[float] = None) -> WebElement:
+        """
+        Native click, retried with backoff on stale/intercepted/not-yet-clickable elements.
+        The whole action (waits, retries and the JS fallback) shares ONE deadline: the RetryPolicy
+        timeout or `timeout=`. `retry` still caps the number of native attempts.
+        """
         step_name = f"Click {locator}"
-        with allure.step(step_name):
+        with allure.step(step_name), get_policy().action("click", locator, timeout) as dl:
             last_err: Optional[Exception] = None
             for attempt in range(retry + 1):
                 try:
                     el = self.find_clickable(locator)
-                    # Scroll + move helps with overlays
+                    # Scroll + move helps with overlays; nothing is still moving on stable-UI sessions
                     self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-                    ActionChains(self.driver).move_to_element(el).pause(0.05).click(el).perform()
+                    chain = ActionChains(self.driver).move_to_element(el)
+                    if not self.w.stable_ui:
+                        chain.pause(0.05)
+                    chain.click(el).perform()
                     self.logger.info(f"Clicked: {locator}")
                     return el
                 except (StaleElementReferenceException, ElementClickInterceptedException, TimeoutException) as e:
                     last_err = e
+                    if isinstance(e, StaleElementReferenceException):
+                        self.invalidate_cache(locator)
                     self.logger.warning(f"Click failed ({attempt + 1}/{retry + 1}) for {locator}: {e}")
                     # attach after failed attempt
                     self._attach_allure_snapshot(f"Click failed attempt {attempt + 1} on {locator}")
+                    if dl.expired:
+                        break
+                    dl.backoff()
                     # ensure DOM ready before retry
                     try:
-                        self.wait.js_ready()
+                        self.w.js_ready()
                     except Exception:
                         pass
 
-            # final JS fallback inside the same allure step
+            # final JS fallback inside the same allure step; only gets what is left of the deadline
             try:
                 el = self.find_visible(locator)
                 self.driver.execute_script("arguments[0].click();", el)
@@ -105,9 +253,9 @@ class BasePage:
                 self.logger.error(f"JS click failed for {locator}: {e}", exc_info=True)
                 raise last_err if last_err else e
 
-    def js_click(self, locator: Locator, retry: int = 1) -> WebElement:
+    def js_click(self, locator: Locator, retry: int = 1, timeout: Optional[float] = None) -> WebElement:
         step_name = f"JS Click {locator}"
-        with allure.step(step_name):
+        with allure.step(step_name), get_policy().action("js_click", locator, timeout) as dl:
             last_err: Optional[Exception] = None
             for attempt in range(retry + 1):
                 try:
@@ -118,26 +266,40 @@ class BasePage:
                     return el
                 except StaleElementReferenceException as e:
                     last_err = e
+                    self.invalidate_cache(locator)
                     self.logger.warning(f"JS click stale ({attempt + 1}/{retry + 1}) for {locator}: {e}")
                     self._attach_allure_snapshot(f"JS click stale attempt {attempt + 1} on {locator}")
+                    if dl.expired:
+                        break
+                    dl.backoff()
                     try:
-                        self.wait.js_ready()
+                        self.w.js_ready()
                     except Exception:
                         pass
                 except Exception as e:
                     last_err = e
                     self._attach_allure_snapshot(f"JS click failed attempt {attempt + 1} on {locator}")
                     self.logger.error(f"JS click error on {locator}: {e}", exc_info=True)
+                    if dl.expired:
+                        break
+                    dl.backoff()
 
             raise last_err if last_err else RuntimeError(f"Unable to JS-click {locator}")
 
-    def type(self, locator: Locator, text: str, clear: bool = True, press_enter: bool = False) -> WebElement:
+    def type(self, locator: Locator, text: str, clear: bool = True, press_enter: bool = False,
+             secret: Optional[bool] = None) -> WebElement:
+        """
+        Clear + send_keys. The value is masked in the allure step and log when `secret` is True and
+        shown when it is False. With secret=None the step shows it masked and, once the element is
+        found, the log shows it unless the input is a password (one extra attribute read).
+        """
         # redact long/secret values if needed
-        preview = text if (text is None or len(text) <= 80) else text[:77] + "..."
-        step_name = f"Type into {locator} | value='{preview}'"
-        with allure.step(step_name):
-            try:
-                el = self.find_visible(locator)
+        shown = _preview(text, True if secret is None else secret)
+        with allure.step(f"Type into {locator} | value='{shown}'"):
+            def _type(el: WebElement) -> WebElement:
+                preview = shown
+                if secret is None:
+                    preview = _preview(text, el.get_dom_attribute("type") == "password")
                 if clear:
                     el.clear()
                 self.logger.info(f"Typing into {locator}: '{preview}'")
@@ -145,72 +307,164 @@ class BasePage:
                 if press_enter:
                     el.send_keys(Keys.ENTER)
                 return el
+
+            try:
+                return self._with_element("visible", locator, _type)
             except Exception as e:
                 self._attach_allure_snapshot(f"Type failed on {locator}")
                 self.logger.error(f"Failed typing into {locator}: {e}", exc_info=True)
                 raise
 
-    def _attach_allure_snapshot(self, title: str) -> None:
-        """Attach screenshot + page source to Allure (best-effort)."""
-        try:
-            png = self.driver.get_screenshot_as_png()
-            allure.attach(png, name=f"{title} - screenshot", attachment_type=AttachmentType.PNG)
-        except Exception:
-            pass
+    def fill_form(self, fields: Mapping[Locator, Any]) -> None:
+        """
+        Fill many fields with ~2 WebDriver commands instead of ~3 per field: one batched
+        visibility wait, then one script that sets every value through the native setter and
+        fires input/change/blur so the page's validation still runs. Values may be FormValue
+        for per-field options; real_keys fields are typed normally, in their place in the order.
+        """
+        items = [(loc, v if isinstance(v, FormValue) else FormValue(v)) for loc, v in fields.items()]
+        with allure.step(f"Fill form ({len(items)} fields)"):
+            try:
+                self.w.visible_many(*[loc for loc, _ in items])
+            except Exception:
+                self._attach_allure_snapshot("Fill form: fields not visible")
+                raise
+
+            batch: List[Tuple[Locator, FormValue]] = []
+            for loc, fv in items:
+                if fv.real_keys or loc[0] not in JS_STRATEGIES:
+                    self._fill_batch(batch)
+                    batch = []
+                    self.type(loc, _form_text(fv.value), secret=True if fv.secret else None)
+                else:
+                    batch.append((loc, fv))
+            self._fill_batch(batch)
+
+    def _fill_batch(self, batch: List[Tuple[Locator, "FormValue"]]) -> None:
+        if not batch:
+            return
+        payload = [[loc[0], loc[1], _form_text(fv.value)] for loc, fv in batch]
         try:
-            allure.attach(self.driver.page_source, name=f"{title} - page source", attachment_type=AttachmentType.HTML)
-        except Exception:
-            pass
+            results = self.driver.execute_script(FILL_JS, payload)
+        except Exception as e:
+            self._attach_allure_snapshot("Fill form failed")
+            self.logger.error(f"Failed filling form fields {[loc for loc, _ in batch]}: {e}", exc_info=True)
+            raise
+        for (loc, fv), res in zip(batch, results):
+            if not res.get("ok"):
+                self._attach_allure_snapshot(f"Fill form failed on {loc}")
+                raise NoSuchElementException(f"fill_form: {loc} {res.get('error')}")
+            preview = _preview(_form_text(fv.value), secret=fv.secret or res.get("type") == "password")
+            # same step name as type(), so reports read the same either way
+            with allure.step(f"Type into {loc} | value='{preview}'"):
+                self.logger.info(f"Set {loc}: '{preview}'")
+
+    def _attach_allure_snapshot(self, title: str) -> None:
+        """Attach screenshot + page source to Allure (best-effort; encoded/written in the background)."""
+        get_snapshots().capture(self.driver, title)
 
     # ------------------ Reads ------------------
     def text_of(self, locator: Locator) -> str:
-        return self.find_visible(locator).text
+        return self._with_element("visible", locator, lambda el: el.text)
 
     def attr(self, locator: Locator, name: str) -> str:
-        return self.find(locator).get_attribute(name)
+        return self._with_element("present", locator, lambda el: el.get_attribute(name))
 
     def css(self, locator: Locator, name: str) -> str:
-        return self.find(locator).value_of_css_property(name)
-
-    def is_visible(self, locator: Locator) -> bool:
+        return self._with_element("present", locator, lambda el: el.value_of_css_property(name))
+
+    # ------------------ Queries (True/False instead of raising) ------------------
+    def _query_timeout(self, mode: Optional[str], timeout: Optional[float]) -> Optional[float]:
+        mode = (mode or self.query_mode).lower()
+        if mode not in QUERY_MODES:
+            raise ValueError(f"query mode must be one of {QUERY_MODES}; got {mode!r}")
+        if timeout is not None:
+            return timeout
+        return {"wait": None, "expect_absent": self.negative_grace, "now": 0}[mode]
+
+    def _query(self, kind: str, locator: Locator, timeout: Optional[float], mode: Optional[str]) -> bool:
+        timeout = self._query_timeout(mode, timeout)
+        started = time.monotonic()
         try:
-            self.find_visible(locator)
-            return True
+            if timeout == 0:
+                # one round trip for presence + visibility instead of a wait that can't succeed later
+                found = bool(self.w.probe(locator)[kind])
+            else:
+                {"present": self.w.present, "visible": self.w.visible,
+                 "clickable": self.w.clickable}[kind](locator, timeout=timeout)
+                found = True
         except TimeoutException:
-            return False
-
-    def is_present(self, locator: Locator) -> bool:
-        try:
-            self.find(locator)
-            return True
-        except TimeoutException:
-            return False
-
-    def is_clickable_now(self, locator: Locator) -> bool:
-        try:
-            self.find_clickable(locator)
-            return True
-        except TimeoutException:
-            return False
+            found = False
+        if not found:
+            self._lint_negative(f"is_{kind}", locator, started)
+        return found
+
+    @staticmethod
+    def _lint_negative(check: str, locator: Locator, started: float) -> None:
+        lint = get_lint()
+        if lint is not None:
+            lint.record(check, locator, time.monotonic() - started)
+
+    def is_visible(self, locator: Locator, timeout: Optional[float] = None, mode: Optional[str] = None) -> bool:
+        """
+        mode="wait" (default): up to the full explicit timeout (or `timeout=`) for it to show up.
+        mode="expect_absent": only `negative_grace` seconds - use where absence is the likely answer.
+        mode="now": a single JS probe, no waiting.
+        """
+        return self._query("visible", locator, timeout, mode)
+
+    def is_present(self, locator: Locator, timeout: Optional[float] = None, mode: Optional[str] = None) -> bool:
+        return self._query("present", locator, timeout, mode)
+
+    def is_clickable_now(self, locator: Locator, timeout: Optional[float] = None, mode: Optional[str] = None) -> bool:
+        return self._query("clickable", locator, timeout, mode)
+
+    def is_absent(self, locator: Locator, grace: Optional[float] = None) -> bool:
+        """True unless the element becomes visible within the grace period (negative_grace)."""
+        return not self.is_visible(locator, timeout=grace, mode="expect_absent")
 
     def count(self, locator: Locator) -> int:
+        if locator[0] in JS_STRATEGIES:
+            return self.driver.execute_script(ALL_MATCHES_JS, locator[0], locator[1], "count")
         return len(self.finds(locator))
 
+    def texts_of_all(self, locator: Locator) -> List[str]:
+        """Visible text of every match, in one round trip."""
+        if locator[0] in JS_STRATEGIES:
+            return self.driver.execute_script(ALL_MATCHES_JS, locator[0], locator[1], "texts")
+        return [el.text for el in self.finds(locator)]
+
+    # ------------------ Batched reads (one round trip for many locators) ------------------
+    def wait_all_visible(self, *locators: Locator) -> Dict[Locator, WebElement]:
+        return {loc: row["element"] for loc, row in self.w.visible_many(*locators).items()}
+
+    def texts_of(self, *locators: Locator) -> Dict[Locator, str]:
+        """Like text_of() for several locators: waits until all are visible, reads them together."""
+        return {loc: row["text"] for loc, row in self.w.visible_many(*locators).items()}
+
+    def read_all(self, *locators: Locator, attrs: Sequence[str] = ()) -> Dict[Locator, Dict[str, Any]]:
+        """No waiting: present/visible/text/attrs for each locator (see Waiter.snapshot)."""
+        return self.w.snapshot(*locators, attrs=attrs)
+
     # ------------------ Select (dropdown) ------------------
     def select_by_text(self, locator: Locator, text: str) -> None:
-        Select(self.find_visible(locator)).select_by_visible_text(text)
+        self._with_element("visible", locator, lambda el: Select(el).select_by_visible_text(text))
 
     def select_by_value(self, locator: Locator, value: str) -> None:
-        Select(self.find_visible(locator)).select_by_value(value)
+        self._with_element("visible", locator, lambda el: Select(el).select_by_value(value))
 
     def select_by_index(self, locator: Locator, index: int) -> None:
-        Select(self.find_visible(locator)).select_by_index(index)
+        self._with_element("visible", locator, lambda el: Select(el).select_by_index(index))
 
     def deselect_all(self, locator: Locator) -> None:
-        Select(self.find_visible(locator)).deselect_all()
+        self._with_element("visible", locator, lambda el: Select(el).deselect_all())
 
     def selected_texts(self, locator: Locator) -> List[str]:
-        return [o.text for o in Select(self.find(locator)).all_selected_options]
+        if locator[0] not in JS_STRATEGIES:
+            return [o.text for o in Select(self.find(locator)).all_selected_options]
+        self.find(locator)
+        # all selected options in one call instead of one .text round trip per option
+        return self.driver.execute_script(ALL_MATCHES_JS, locator[0], locator[1], "selected_texts") or []
 
     # ------------------ Mouse actions ------------------
     def hover(self, locator: Locator) -> WebElement:
@@ -294,7 +548,7 @@ class BasePage:
     # ------------------ Files / Screens ------------------
     def upload_file(self, locator: Locator, file_path: Union[str, Path]) -> WebElement:
         p = str(Path(file_path).resolve())
-        return self.type(locator, p, clear=False)
+        return self.type(locator, p, clear=False, secret=False)
 
     def screenshot(self, name: str = "screenshot", directory: Union[str, Path] = "screenshots") -> Path:
         Path(directory).mkdir(parents=True, exist_ok=True)
@@ -302,6 +556,22 @@ class BasePage:
         self.driver.save_screenshot(str(path))
         return path
 
+    def check_visual(self, name: str, locator: Optional[Locator] = None, ignore: Sequence[Locator] = (),
+                     tolerance: Optional[int] = None, max_diff_ratio: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Compare the viewport (or the element at `locator`) with its baseline `name`; elements
+        matching `ignore` are left out of the pixel diff. AssertionError (with baseline/actual/diff
+        attached to Allure) when it differs; returns the comparison result otherwise.
+        """
+        with allure.step(f"Visual check '{name}'" + (f" of {locator}" if locator else "")):
+            el = self.find_visible(locator) if locator else None
+            png = el.screenshot_as_png if el is not None else self.driver.get_screenshot_as_png()
+            regions = self.driver.execute_script(VISUAL_RECTS_JS, el, [list(loc) for loc in ignore]) if ignore else []
+            result = get_visual().compare(png, name, browser=(self.driver.capabilities or {}).get("browserName", ""),
+                                          ignore=regions, tolerance=tolerance, max_diff_ratio=max_diff_ratio)
+        assert result["status"] != "failed", result["message"]
+        return result
+
     # ------------------ JS / Network helpers ------------------
     def execute_script(self, script: str, *args) -> Any:
         return self.driver.execute_script(script, *args)
@@ -335,11 +605,23 @@ class BasePage:
         return self.w.title_contains(text)
 
     # ------------------ Utilities ------------------
-    def safe_get(self, locator: Locator, default: Optional[str] = None) -> Optional[str]:
+    def safe_get(
+        self, locator: Locator, default: Optional[str] = None, timeout: Optional[float] = None, mode: Optional[str] = None
+    ) -> Optional[str]:
+        """Visible text, or `default` when it doesn't show up (timeout/mode as in is_visible)."""
+        timeout = self._query_timeout(mode, timeout)
+        started = time.monotonic()
         try:
-            return self.text_of(locator)
+            if timeout == 0:
+                row = self.w.probe(locator)
+                if row["visible"]:
+                    return row["text"]
+            else:
+                return self.w.visible(locator, timeout=timeout).text
         except TimeoutException:
-            return default
+            pass
+        self._lint_negative("safe_get", locator, started)
+        return default
 
     def exists_now(self, locator: Locator) -> bool:
         try:
@@ -0,0 +1,135 @@
+# core/browser_state.py
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import allure
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.logger import get_logger
+
+log = get_logger("BrowserState")
+
+# -> {url, origin, local: {k: v}, session: {k: v}}
+CAPTURE_JS = r"""
+function dump(s) { var o = {}; for (var i = 0; i < s.length; i++) { var k = s.key(i); o[k] = s.getItem(k); } return o; }
+return {url: location.href, origin: location.origin, local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# execute_script(RESTORE_JS, local, session): replaces both storages of the current origin in one call
+RESTORE_JS = r"""
+var local = arguments[0], session = arguments[1], k;
+localStorage.clear();
+for (k in local) localStorage.setItem(k, local[k]);
+sessionStorage.clear();
+for (k in session) sessionStorage.setItem(k, session[k]);
+return true;
+"""
+
+# what WebDriver's add_cookie accepts of a get_cookies() entry
+_COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else ""
+
+
+def row_state_key(row: Any) -> str:
+    """Short stable id of a data row (dict or Row) for keying states per row."""
+    if row is None:
+        return ""
+    items = sorted((str(k), str(v)) for k, v in row.items())
+    return hashlib.sha1(json.dumps(items).encode("utf-8")).hexdigest()[:12]
+
+
+class BrowserState:
+    """Cookies + localStorage + sessionStorage of one origin, as captured after a precondition."""
+
+    __slots__ = ("name", "url", "origin", "cookies", "local", "session")
+
+    def __init__(self, name: str, url: str, origin: str, cookies: List[Dict[str, Any]],
+                 local: Dict[str, str], session: Dict[str, str]):
+        self.name = name
+        self.url = url
+        self.origin = origin
+        self.cookies = cookies
+        self.local = local
+        self.session = session
+
+    @classmethod
+    def capture(cls, driver: WebDriver, name: str) -> "BrowserState":
+        snap = driver.execute_script(CAPTURE_JS)
+        return cls(name, snap["url"], snap["origin"], driver.get_cookies(), snap["local"], snap["session"])
+
+    def restore(self, driver: WebDriver) -> None:
+        # storage is per origin: only navigate when the session is somewhere else
+        if _origin(driver.current_url) != self.origin:
+            driver.get(self.url)
+        driver.execute_script(RESTORE_JS, self.local, self.session)
+        # cookies go through WebDriver so domain, path and HttpOnly come back exactly as captured
+        driver.delete_all_cookies()
+        for c in self.cookies:
+            driver.add_cookie({k: v for k, v in c.items() if k in _COOKIE_KEYS})
+
+
+# name -> builder(driver, env, data): runs the real UI precondition once per worker
+_BUILDERS: Dict[str, Callable[..., None]] = {}
+
+
+def state_builder(name: str):
+    """Register the UI precondition that produces state `name`: @state_builder("user registered")."""
+    def deco(fn: Callable[..., None]) -> Callable[..., None]:
+        _BUILDERS[name] = fn
+        return fn
+    return deco
+
+
+class StateStore:
+    """
+    Named browser states of this worker process, keyed by (state name, data row).
+    The first use of a key runs the registered builder through the UI and captures the result;
+    later uses restore it with one script call (plus a navigation only when off-origin).
+    """
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, Hashable], BrowserState] = {}
+        self._lock = threading.Lock()
+        self.built = 0
+        self.restored = 0
+
+    def ensure(self, driver: WebDriver, name: str, data: Any = None, env: str = "",
+               builder: Optional[Callable[..., None]] = None) -> BrowserState:
+        key = (name, row_state_key(data))
+        with self._lock:
+            state = self._states.get(key)
+        if state is not None:
+            with allure.step(f"Restore browser state '{name}'"):
+                state.restore(driver)
+            self.restored += 1
+            return state
+
+        build = builder or _BUILDERS.get(name)
+        if build is None:
+            raise KeyError(f"No builder registered for browser state '{name}' (use @state_builder)")
+        with allure.step(f"Build browser state '{name}'"):
+            build(driver, env, data)
+            state = BrowserState.capture(driver, name)
+        with self._lock:
+            self._states[key] = state
+        self.built += 1
+        log.info(f"Captured browser state '{name}' ({len(state.local)} localStorage keys, "
+                 f"{len(state.cookies)} cookies) at {state.origin}")
+        return state
+
+    def forget(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            for key in [k for k in self._states if name is None or k[0] == name]:
+                del self._states[key]
+
+
+STATES = StateStore()
@@ -0,0 +1,160 @@
+# core/command_budget.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# WebDriver command name -> budget breakdown type (everything else is "other")
+COMMAND_TYPES = {
+    Command.FIND_ELEMENT: "find",
+    Command.FIND_ELEMENTS: "find",
+    Command.FIND_CHILD_ELEMENT: "find",
+    Command.FIND_CHILD_ELEMENTS: "find",
+    Command.W3C_EXECUTE_SCRIPT: "execute_script",
+    Command.W3C_EXECUTE_SCRIPT_ASYNC: "execute_script",
+    Command.CLICK_ELEMENT: "click",
+    Command.W3C_ACTIONS: "actions",
+    Command.W3C_CLEAR_ACTIONS: "actions",
+    Command.SEND_KEYS_TO_ELEMENT: "send_keys",
+    Command.CLEAR_ELEMENT: "send_keys",
+    Command.SCREENSHOT: "screenshot",
+    Command.ELEMENT_SCREENSHOT: "screenshot",
+    Command.GET: "navigation",
+    Command.GO_BACK: "navigation",
+    Command.GO_FORWARD: "navigation",
+    Command.REFRESH: "navigation",
+    Command.GET_ELEMENT_TEXT: "read",
+    Command.GET_ELEMENT_ATTRIBUTE: "read",
+    Command.GET_ELEMENT_PROPERTY: "read",
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY: "read",
+    Command.GET_ELEMENT_TAG_NAME: "read",
+    Command.GET_ELEMENT_RECT: "read",
+    Command.IS_ELEMENT_SELECTED: "read",
+    Command.IS_ELEMENT_ENABLED: "read",
+    Command.GET_CURRENT_URL: "read",
+    Command.GET_TITLE: "read",
+    Command.GET_PAGE_SOURCE: "read",
+}
+
+
+def _suite(nodeid: str) -> str:
+    return nodeid.split("::", 1)[0]
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver commands each test sends, by type. Attached to the drivers the `driver`
+    fixture hands out (wraps `command_executor.execute`, idempotent for pooled sessions); only
+    commands from the test's own thread count, as in CommandTracer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._test: Optional[str] = None
+        self._thread: Optional[int] = None
+        self._counts: Counter = Counter()
+
+    def attach(self, driver: WebDriver) -> WebDriver:
+        executor = driver.command_executor
+        if getattr(executor, "_command_counter", None) is self:
+            return driver
+        original = executor.execute
+
+        def execute(command, params):
+            if self._test is not None and threading.get_ident() == self._thread:
+                with self._lock:
+                    self._counts[COMMAND_TYPES.get(command, "other")] += 1
+            return original(command, params)
+
+        executor.execute = execute
+        executor._command_counter = self
+        return driver
+
+    def begin_test(self, nodeid: str) -> None:
+        with self._lock:
+            self._test = nodeid
+            self._thread = threading.get_ident()
+            self._counts = Counter()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Counts so far for the current test, by type."""
+        with self._lock:
+            return dict(self._counts)
+
+    def end_test(self) -> Dict[str, int]:
+        with self._lock:
+            counts, self._test = dict(self._counts), None
+        return counts
+
+
+def over_budget(counts: Dict[str, int], budget: int) -> Optional[str]:
+    """Failure/warning text when `counts` exceed `budget` (None when within it or budget <= 0)."""
+    total = sum(counts.values())
+    if budget <= 0 or total <= budget:
+        return None
+    parts = ", ".join(f"{k} {v}" for k, v in sorted(counts.items(), key=lambda kv: -kv[1]))
+    return f"WebDriver command budget exceeded: {total} commands > {budget} ({parts})"
+
+
+class CommandHistory:
+    """
+    Per-test command counts of this run vs the previous one, kept in a JSON file
+    ({nodeid: {"total": n, "by_type": {...}}}); restore/save it as a CI cache to compare runs.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cache/command_counts.json"):
+        self.path = Path(path)
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.current: Dict[str, Dict[str, Any]] = {}
+        self.over: List[str] = []
+        try:
+            self.previous = json.loads(self.path.read_text("utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def record(self, nodeid: str, counts: Dict[str, int]) -> None:
+        self.current[nodeid] = {"total": sum(counts.values()), "by_type": dict(counts)}
+
+    def save(self) -> None:
+        if not self.current:
+            return
+        merged = {**self.previous, **self.current}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(merged, indent=0, sort_keys=True), "utf-8")
+        os.replace(tmp, self.path)
+
+    def table(self, top: int = 5) -> List[str]:
+        """Per suite (test file): tests, commands this run, the same tests last run, delta; then the biggest growers."""
+        suites: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0])  # tests, now, before, compared
+        growth = []
+        for nodeid, cur in self.current.items():
+            row = suites[_suite(nodeid)]
+            row[0] += 1
+            row[1] += cur["total"]
+            prev = self.previous.get(nodeid)
+            if prev is not None:
+                row[2] += prev["total"]
+                row[3] += 1
+                if cur["total"] > prev["total"]:
+                    growth.append((cur["total"] - prev["total"], nodeid, prev["total"], cur["total"]))
+        width = max([len("suite")] + [len(s) for s in suites])
+        lines = [f"{'suite':<{width}}  {'tests':>5}  {'commands':>8}  {'previous':>8}  {'delta':>7}"]
+        for suite, (tests, now, before, compared) in sorted(suites.items()):
+            if compared:
+                now_cmp = sum(self.current[n]["total"] for n in self.current
+                              if _suite(n) == suite and n in self.previous)
+                prev_s, delta_s = str(before), f"{now_cmp - before:+d}"
+            else:
+                prev_s, delta_s = "-", "-"
+            lines.append(f"{suite:<{width}}  {tests:>5}  {now:>8}  {prev_s:>8}  {delta_s:>7}")
+        for d, nodeid, before, now in sorted(growth, reverse=True)[:top]:
+            lines.append(f"  +{d} {nodeid} ({before} -> {now})")
+        return lines
@@ -0,0 +1,29 @@
+# core/devtools.py
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Vendor prefix of the chromedriver/msedgedriver CDP passthrough endpoint
+_CDP_VENDORS = {"chrome": "goog", "msedge": "ms", "microsoftedge": "ms"}
+
+
+def browser_name(driver: WebDriver) -> str:
+    caps = getattr(driver, "capabilities", {}) or {}
+    return str(caps.get("browserName", "")).lower()
+
+
+def is_chromium(driver: WebDriver) -> bool:
+    return browser_name(driver) in _CDP_VENDORS
+
+
+def execute_cdp(driver: WebDriver, cmd: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Run a Chrome DevTools Protocol command on local AND remote (Grid/Sauce) chromium sessions.
+    webdriver.Remote has no execute_cdp_cmd, so the vendor endpoint is registered on demand.
+    """
+    vendor = _CDP_VENDORS.get(browser_name(driver), "goog")
+    commands = driver.command_executor._commands
+    commands.setdefault("executeCdpCommand", ("POST", f"/session/$sessionId/{vendor}/cdp/execute"))
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
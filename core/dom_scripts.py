@@ -0,0 +1,261 @@
+# core/dom_scripts.py
+"""
+In-page JavaScript used by Waiter/BasePage to resolve Selenium locators without extra round trips.
+Locators are passed as (by, value) with the same strategy names as selenium's `By`.
+"""
+
+# Strategies the in-page resolver understands (selenium By.* values)
+JS_STRATEGIES = frozenset({
+    "id", "css selector", "class name", "name", "tag name", "xpath", "link text", "partial link text",
+})
+
+# Helper functions prepended to every script. Mirrors selenium's own By -> CSS mapping.
+HELPERS_JS = r"""
+function __findAll(by, value, root) {
+  var d = root || document, out = [], i;
+  switch (by) {
+    case 'id': return Array.prototype.slice.call(d.querySelectorAll('[id="' + __esc(value) + '"]'));
+    case 'css selector': return Array.prototype.slice.call(d.querySelectorAll(value));
+    case 'class name': return Array.prototype.slice.call(d.querySelectorAll('.' + CSS.escape(value)));
+    case 'name': return Array.prototype.slice.call(d.querySelectorAll('[name="' + __esc(value) + '"]'));
+    case 'tag name': return Array.prototype.slice.call(d.getElementsByTagName(value));
+    case 'xpath':
+      var snap = document.evaluate(value, d, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+      return out;
+    case 'link text':
+    case 'partial link text':
+      var links = d.getElementsByTagName('a');
+      for (i = 0; i < links.length; i++) {
+        var t = (links[i].innerText || '').trim();
+        if (by === 'link text' ? t === value : t.indexOf(value) !== -1) out.push(links[i]);
+      }
+      return out;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+function __esc(v) { return String(v).replace(/(["\\])/g, '\\$1'); }
+function __find(by, value) {
+  if (by === 'id') return document.getElementById(value);
+  if (by === 'css selector') return document.querySelector(value);
+  if (by === 'xpath')
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  return __findAll(by, value)[0] || null;
+}
+function __visible(el) {
+  if (!el || !el.isConnected) return false;
+  if (el.checkVisibility &&
+      !el.checkVisibility({opacityProperty: true, visibilityProperty: true})) return false;
+  var s = window.getComputedStyle(el);
+  if (s.visibility === 'hidden' || s.visibility === 'collapse' || s.display === 'none') return false;
+  if (!el.checkVisibility) {
+    for (var e = el; e && e.nodeType === 1; e = e.parentElement) {
+      var cs = window.getComputedStyle(e);
+      if (cs.display === 'none' || parseFloat(cs.opacity) === 0) return false;
+    }
+  }
+  var r = el.getBoundingClientRect();
+  return r.width > 0 && r.height > 0;
+}
+function __text(el) { return el ? (el.innerText || '') : ''; }
+function __attr(el, name) {
+  // selenium get_attribute(): property if it is a plain value, else the HTML attribute
+  var p = el[name];
+  if (p !== undefined && p !== null && typeof p !== 'object' && typeof p !== 'function') return String(p);
+  return el.getAttribute(name);
+}
+function __snapshot(locs, attrs) {
+  return locs.map(function (l) {
+    var el = __find(l[0], l[1]), vis = __visible(el), a = {};
+    if (el) for (var i = 0; i < attrs.length; i++) a[attrs[i]] = __attr(el, attrs[i]);
+    return {element: el, present: !!el, visible: vis, text: vis ? __text(el).trim() : '', attrs: a};
+  });
+}
+"""
+
+# execute_script(SNAPSHOT_JS, [[by, value], ...], [attr, ...])
+# -> one {element, present, visible, text, attrs} per locator, in order
+SNAPSHOT_JS = HELPERS_JS + "return __snapshot(arguments[0], arguments[1] || []);"
+
+# execute_script(ALL_MATCHES_JS, by, value, what) -> every match of one locator in a single call;
+# what: 'elements' | 'count' | 'texts' | 'selected_texts' (selected <option>s of the first match)
+ALL_MATCHES_JS = HELPERS_JS + r"""
+var els = __findAll(arguments[0], arguments[1]);
+switch (arguments[2]) {
+  case 'count': return els.length;
+  case 'texts': return els.map(function (e) { return __visible(e) ? __text(e).trim() : ''; });
+  case 'selected_texts':
+    if (!els.length) return null;
+    return Array.prototype.filter.call(els[0].options || [], function (o) { return o.selected; })
+      .map(function (o) { return o.text.trim(); });
+}
+return els;
+"""
+
+# execute_async_script(OBSERVE_JS, kind, by, value, text, timeout_ms)
+# Resolves as soon as the condition holds; re-checks on every DOM mutation, transition/animation end
+# and on a cheap in-page interval (layout-only changes). Returns the element (present/visible/clickable),
+# true (text/invisible) or {"__timeout": true}. 'text' only matches a visible element, as WebElement.text is
+# empty for hidden ones.
+# kind 'all_visible' takes value=[[by, value], ...] and text=[attr, ...] and returns the __snapshot list.
+OBSERVE_JS = HELPERS_JS + r"""
+var kind = arguments[0], by = arguments[1], value = arguments[2], text = arguments[3], ms = arguments[4];
+var done = arguments[arguments.length - 1];
+function checkOne() {
+  var el = __find(by, value);
+  switch (kind) {
+    case 'present': return el;
+    case 'visible': return __visible(el) ? el : null;
+    case 'clickable': return (__visible(el) && !el.disabled) ? el : null;
+    case 'text': return (__visible(el) && __text(el).indexOf(text) !== -1) ? true : null;
+    case 'invisible': return (!el || !__visible(el)) ? true : null;
+  }
+  return null;
+}
+function check() {
+  if (kind !== 'all_visible') return checkOne();
+  var snap = __snapshot(value, text || []);
+  return snap.every(function (s) { return s.visible; }) ? snap : null;
+}
+var first = check();
+if (first) { done(first); return; }
+var finished = false, observer = null, timer = null, ticker = null;
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  clearTimeout(timer);
+  clearInterval(ticker);
+  document.removeEventListener('transitionend', onEvent, true);
+  document.removeEventListener('animationend', onEvent, true);
+  done(result);
+}
+function onEvent() { if (finished) return; var r = check(); if (r) finish(r); }
+observer = new MutationObserver(onEvent);
+observer.observe(document.documentElement || document,
+                 {subtree: true, childList: true, attributes: true, characterData: true});
+document.addEventListener('transitionend', onEvent, true);
+document.addEventListener('animationend', onEvent, true);
+ticker = setInterval(onEvent, 100);
+timer = setTimeout(function () { finish({__timeout: true}); }, ms);
+"""
+
+# __fill(el, text): sets the value through the native setter (so framework-controlled inputs see it)
+# and fires the input/change/blur sequence a user would, so the page's own validation still runs.
+FILL_HELPERS_JS = r"""
+function __setNative(el, prop, v) {
+  var proto = Object.getPrototypeOf(el), d;
+  while (proto && !(d = Object.getOwnPropertyDescriptor(proto, prop))) proto = Object.getPrototypeOf(proto);
+  if (d && d.set) d.set.call(el, v); else el[prop] = v;
+}
+function __fill(el, text) {
+  var type = (el.type || el.tagName).toLowerCase();
+  try { el.focus(); } catch (e) {}
+  if (type === 'checkbox' || type === 'radio') __setNative(el, 'checked', !!text && text !== 'false');
+  else __setNative(el, 'value', text);
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+  if (document.activeElement === el) el.blur();
+  else {
+    el.dispatchEvent(new FocusEvent('blur'));
+    el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+  }
+  return {ok: true, type: type};
+}
+"""
+
+# execute_script(FILL_JS, [[by, value, text], ...]) -> [{ok, type, error}]
+FILL_JS = HELPERS_JS + FILL_HELPERS_JS + r"""
+return arguments[0].map(function (f) {
+  var el = __find(f[0], f[1]);
+  return el ? __fill(el, f[2]) : {ok: false, error: 'not found'};
+});
+"""
+
+# execute_script(BATCH_PRIME_JS, [[by, value], ...] errors) -> how many error elements were found.
+# Remembers the pristine state of the error elements right after the form loaded, for BATCH_ROW_JS.
+BATCH_PRIME_JS = HELPERS_JS + r"""
+window.__batchPristine = arguments[0].map(function (l) {
+  var el = __find(l[0], l[1]);
+  return el && {el: el, html: el.innerHTML, cls: el.className, style: el.getAttribute('style'), hidden: el.hidden};
+});
+return window.__batchPristine.filter(Boolean).length;
+"""
+
+# execute_async_script(BATCH_ROW_JS, fields [[by, value, text], ...], submit [by, value] | null,
+#                      errors [[by, value], ...], settle_ms, timeout_ms)
+# One validation row without reloading: put the error elements back to their pristine state, reset
+# the form(s), fill the fields, optionally click submit, then wait until every expected error shows
+# text and has not changed for settle_ms (at most timeout_ms) and read them.
+# -> {primed, url, navigated, fill: [{ok, type, error}], errors: [{visible, text}]}
+BATCH_ROW_JS = HELPERS_JS + FILL_HELPERS_JS + r"""
+var fields = arguments[0], submit = arguments[1], errors = arguments[2], settle = arguments[3], limit = arguments[4];
+var done = arguments[arguments.length - 1];
+var pristine = window.__batchPristine;
+if (!pristine) { done({primed: false, url: location.href}); return; }
+pristine.forEach(function (p) {
+  if (!p) return;
+  p.el.innerHTML = p.html;
+  p.el.className = p.cls;
+  if (p.style === null) p.el.removeAttribute('style'); else p.el.setAttribute('style', p.style);
+  p.el.hidden = p.hidden;
+});
+Array.prototype.forEach.call(document.forms, function (f) { f.reset(); });
+var fill = fields.map(function (f) {
+  var el = __find(f[0], f[1]);
+  return el ? __fill(el, f[2]) : {ok: false, error: 'not found'};
+});
+if (submit) {
+  var btn = __find(submit[0], submit[1]);
+  if (btn) btn.click(); else fill.push({ok: false, error: 'submit not found'});
+}
+var url = location.href, start = Date.now(), last = null, since = start;
+function read() {
+  return errors.map(function (l) {
+    var el = __find(l[0], l[1]), vis = __visible(el);
+    return {visible: vis, text: vis ? __text(el).trim() : ''};
+  });
+}
+(function poll() {
+  var errs = read(), now = Date.now(), key = JSON.stringify(errs);
+  if (key !== last) { last = key; since = now; }
+  var shown = errs.every(function (e) { return e.visible && e.text; });
+  if (location.href !== url || (shown && now - since >= settle) || now - start >= limit) {
+    done({primed: true, url: location.href, navigated: location.href !== url, fill: fill, errors: errs});
+  } else {
+    setTimeout(poll, 10);
+  }
+})();
+"""
+
+# execute_script(PROBE_JS, by, value) -> {present, visible, clickable, text} of the first match, no waiting
+PROBE_JS = HELPERS_JS + r"""
+var el = __find(arguments[0], arguments[1]), vis = __visible(el);
+return {present: !!el, visible: vis, clickable: vis && !el.disabled, text: vis ? __text(el).trim() : ''};
+"""
+
+# execute_script(CACHED_STATE_JS, element, kind) -> {url, ok}: is a cached element still usable as
+# 'present' | 'visible' | 'clickable'? Selenium raises StaleElementReferenceException if it is gone.
+CACHED_STATE_JS = HELPERS_JS + r"""
+var el = arguments[0], kind = arguments[1], ok = el.isConnected;
+if (ok && kind !== 'present') ok = __visible(el) && (kind !== 'clickable' || !el.disabled);
+return {url: location.href, ok: ok};
+"""
+
+# execute_script(VISUAL_RECTS_JS, root_element_or_null, [[by, value], ...]) -> [[x, y, w, h], ...]
+# Boxes of every element matching the locators, in screenshot pixels (device pixels, relative to
+# the element screenshot's origin, or to the viewport for page screenshots). Rounded outwards.
+VISUAL_RECTS_JS = HELPERS_JS + r"""
+var root = arguments[0], dpr = window.devicePixelRatio || 1;
+var o = root ? root.getBoundingClientRect() : {left: 0, top: 0};
+var out = [];
+arguments[1].forEach(function (l) {
+  __findAll(l[0], l[1]).forEach(function (el) {
+    var r = el.getBoundingClientRect();
+    if (!r.width || !r.height) return;
+    var x = Math.floor((r.left - o.left) * dpr), y = Math.floor((r.top - o.top) * dpr);
+    out.push([x, y, Math.ceil((r.right - o.left) * dpr) - x, Math.ceil((r.bottom - o.top) * dpr) - y]);
+  });
+});
+return out;
+"""
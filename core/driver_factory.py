@@ -1,8 +1,14 @@
 # core/driver_factory.py
 import os
 import json
+import time
+import queue
 import logging
-from typing import Optional
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -11,6 +17,11 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+from core.devtools import execute_cdp, is_chromium
+from core.fast_mode import FastMode
+from core.stable_ui import StableUI
 
 log = logging.getLogger("DriverFactory")
 
@@ -33,23 +44,196 @@ def _norm(val, *, lower: bool = True, default=None):
     return s.lower() if lower else s
 
 
+# ----------------- Shared driver services -----------------
+
+_SERVICES_LOCK = threading.RLock()
+
+
+class _SharedServiceMixin:
+    """
+    Driver binary that outlives the sessions using it.
+    driver.quit() calls stop(), which only frees a session slot here;
+    the process is really stopped by DriverServices.shutdown().
+    """
+
+    max_sessions = 0        # concurrent sessions per process (0 = unlimited)
+    active = 0
+    browser_path = ""
+
+    def start(self) -> None:
+        if not self.healthy():
+            super().start()
+
+    def stop(self) -> None:
+        with _SERVICES_LOCK:
+            self.active = max(0, self.active - 1)
+
+    def healthy(self) -> bool:
+        proc = getattr(self, "process", None)
+        return proc is not None and proc.poll() is None and self.is_connectable()
+
+    def shutdown(self) -> None:
+        super().stop()
+
+
+class SharedChromeService(_SharedServiceMixin, ChromeService):
+    pass
+
+
+class SharedFirefoxService(_SharedServiceMixin, FirefoxService):
+    max_sessions = 1        # geckodriver serves one session at a time
+
+
+class SharedEdgeService(_SharedServiceMixin, EdgeService):
+    pass
+
+
+_SHARED_SERVICE_CLASSES = {
+    "chrome": SharedChromeService,
+    "firefox": SharedFirefoxService,
+    "edge": SharedEdgeService,
+}
+_SERVICE_CLASSES = {"chrome": ChromeService, "firefox": FirefoxService, "edge": EdgeService}
+
+
+class DriverServices:
+    """
+    One long-lived chromedriver/geckodriver/msedgedriver per browser type (per worker),
+    reused by every local session. Also keeps per-session startup timings.
+    """
+
+    def __init__(self):
+        self._services: Dict[str, List[_SharedServiceMixin]] = {}
+        self.timings: List[Dict[str, Any]] = []
+
+    def acquire(self, browser: str, options) -> Tuple[_SharedServiceMixin, float, bool]:
+        """Return (service, seconds spent starting it, reused?) and point `options` at the resolved browser."""
+        with _SERVICES_LOCK:
+            running = self._services.setdefault(browser, [])
+            for svc in list(running):
+                if not svc.healthy():
+                    log.warning("Shared %s driver service on port %s is not healthy; replacing it", browser, svc.port)
+                    running.remove(svc)
+                    self._stop(svc)
+                    continue
+                if not svc.max_sessions or svc.active < svc.max_sessions:
+                    svc.active += 1
+                    self._apply_browser_path(svc, options)
+                    return svc, 0.0, True
+
+            t0 = time.perf_counter()
+            svc = _SHARED_SERVICE_CLASSES[browser]()
+            # Resolve binaries once (Selenium Manager is a subprocess call) and reuse for later sessions
+            finder = DriverFinder(svc, options)
+            env_path = svc.env_path()
+            if not env_path:
+                svc.browser_path = finder.get_browser_path()
+            svc.path = env_path or finder.get_driver_path()
+            svc.start()
+            svc.active = 1
+            running.append(svc)
+            self._apply_browser_path(svc, options)
+            elapsed = time.perf_counter() - t0
+            log.info("Started shared %s driver service on port %s in %.3fs", browser, svc.port, elapsed)
+            return svc, elapsed, False
+
+    @staticmethod
+    def _apply_browser_path(svc: _SharedServiceMixin, options) -> None:
+        if svc.browser_path:
+            options.binary_location = svc.browser_path
+            options.browser_version = None
+
+    @staticmethod
+    def _stop(svc: _SharedServiceMixin) -> None:
+        try:
+            svc.shutdown()
+        except Exception as e:
+            log.error("Stopping driver service on port %s failed: %s", svc.port, e)
+
+    def record(self, browser: str, service_start: Optional[float], session_create: float, reused: bool) -> Dict[str, Any]:
+        entry = {
+            "browser": browser,
+            "service_start": None if service_start is None else round(service_start, 3),
+            "session_create": round(session_create, 3),
+            "service_reused": reused,
+        }
+        self.timings.append(entry)
+        log.info(
+            "Session startup (%s): service_start=%s session_create=%.3fs reused=%s",
+            browser, entry["service_start"], session_create, reused,
+        )
+        return entry
+
+    def summary(self) -> Dict[str, Any]:
+        n = len(self.timings)
+        service_total = sum(t["service_start"] or 0.0 for t in self.timings)
+        session_total = sum(t["session_create"] for t in self.timings)
+        return {
+            "sessions": n,
+            "services_started": sum(1 for t in self.timings if t["service_start"] and not t["service_reused"]),
+            "service_start_total": round(service_total, 3),
+            "session_create_total": round(session_total, 3),
+            "session_create_avg": round(session_total / n, 3) if n else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop every shared service (pytest session end; also registered with atexit)."""
+        with _SERVICES_LOCK:
+            services = [svc for running in self._services.values() for svc in running]
+            self._services.clear()
+        for svc in services:
+            self._stop(svc)
+        if self.timings:
+            log.info("Driver startup summary: %s", self.summary())
+
+
+SERVICES = DriverServices()
+atexit.register(SERVICES.shutdown)
+
+
 class DriverFactory:
     # ----------------- Local drivers -----------------
 
     @staticmethod
-    def _chrome(headless: bool):
+    def _launch(browser: str, driver_cls, opts, shared_service: bool, fast_mode: Optional[FastMode] = None,
+                stable_ui: Optional[StableUI] = None):
+        """Start a local session, on the shared driver service unless disabled; records startup timings."""
+        if fast_mode:
+            fast_mode.apply_options(browser, opts)
+        if stable_ui:
+            stable_ui.apply_options(browser, opts)
+        if shared_service:
+            service, service_start, reused = SERVICES.acquire(browser, opts)
+        else:
+            # A private service is started inside the driver constructor, so it can't be timed apart
+            service, service_start, reused = _SERVICE_CLASSES[browser](), None, False
+        t0 = time.perf_counter()
+        # On failure the driver constructor calls quit() itself, which frees the shared slot
+        driver = driver_cls(service=service, options=opts)
+        timings = SERVICES.record(browser, service_start, time.perf_counter() - t0, reused)
+        driver.startup_timings = timings
+        if fast_mode:
+            fast_mode.attach(browser, driver)
+        if stable_ui:
+            stable_ui.attach(browser, driver)
+        return driver
+
+    @staticmethod
+    def _chrome(headless: bool, shared_service: bool = True, fast_mode: Optional[FastMode] = None,
+                stable_ui: Optional[StableUI] = None):
         opts = ChromeOptions()
         opts.add_argument("--start-maximized")
         if headless:
             opts.add_argument("--headless=new")
             opts.add_argument("--window-size=1920,1080")
-        return webdriver.Chrome(service=ChromeService(), options=opts)
+        return DriverFactory._launch("chrome", webdriver.Chrome, opts, shared_service, fast_mode, stable_ui)
 
     @staticmethod
-    def _firefox(headless: bool):
+    def _firefox(headless: bool, shared_service: bool = True, fast_mode: Optional[FastMode] = None,
+                 stable_ui: Optional[StableUI] = None):
         opts = FirefoxOptions()
         opts.headless = headless
-        driver = webdriver.Firefox(service=FirefoxService(), options=opts)
+        driver = DriverFactory._launch("firefox", webdriver.Firefox, opts, shared_service, fast_mode, stable_ui)
         try:
             driver.maximize_window()
         except Exception:
@@ -57,18 +241,31 @@ class DriverFactory:
         return driver
 
     @staticmethod
-    def _edge(headless: bool):
+    def _edge(headless: bool, shared_service: bool = True, fast_mode: Optional[FastMode] = None,
+              stable_ui: Optional[StableUI] = None):
         opts = EdgeOptions()
         if headless:
             opts.add_argument("--headless=new")
             opts.add_argument("--window-size=1920,1080")
-        driver = webdriver.Edge(service=EdgeService(), options=opts)
+        driver = DriverFactory._launch("edge", webdriver.Edge, opts, shared_service, fast_mode, stable_ui)
         try:
             driver.maximize_window()
         except Exception:
             pass
         return driver
 
+    @staticmethod
+    def _remote(browser: str, command_executor: str, opts, fast_mode: Optional[FastMode] = None,
+                stable_ui: Optional[StableUI] = None):
+        t0 = time.perf_counter()
+        driver = webdriver.Remote(command_executor=command_executor, options=opts)
+        driver.startup_timings = SERVICES.record(browser, None, time.perf_counter() - t0, False)
+        if fast_mode:
+            fast_mode.attach(browser, driver)
+        if stable_ui:
+            stable_ui.attach(browser, driver)
+        return driver
+
     # ----------------- Factory entry -----------------
 
     @staticmethod
@@ -87,6 +284,9 @@ class DriverFactory:
         sauce_tags: Optional[str] = "pytest",
         sauce_region: str = "us-west-1",
         sauce_tunnel: Optional[str] = None,
+        shared_service: bool = True,
+        fast_mode: Optional[FastMode] = None,
+        stable_ui: Optional[StableUI] = None,
     ):
         """
         Create a WebDriver. Default is local.
@@ -116,9 +316,9 @@ class DriverFactory:
 
         # ---- Local (default) ----
         if not remote:
-            if b == "chrome":  return DriverFactory._chrome(headless)
-            if b == "firefox": return DriverFactory._firefox(headless)
-            if b == "edge":    return DriverFactory._edge(headless)
+            if b == "chrome":  return DriverFactory._chrome(headless, shared_service, fast_mode, stable_ui)
+            if b == "firefox": return DriverFactory._firefox(headless, shared_service, fast_mode, stable_ui)
+            if b == "edge":    return DriverFactory._edge(headless, shared_service, fast_mode, stable_ui)
             raise ValueError(f"Unsupported browser: {browser!r}")
 
         # ---- Remote options (Grid/Sauce) ----
@@ -138,6 +338,11 @@ class DriverFactory:
             else:
                 opts.add_argument("--headless=new")
 
+        if fast_mode:
+            fast_mode.apply_options(b, opts)
+        if stable_ui:
+            stable_ui.apply_options(b, opts)
+
         # W3C caps
         opts.set_capability("platformName", platform_name)
         opts.set_capability("browserVersion", browser_version)
@@ -186,9 +391,242 @@ class DriverFactory:
             except Exception:
                 pass
 
-            return webdriver.Remote(command_executor=remote_url, options=opts)
+            return DriverFactory._remote(b, remote_url, opts, fast_mode, stable_ui)
 
         # ---- Generic Selenium Grid ----
         if not grid_url:
             raise RuntimeError("Remote requested but neither Sauce nor --grid-url was provided.")
-        return webdriver.Remote(command_executor=grid_url, options=opts)
+        return DriverFactory._remote(b, grid_url, opts, fast_mode, stable_ui)
+
+
+# ----------------- Session pool -----------------
+
+# Storage is per-origin: without CDP this runs once on every origin the pool knows about.
+_RESET_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else ""
+
+
+class PooledSession:
+    """A warm WebDriver session plus the bookkeeping DriverPool needs to recycle it."""
+
+    __slots__ = ("driver", "main_handle", "created_at", "leases", "failed")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.main_handle = driver.current_window_handle
+        self.created_at = time.monotonic()
+        self.leases = 0
+        self.failed = False
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class DriverPool:
+    """
+    Keeps `size` sessions started ahead of time and leases them to tests one at a time.
+
+    On release a session is reset and goes back to the idle queue: it moves to a fresh tab
+    (new sessionStorage), and cookies + storage are cleared for every known origin - the
+    `origins` given here plus any origin a released session was on. Chromium does that over
+    CDP without navigating; other browsers visit each known origin once. A session whose
+    reset fails is recycled, as is one that has served `max_leases` tests or is older than
+    `max_age` seconds; the replacement is started in the background so the next acquire()
+    still gets a warm browser.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        *,
+        size: int = 2,
+        max_leases: int = 25,
+        max_age: float = 600.0,
+        acquire_timeout: float = 120.0,
+        on_retire: Optional[Callable[[PooledSession], None]] = None,
+        origins: Iterable[str] = (),
+    ):
+        self._factory = factory
+        self.size = max(1, int(size))
+        self.max_leases = max(0, int(max_leases))   # 0 = unlimited
+        self.max_age = max(0.0, float(max_age))      # 0 = unlimited
+        self.acquire_timeout = acquire_timeout
+        self._on_retire = on_retire
+        self._origins: Set[str] = {o for o in map(_origin, origins) if o}
+
+        self._idle: "queue.Queue[PooledSession]" = queue.Queue()
+        self._leased: Dict[int, PooledSession] = {}
+        self._lock = threading.Lock()
+        self._live = 0          # idle + leased + starting
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="DriverPool")
+
+        self.stats = {"started": 0, "leases": 0, "resets": 0, "recycled": 0, "reset_failures": 0}
+
+    # ---- lifecycle ----
+    def start(self) -> "DriverPool":
+        """Start all sessions in parallel and wait until they are idle."""
+        with self._lock:
+            missing = self.size - self._live
+            self._live += missing
+        futures = [self._executor.submit(self._spawn) for _ in range(missing)]
+        errors = [f.exception() for f in futures if f.exception()]
+        if errors and self._idle.empty():
+            raise errors[0]
+        for e in errors:
+            log.error("DriverPool: warm start failed: %s", e)
+        return self
+
+    def shutdown(self) -> None:
+        """Quit every session (idle and leased) and stop background workers."""
+        with self._lock:
+            self._closed = True
+            sessions = list(self._leased.values())
+            self._leased.clear()
+        while True:
+            try:
+                sessions.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for s in sessions:
+            self._executor.submit(self._retire, s)
+        self._executor.shutdown(wait=True)
+        log.info("DriverPool stats: %s", self.stats)
+
+    # ---- leasing ----
+    def acquire(self):
+        """Lease a reset, ready-to-use driver. Cold-starts one only if the pool is short."""
+        if self._closed:
+            raise RuntimeError("DriverPool is shut down")
+        try:
+            s = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                cold = self._live < self.size
+                if cold:
+                    self._live += 1
+            if cold:
+                log.warning("DriverPool: no warm session available, cold-starting one")
+                s = self._spawn(enqueue=False)
+            else:
+                try:
+                    s = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No pooled driver became available within {self.acquire_timeout}s")
+        with self._lock:
+            self._leased[id(s.driver)] = s
+            self.stats["leases"] += 1
+        s.leases += 1
+        return s.driver
+
+    def release(self, driver, *, failed: bool = False, discard: bool = False) -> None:
+        """Return a leased driver. It is reset and re-queued, or recycled if worn out/broken."""
+        with self._lock:
+            s = self._leased.pop(id(driver), None)
+        if s is None:
+            log.warning("DriverPool: release() of a driver this pool did not lease")
+            return
+        s.failed = s.failed or failed
+
+        if self._closed:
+            self._executor.submit(self._retire, s)
+            return
+        if discard or self._expired(s) or not self._reset(s):
+            with self._lock:
+                self.stats["recycled"] += 1
+            self._executor.submit(self._recycle, s)
+            return
+        self._idle.put(s)
+
+    # ---- internals ----
+    def _expired(self, s: PooledSession) -> bool:
+        if self.max_leases and s.leases >= self.max_leases:
+            return True
+        return bool(self.max_age and s.age >= self.max_age)
+
+    def _reset(self, s: PooledSession) -> bool:
+        """Bring a session back to a blank state across every known origin. False means 'recycle it'."""
+        d = s.driver
+        try:
+            here = _origin(d.current_url)
+            with self._lock:
+                if here:
+                    self._origins.add(here)
+                origins = sorted(self._origins)
+            chromium = is_chromium(d)
+            if not chromium and here:
+                # WebDriver only reaches the current origin's storage and cookies: clear this one in place
+                d.execute_script(_RESET_STORAGE_JS)
+                d.delete_all_cookies()
+                origins.remove(here)
+            # a new tab starts with empty sessionStorage for every origin; close all the old ones
+            old = d.window_handles
+            d.switch_to.new_window("tab")
+            s.main_handle = d.current_window_handle
+            for h in old:
+                d.switch_to.window(h)
+                d.close()
+            d.switch_to.window(s.main_handle)
+            if chromium:
+                execute_cdp(d, "Network.clearBrowserCookies")
+                for o in origins:
+                    execute_cdp(d, "Storage.clearDataForOrigin", {"origin": o, "storageTypes": "all"})
+            elif origins:
+                for o in origins:
+                    d.get(o + "/")
+                    d.execute_script(_RESET_STORAGE_JS)
+                    d.delete_all_cookies()
+                d.get("about:blank")
+            with self._lock:
+                self.stats["resets"] += 1
+            return True
+        except Exception as e:
+            with self._lock:
+                self.stats["reset_failures"] += 1
+            log.warning("DriverPool: reset failed, recycling session: %s", e)
+            return False
+
+    def _spawn(self, enqueue: bool = True) -> PooledSession:
+        try:
+            s = PooledSession(self._factory())
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        with self._lock:
+            self.stats["started"] += 1
+        if enqueue:
+            self._idle.put(s)
+        return s
+
+    def _recycle(self, s: PooledSession) -> None:
+        self._retire(s)
+        if self._closed:
+            return
+        with self._lock:
+            self._live += 1
+        try:
+            self._spawn()
+        except Exception as e:
+            log.error("DriverPool: replacement session failed to start: %s", e)
+
+    def _retire(self, s: PooledSession) -> None:
+        with self._lock:
+            self._live -= 1
+        try:
+            if self._on_retire:
+                self._on_retire(s)
+        except Exception as e:
+            log.error("DriverPool: on_retire hook failed: %s", e)
+        try:
+            s.driver.quit()
+        except Exception as e:
+            log.error("DriverPool: driver.quit() failed: %s", e)
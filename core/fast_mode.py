@@ -0,0 +1,181 @@
+# core/fast_mode.py
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.devtools import execute_cdp
+from core.logger import get_logger
+
+log = get_logger("FastMode")
+
+# Third-party hosts our form checks never need (fonts + analytics/tag managers)
+BLOCKED_HOSTS = (
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "www.google-analytics.com",
+    "www.googletagmanager.com",
+    "stats.g.doubleclick.net",
+    "static.hotjar.com",
+    "cdn.segment.com",
+    "connect.facebook.net",
+)
+
+# CDP Network.setBlockedURLs patterns ('*' wildcard, matched against the full URL)
+DEFAULT_BLOCK_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+) + tuple(f"*://{h}/*" for h in BLOCKED_HOSTS)
+
+# Low-overhead chromium flags: no background services, no first-run work, no throttling of our tab
+LEAN_CHROMIUM_FLAGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-default-browser-check",
+    "--no-first-run",
+)
+
+# Firefox equivalent: images/fonts off by pref, telemetry and update checks off
+LEAN_FIREFOX_PREFS = {
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "privacy.trackingprotection.enabled": True,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "app.update.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+}
+
+_CHROMIUM = ("chrome", "edge")
+_LOG_PREFS_CAP = {"chrome": "goog:loggingPrefs", "edge": "ms:loggingPrefs"}
+
+
+class FastModeSession:
+    """Per-driver blocking counters. `collect()` returns what happened since the previous call."""
+
+    def __init__(self, profile: "FastMode", browser: str, driver: WebDriver):
+        self.profile = profile
+        self.browser = browser
+        self.driver = driver
+        self._lock = threading.Lock()
+        self._bidi_blocked = 0
+
+    def _on_blocked(self, request) -> None:
+        # BiDi callbacks run on their own thread
+        with self._lock:
+            self._bidi_blocked += 1
+        try:
+            request.fail_request()
+        except Exception as e:
+            log.debug(f"fail_request failed for {request.url}: {e}")
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        blocked: requests blocked (chromium: CDP, firefox: BiDi-intercepted hosts only)
+        saved_s: time page loads ran past DOMContentLoaded that nobody waited for (eager strategy)
+        """
+        stats: Dict[str, Any] = {"blocked": 0, "blocked_by_type": {}, "saved_s": 0.0}
+        try:
+            if self.browser in _CHROMIUM:
+                self._collect_perf_log(stats)
+            else:
+                with self._lock:
+                    stats["blocked"], self._bidi_blocked = self._bidi_blocked, 0
+                stats["saved_s"] = self._current_document_saving()
+        except Exception as e:
+            log.debug(f"Fast mode stats unavailable: {e}")
+        self.profile._add(stats)
+        return stats
+
+    def _collect_perf_log(self, stats: Dict[str, Any]) -> None:
+        entries = self.driver.execute(Command.GET_LOG, {"type": "performance"})["value"]
+        by_type: Counter = Counter()
+        dcl: Optional[float] = None
+        saved = 0.0
+        for entry in entries:
+            msg = json.loads(entry["message"]).get("message", {})
+            method, params = msg.get("method"), msg.get("params", {})
+            if method == "Network.loadingFailed" and params.get("blockedReason"):
+                by_type[params.get("type", "Other")] += 1
+            elif method == "Page.domContentEventFired":
+                dcl = params.get("timestamp")
+            elif method == "Page.loadEventFired" and dcl is not None:
+                saved += max(0.0, params.get("timestamp", dcl) - dcl)
+                dcl = None
+        stats["blocked"] = sum(by_type.values())
+        stats["blocked_by_type"] = dict(by_type)
+        stats["saved_s"] = round(saved, 3)
+
+    def _current_document_saving(self) -> float:
+        ms = self.driver.execute_script(
+            "const n = performance.getEntriesByType('navigation')[0];"
+            "return n && n.loadEventEnd > 0 ? n.loadEventEnd - n.domContentLoadedEventEnd : 0;"
+        )
+        return round(max(0.0, float(ms or 0)) / 1000.0, 3)
+
+
+class FastMode:
+    """
+    'fast_mode' browser profile applied by DriverFactory to chrome/firefox/edge, local or remote:
+    eager page-load strategy, blocked images/fonts/analytics and lean browser flags.
+    stats=True also records what was blocked/skipped per test; on chromium that turns on the
+    performance log (network + page events), which costs browser work on every request, so it is off by default.
+    """
+
+    def __init__(self, block_patterns: Optional[Iterable[str]] = None, stats: bool = False):
+        self.block_patterns = list(block_patterns or DEFAULT_BLOCK_PATTERNS)
+        self.stats = stats
+        self.totals: Dict[str, Any] = {"tests": 0, "blocked": 0, "saved_s": 0.0}
+        self._lock = threading.Lock()
+
+    def apply_options(self, browser: str, opts) -> None:
+        """Before session start."""
+        opts.page_load_strategy = "eager"
+        if browser in _CHROMIUM:
+            for flag in LEAN_CHROMIUM_FLAGS:
+                opts.add_argument(flag)
+            if self.stats:
+                # Blocked requests + page load events are read back from the performance log
+                opts.set_capability(_LOG_PREFS_CAP[browser], {"performance": "ALL"})
+                opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": True})
+        elif browser == "firefox":
+            for name, value in LEAN_FIREFOX_PREFS.items():
+                opts.set_preference(name, value)
+            opts.enable_bidi = True
+
+    def attach(self, browser: str, driver: WebDriver) -> FastModeSession:
+        """After session start: install request blocking and expose stats as `driver.fast_mode`."""
+        session = FastModeSession(self, browser, driver)
+        try:
+            if browser in _CHROMIUM:
+                execute_cdp(driver, "Network.enable")
+                execute_cdp(driver, "Network.setBlockedURLs", {"urls": self.block_patterns})
+            elif browser == "firefox":
+                patterns = [{"type": "pattern", "hostname": h} for h in BLOCKED_HOSTS]
+                driver.network.add_request_handler("before_request", session._on_blocked, url_patterns=patterns)
+        except Exception as e:
+            log.warning(f"Fast mode request blocking unavailable on {browser}: {e}")
+        driver.fast_mode = session
+        return session
+
+    def _add(self, stats: Dict[str, Any]) -> None:
+        with self._lock:
+            self.totals["tests"] += 1
+            self.totals["blocked"] += stats["blocked"]
+            self.totals["saved_s"] = round(self.totals["saved_s"] + stats["saved_s"], 3)
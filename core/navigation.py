@@ -0,0 +1,186 @@
+# core/navigation.py
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.dom_scripts import ALL_MATCHES_JS, CACHED_STATE_JS, OBSERVE_JS, PROBE_JS, SNAPSHOT_JS, VISUAL_RECTS_JS
+from core.logger import get_logger
+from core.stable_ui import STABLE_UI_JS
+
+log = get_logger("NavigationPlanner")
+
+LOCATION_JS = "return {href: location.href, ready: document.readyState};"
+
+# Commands that leave the loaded document as it was: a later open() of the same URL can reuse it
+READ_ONLY_COMMANDS = frozenset({
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS,
+    Command.GET_ELEMENT_TEXT, Command.GET_ELEMENT_ATTRIBUTE, Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, Command.GET_ELEMENT_TAG_NAME, Command.GET_ELEMENT_RECT,
+    Command.IS_ELEMENT_SELECTED, Command.IS_ELEMENT_ENABLED, Command.GET_ELEMENT_ARIA_ROLE,
+    Command.GET_ELEMENT_ARIA_LABEL, Command.GET_CURRENT_URL, Command.GET_TITLE, Command.GET_PAGE_SOURCE,
+    Command.SCREENSHOT, Command.ELEMENT_SCREENSHOT, Command.GET_ALL_COOKIES, Command.GET_COOKIE,
+    Command.W3C_GET_CURRENT_WINDOW_HANDLE, Command.W3C_GET_WINDOW_HANDLES, Command.GET_WINDOW_RECT,
+    Command.GET_LOG, Command.GET_AVAILABLE_LOG_TYPES, Command.GET_TIMEOUTS, Command.SET_TIMEOUTS,
+})
+# ...and the scripts that only read: Waiter/BasePage probes and selenium's is_displayed/get_attribute atoms
+# (plus the idempotent stable-UI stylesheet, which doesn't change what a test sees)
+READ_ONLY_SCRIPTS = frozenset({
+    "return document.readyState", LOCATION_JS, OBSERVE_JS, PROBE_JS, SNAPSHOT_JS, ALL_MATCHES_JS, CACHED_STATE_JS,
+    VISUAL_RECTS_JS, STABLE_UI_JS,
+})
+READ_ONLY_SCRIPT_PREFIXES = ("/* isDisplayed */", "/* getAttribute */")
+# Commands that don't need the page: they never force a deferred navigation
+PASSIVE_COMMANDS = frozenset({
+    Command.GET_LOG, Command.GET_AVAILABLE_LOG_TYPES, Command.GET_TIMEOUTS, Command.SET_TIMEOUTS, Command.QUIT,
+})
+
+
+def _same_url(a: str, b: str) -> bool:
+    pa, pb = urlsplit(a or ""), urlsplit(b or "")
+    return (pa.scheme, pa.netloc, pa.path.rstrip("/") or "/", pa.query) == \
+           (pb.scheme, pb.netloc, pb.path.rstrip("/") or "/", pb.query)
+
+
+def _read_only_script(command: str, params: Dict[str, Any]) -> bool:
+    if command not in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC):
+        return False
+    script = params.get("script") or ""
+    return script in READ_ONLY_SCRIPTS or script.startswith(READ_ONLY_SCRIPT_PREFIXES)
+
+
+class _DriverNav:
+    """What the planner knows about one session: last loaded URL, whether it was touched, pending open."""
+
+    __slots__ = ("url", "clean", "pending", "flushing")
+
+    def __init__(self):
+        self.url: Optional[str] = None
+        self.clean = False
+        self.pending: Optional[tuple] = None  # (url, load)
+        self.flushing = False
+
+
+class NavigationPlanner:
+    """
+    Decides whether BasePage.open() really has to load a page:
+      - already there: the session's document is the target URL, fully loaded, and nothing but
+        reads happened since it loaded -> no navigation (the page's ready checks still run);
+      - otherwise the page is loaded right away, inside the open_*() call and its allure step.
+    defer=True (opt-in) also postpones a load until the first WebDriver command that needs the page,
+    so an open_home() directly followed by open_register_page() only loads the register page; the
+    load and its ready checks then run (and fail) inside that later command.
+    It watches the session's commands (wrapping command_executor.execute, like CommandTracer) and
+    keeps counts of loads, skips and collapsed opens, with the load time they saved.
+    """
+
+    def __init__(self, defer: bool = False):
+        self.defer = defer
+        self.loads = 0
+        self.skipped = 0
+        self.collapsed = 0
+        self._load_s: Dict[str, float] = {}    # url -> moving average load time
+        self._saved: Dict[str, int] = {}       # url -> loads avoided
+
+    # ---- wiring ----
+    def _state(self, driver: WebDriver) -> _DriverNav:
+        executor = driver.command_executor
+        st = getattr(executor, "_nav_state", None)
+        if st is not None:
+            return st
+        st = executor._nav_state = _DriverNav()
+        original = executor.execute
+
+        def execute(command, params):
+            if st.pending and not st.flushing:
+                if command == Command.GET:
+                    self._drop(st, "replaced by a direct driver.get()")
+                elif command not in PASSIVE_COMMANDS:
+                    self._flush(st)
+            result = original(command, params)
+            if command == Command.GET:
+                st.url, st.clean = params.get("url"), True
+            elif command not in READ_ONLY_COMMANDS and not _read_only_script(command, params):
+                st.clean = False
+            return result
+
+        executor.execute = execute
+        return st
+
+    # ---- planning ----
+    def open(self, driver: WebDriver, url: str, load: Callable[[], None],
+             ready: Optional[Callable[[], Any]] = None) -> None:
+        """Navigate to `url` with `load()` (which also runs the page's ready checks) when needed."""
+        st = self._state(driver)
+        if st.pending:
+            self._drop(st, f"superseded by {url}")
+        if st.clean and _same_url(st.url, url):
+            here = driver.execute_script(LOCATION_JS)
+            if _same_url(here["href"], url) and here["ready"] == "complete":
+                self.skipped += 1
+                self._saved[url] = self._saved.get(url, 0) + 1
+                log.info(f"Already on {url}; navigation skipped")
+                if ready:
+                    ready()
+                return
+        if not self.defer:
+            started = time.perf_counter()
+            load()
+            self.record_load(url, time.perf_counter() - started)
+            return
+        st.pending = (url, load)
+
+    def discard(self, driver: WebDriver) -> None:
+        """Forget a deferred open nobody used (end of test), without loading it."""
+        st = getattr(driver.command_executor, "_nav_state", None)
+        if st is not None and st.pending:
+            self._drop(st, "never used")
+
+    def _drop(self, st: _DriverNav, why: str) -> None:
+        url, _ = st.pending
+        st.pending = None
+        self.collapsed += 1
+        self._saved[url] = self._saved.get(url, 0) + 1
+        log.info(f"Navigation to {url} not performed ({why})")
+
+    def _flush(self, st: _DriverNav) -> None:
+        url, load = st.pending
+        st.pending = None
+        st.flushing = True
+        started = time.perf_counter()
+        try:
+            load()
+        finally:
+            st.flushing = False
+        self.record_load(url, time.perf_counter() - started)
+
+    def record_load(self, url: str, seconds: float) -> None:
+        self.loads += 1
+        old = self._load_s.get(url)
+        self._load_s[url] = seconds if old is None else old + 0.5 * (seconds - old)
+
+    @property
+    def saved_s(self) -> float:
+        """Estimated load time avoided: each skipped/collapsed URL at its measured (or mean) load time."""
+        mean = sum(self._load_s.values()) / len(self._load_s) if self._load_s else 0.0
+        return sum(n * self._load_s.get(url, mean) for url, n in self._saved.items())
+
+    def summary(self) -> str:
+        return (f"navigation planner: {self.loads} page loads, {self.skipped} skipped (already there), "
+                f"{self.collapsed} collapsed (never used), ~{self.saved_s:.1f}s saved")
+
+
+_PLANNER: Optional[NavigationPlanner] = None
+
+
+def get_planner() -> Optional[NavigationPlanner]:
+    return _PLANNER
+
+
+def set_planner(planner: Optional[NavigationPlanner]) -> None:
+    global _PLANNER
+    _PLANNER = planner
@@ -0,0 +1,73 @@
+# core/negative_checks.py
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.logger import get_logger
+
+log = get_logger("NegativeChecks")
+
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _call_site() -> Tuple[str, str]:
+    """(first frame outside core/, first frame in a test_*.py file) as 'path:line'."""
+    site = test = ""
+    frame = sys._getframe(2)
+    while frame is not None and not (site and test):
+        path = frame.f_code.co_filename
+        if not site and os.path.dirname(os.path.abspath(path)) != _CORE_DIR:
+            site = f"{os.path.relpath(path)}:{frame.f_lineno}"
+        if not test and os.path.basename(path).startswith("test_"):
+            test = f"{os.path.relpath(path)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return site, test
+
+
+class NegativeCheckLint:
+    """
+    Flags call sites whose negative checks (is_visible/is_present/... answering False,
+    safe_get falling back to its default) took longer than `threshold` seconds, i.e. places
+    that wait out a full explicit timeout where mode="expect_absent" or "now" would do.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = float(threshold)
+        self.sites: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, check: str, locator: Any, elapsed: float) -> None:
+        if elapsed <= self.threshold:
+            return
+        site, test = _call_site()
+        log.warning(f"Slow negative check: {check}{locator} took {elapsed:.2f}s at {site} ({test})")
+        with self._lock:
+            s = self.sites.setdefault((site, check), {"count": 0, "total": 0.0, "max": 0.0, "test": test,
+                                                      "locator": str(locator)})
+            s["count"] += 1
+            s["total"] = round(s["total"] + elapsed, 3)
+            s["max"] = round(max(s["max"], elapsed), 3)
+
+    def report(self) -> List[str]:
+        """One line per flagged call site, slowest total first."""
+        rows = sorted(self.sites.items(), key=lambda kv: -kv[1]["total"])
+        return [
+            f"{site} {check}{s['locator']}: {s['count']}x, {s['total']}s total (max {s['max']}s) e.g. {s['test']}"
+            for (site, check), s in rows
+        ]
+
+
+_LINT: Optional[NegativeCheckLint] = None
+
+
+def get_lint() -> Optional[NegativeCheckLint]:
+    return _LINT
+
+
+def set_lint(lint: Optional[NegativeCheckLint]) -> None:
+    """Enable (conftest, --lint-negative-checks N) or disable negative-check linting."""
+    global _LINT
+    _LINT = lint
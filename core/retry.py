@@ -0,0 +1,163 @@
+# core/retry.py
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class Deadline:
+    """
+    Time left for one action. Nested actions (e.g. a Waiter call inside BasePage.click)
+    never outlive their parent, and nothing outlives the per-test budget.
+    """
+
+    __slots__ = ("name", "target", "timeout", "started", "parent", "attempts", "_policy", "_delay")
+
+    def __init__(self, policy: "RetryPolicy", name: str, target: Any, timeout: float, parent: Optional["Deadline"]):
+        self._policy = policy
+        self.name = name
+        self.target = target
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.parent = parent
+        self.attempts = 1
+        self._delay = policy.backoff
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        left = self.timeout - self.elapsed
+        if self.parent is not None:
+            left = min(left, self.parent.remaining())
+        budget = self._policy.budget_remaining()
+        if budget is not None:
+            left = min(left, budget)
+        return max(0.0, left)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def backoff(self) -> None:
+        """Sleep before the next attempt (exponential, capped, never past the deadline)."""
+        delay = min(self._delay, self.remaining())
+        if delay > 0:
+            time.sleep(delay)
+        self._delay = min(self._delay * self._policy.multiplier, self._policy.backoff_max)
+        self.attempts += 1
+
+
+class RetryPolicy:
+    """
+    Shared retry/deadline policy for BasePage actions and Waiter calls.
+
+    - timeout:      overall deadline of one action, across all of its attempts
+    - backoff*:     delay between attempts (backoff, x multiplier, capped at backoff_max)
+    - test_budget:  optional wall-clock budget for a whole test (0 = none)
+
+    Top-level actions are recorded per test so conftest can report where the time went.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15.0,
+        backoff: float = 0.25,
+        backoff_max: float = 2.0,
+        multiplier: float = 2.0,
+        test_budget: float = 0.0,
+    ):
+        self.timeout = float(timeout)
+        self.backoff = float(backoff)
+        self.backoff_max = float(backoff_max)
+        self.multiplier = float(multiplier)
+        self.test_budget = float(test_budget or 0.0)
+        self.records: List[Dict[str, Any]] = []
+        self._budget_end: Optional[float] = None
+        self._local = threading.local()
+        # callables(event, deadline, ok) notified on action "start"/"end" (e.g. the command tracer)
+        self.listeners: List[Callable[[str, Deadline, Optional[bool]], None]] = []
+
+    # ---- per-test budget ----
+    def begin_test(self, budget: Optional[float] = None) -> None:
+        self.records = []
+        b = self.test_budget if budget is None else float(budget or 0.0)
+        self._budget_end = time.monotonic() + b if b > 0 else None
+
+    def end_test(self) -> List[Dict[str, Any]]:
+        records, self.records = self.records, []
+        self._budget_end = None
+        return records
+
+    def budget_remaining(self) -> Optional[float]:
+        if self._budget_end is None:
+            return None
+        return max(0.0, self._budget_end - time.monotonic())
+
+    @property
+    def budget_exhausted(self) -> bool:
+        left = self.budget_remaining()
+        return left is not None and left <= 0
+
+    # ---- actions ----
+    def _stack(self) -> List[Deadline]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def action(self, name: str, target: Any = None, timeout: Optional[float] = None) -> Iterator[Deadline]:
+        """Run an action under one overall deadline: `with policy.action("click", locator) as dl:`."""
+        stack = self._stack()
+        dl = Deadline(self, name, target, self.timeout if timeout is None else float(timeout),
+                      stack[-1] if stack else None)
+        stack.append(dl)
+        self._notify("start", dl, None)
+        ok = False
+        try:
+            yield dl
+            ok = True
+        finally:
+            stack.pop()
+            self._notify("end", dl, ok)
+            if not stack:
+                self.records.append({
+                    "action": name,
+                    "target": str(target) if target is not None else "",
+                    "elapsed": round(dl.elapsed, 3),
+                    "attempts": dl.attempts,
+                    "ok": ok,
+                })
+
+    def _notify(self, event: str, dl: Deadline, ok: Optional[bool]) -> None:
+        for listener in self.listeners:
+            listener(event, dl, ok)
+
+    @staticmethod
+    def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """{action: {count, total, max, failed}} for a list of records."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for r in records:
+            s = out.setdefault(r["action"], {"count": 0, "total": 0.0, "max": 0.0, "failed": 0})
+            s["count"] += 1
+            s["total"] = round(s["total"] + r["elapsed"], 3)
+            s["max"] = max(s["max"], r["elapsed"])
+            s["failed"] += 0 if r["ok"] else 1
+        return out
+
+
+_POLICY = RetryPolicy()
+
+
+def get_policy() -> RetryPolicy:
+    return _POLICY
+
+
+def set_policy(policy: RetryPolicy) -> None:
+    """Install the session-wide policy (conftest does this from Config)."""
+    global _POLICY
+    _POLICY = policy
@@ -0,0 +1,111 @@
+# core/stable_ui.py
+from __future__ import annotations
+
+import json
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.devtools import execute_cdp
+from core.logger import get_logger
+
+log = get_logger("StableUI")
+
+_CHROMIUM = ("chrome", "edge")
+
+# Zero-length animations still run to their end state (and fire animationend); transitions,
+# smooth scrolling and the blinking caret are switched off outright.
+STABLE_UI_CSS = """
+*, *::before, *::after {
+  transition: none !important;
+  animation-duration: 0s !important;
+  animation-delay: 0s !important;
+  animation-iteration-count: 1 !important;
+  scroll-behavior: auto !important;
+  caret-color: transparent !important;
+}
+"""
+
+# Function body: installs the stylesheet as early as the document allows and drops
+# behavior:'smooth' from programmatic scrolling. Safe to run more than once per document.
+STABLE_UI_JS = r"""
+if (window.__stableUi) return;
+window.__stableUi = true;
+var css = %s;
+function addStyle() {
+  var root = document.head || document.documentElement;
+  if (!root) return false;
+  var s = document.createElement('style');
+  s.setAttribute('data-stable-ui', '');
+  s.textContent = css;
+  root.appendChild(s);
+  return true;
+}
+if (!addStyle()) {
+  new MutationObserver(function (m, obs) { if (addStyle()) obs.disconnect(); })
+    .observe(document, {childList: true, subtree: true});
+}
+function instant(fn) {
+  return function () {
+    var args = Array.prototype.slice.call(arguments);
+    if (args[0] && typeof args[0] === 'object' && args[0].behavior === 'smooth')
+      args[0] = Object.assign({}, args[0], {behavior: 'auto'});
+    return fn.apply(this, args);
+  };
+}
+window.scrollTo = instant(window.scrollTo);
+window.scrollBy = instant(window.scrollBy);
+Element.prototype.scrollIntoView = instant(Element.prototype.scrollIntoView);
+Element.prototype.scrollTo = instant(Element.prototype.scrollTo);
+Element.prototype.scrollBy = instant(Element.prototype.scrollBy);
+""" % json.dumps(" ".join(STABLE_UI_CSS.split()))
+
+
+class StableUISession:
+    """Per driver (`driver.stable_ui`): whether new documents get the script by themselves."""
+
+    __slots__ = ("driver", "preloaded")
+
+    def __init__(self, driver: WebDriver, preloaded: bool):
+        self.driver = driver
+        self.preloaded = preloaded
+
+    def after_load(self) -> None:
+        """Without a preload script (no CDP/BiDi), apply to the document just loaded."""
+        if self.preloaded:
+            return
+        try:
+            self.driver.execute_script(STABLE_UI_JS)
+        except Exception as e:
+            log.debug(f"Stable UI injection failed: {e}")
+
+
+class StableUI:
+    """
+    "Stable UI" mode: every document of the session starts without CSS transitions/animations,
+    smooth scrolling or caret blink, so elements are where they will stay as soon as they are
+    visible. Chromium gets a CDP Page.addScriptToEvaluateOnNewDocument, Firefox a BiDi preload
+    script; anything else gets the script after each BasePage.open(). Waiter/BasePage see
+    `driver.stable_ui` and use shorter settle times.
+    """
+
+    def apply_options(self, browser: str, opts) -> None:
+        """Before session start."""
+        if browser == "firefox":
+            opts.enable_bidi = True
+
+    def attach(self, browser: str, driver: WebDriver) -> StableUISession:
+        """After session start: register the script for every new document."""
+        preloaded = False
+        try:
+            if browser in _CHROMIUM:
+                execute_cdp(driver, "Page.addScriptToEvaluateOnNewDocument",
+                            {"source": f"(function () {{{STABLE_UI_JS}}})();"})
+                preloaded = True
+            elif browser == "firefox":
+                driver.script.pin(f"() => {{{STABLE_UI_JS}}}")
+                preloaded = True
+        except Exception as e:
+            log.warning(f"Stable UI preload script unavailable on {browser}, injecting after each load: {e}")
+        session = StableUISession(driver, preloaded)
+        driver.stable_ui = session
+        return session
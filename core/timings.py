@@ -0,0 +1,321 @@
+# core/timings.py
+from __future__ import annotations
+
+import functools
+import html
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from types import FunctionType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from core.logger import get_logger
+
+log = get_logger("ActionTimings")
+
+# BasePage method -> category; Waiter methods are "wait", methods page objects add are "page object"
+CATEGORIES = {
+    "open": "navigation", "_load": "navigation", "switch_to_frame": "navigation",
+    "switch_to_default": "navigation", "switch_to_window": "navigation", "switch_to_window_by_title": "navigation",
+    "find": "find", "finds": "find", "find_visible": "find", "find_clickable": "find",
+    "click": "interaction", "js_click": "interaction", "type": "interaction", "fill_form": "interaction",
+    "select_by_text": "interaction", "select_by_value": "interaction", "select_by_index": "interaction",
+    "deselect_all": "interaction", "hover": "interaction", "double_click": "interaction",
+    "right_click": "interaction", "drag_and_drop": "interaction", "drag_and_drop_by_offset": "interaction",
+    "scroll_into_view": "interaction", "scroll_to_top": "interaction", "scroll_to_bottom": "interaction",
+    "upload_file": "interaction", "alert_accept": "interaction", "alert_dismiss": "interaction",
+    "alert_type": "interaction",
+    "text_of": "read", "attr": "read", "css": "read", "count": "read", "texts_of_all": "read",
+    "texts_of": "read", "read_all": "read", "selected_texts": "read", "alert_text": "read",
+    "safe_get": "read", "exists_now": "read",
+    "is_visible": "query", "is_present": "query", "is_clickable_now": "query", "is_absent": "query",
+    "wait_all_visible": "wait", "wait_visible": "wait", "wait_clickable": "wait", "wait_invisible": "wait",
+    "wait_text": "wait", "wait_url_contains": "wait", "wait_title_contains": "wait",
+    "page_ready": "wait", "ajax_idle": "wait",
+    "execute_script": "script", "execute_async_script": "script",
+    "screenshot": "capture", "check_visual": "capture",
+}
+# private methods worth their own line (deferred navigations run here)
+EXTRA_METHODS = ("_load",)
+
+_GROWTH = 1.1          # histogram bucket width: percentiles within 10%
+_FLOOR_MS = 0.01
+
+
+class Histogram:
+    """Durations (ms) in log-spaced buckets: constant memory per key, mergeable across workers."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        b = 0 if ms <= _FLOOR_MS else math.ceil(math.log(ms / _FLOOR_MS, _GROWTH))
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def merge(self, other: "Histogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for b, n in other.buckets.items():
+            self.buckets[b] = self.buckets.get(b, 0) + n
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-quantile (never above the observed max)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return min(self.max, _FLOOR_MS * _GROWTH ** b)
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        return {"count": self.count, "total_ms": round(self.total, 1), "p50_ms": round(self.percentile(0.5), 1),
+                "p95_ms": round(self.percentile(0.95), 1), "max_ms": round(self.max, 1)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "total": self.total, "max": self.max,
+                "buckets": {str(b): n for b, n in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Histogram":
+        h = cls()
+        h.count, h.total, h.max = d["count"], d["total"], d["max"]
+        h.buckets = {int(b): n for b, n in d["buckets"].items()}
+        return h
+
+
+class _CallStat:
+    __slots__ = ("category", "hist", "self_ms", "top_ms", "top_count", "errors")
+
+    def __init__(self, category: str):
+        self.category = category
+        self.hist = Histogram()   # inclusive time of every call
+        self.self_ms = 0.0        # minus the time of nested timed calls
+        self.top_ms = 0.0         # calls made by the test itself (nothing timed around them)
+        self.top_count = 0
+        self.errors = 0
+
+
+class ActionTimings:
+    """
+    Low-overhead timers around every public BasePage/Waiter method and the methods page objects
+    add (wrapped once at class level by install()). Each call is tagged (page class, method,
+    locator) and aggregated in place:
+      - per call key: histogram of inclusive times, self time, errors;
+      - per locator: histogram of the outermost call that used it (click -> clickable counts once);
+      - per category: self time, so categories add up to the instrumented wall time.
+    Workers hand their aggregate to the controller (to_dict()/merge()), which writes the report.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.calls: Dict[Tuple[str, str, str], _CallStat] = {}
+        self.locators: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---- instrumentation ----
+    def install(self, *roots: type) -> "ActionTimings":
+        """Wrap the methods of `roots` and every subclass defined so far (call again after imports)."""
+        for root in roots:
+            todo = [root]
+            while todo:
+                cls = todo.pop()
+                todo.extend(cls.__subclasses__())
+                self._instrument(cls, root)
+        return self
+
+    def _instrument(self, cls: type, root: type) -> None:
+        for name, fn in list(vars(cls).items()):
+            if not isinstance(fn, FunctionType) or getattr(fn, "_timed", False):
+                continue
+            if name.startswith("_") and name not in EXTRA_METHODS:
+                continue
+            if root.__name__ == "Waiter":
+                category = "wait"
+            elif cls is root or name in CATEGORIES:
+                category = CATEGORIES.get(name, "other")
+            else:
+                category = "page object"
+            setattr(cls, name, self._wrap(fn, name, category))
+
+    def _wrap(self, fn, name: str, category: str):
+        timings = self
+
+        @functools.wraps(fn)
+        def timed(obj, *args, **kwargs):
+            if not timings.enabled:
+                return fn(obj, *args, **kwargs)
+            stack = timings._stack()
+            loc = args[0] if args and type(args[0]) is tuple and len(args[0]) == 2 else None
+            frame = [0.0, loc]  # nested ms, locator
+            stack.append(frame)
+            ok = False
+            started = time.perf_counter()
+            try:
+                result = fn(obj, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                ms = (time.perf_counter() - started) * 1000
+                stack.pop()
+                if stack:
+                    stack[-1][0] += ms
+                outer_loc = loc is not None and all(f[1] != loc for f in stack)
+                timings._record(type(obj).__name__, name, category, loc, ms, ms - frame[0], ok,
+                                not stack, outer_loc)
+
+        timed._timed = True
+        return timed
+
+    def _stack(self) -> List[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, page: str, method: str, category: str, loc: Optional[tuple], ms: float, self_ms: float,
+                ok: bool, top: bool, outer_loc: bool) -> None:
+        loc_s = str(loc) if loc is not None else ""
+        with self._lock:
+            key = (page, method, loc_s)
+            stat = self.calls.get(key)
+            if stat is None:
+                stat = self.calls[key] = _CallStat(category)
+            stat.hist.add(ms)
+            stat.self_ms += self_ms
+            if top:
+                stat.top_ms += ms
+                stat.top_count += 1
+            if not ok:
+                stat.errors += 1
+            if outer_loc:
+                hist = self.locators.get(loc_s)
+                if hist is None:
+                    hist = self.locators[loc_s] = Histogram()
+                hist.add(ms)
+
+    # ---- worker -> controller ----
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": [{"page": p, "method": m, "locator": l, "category": s.category, "hist": s.hist.to_dict(),
+                           "self_ms": s.self_ms, "top_ms": s.top_ms, "top_count": s.top_count, "errors": s.errors}
+                          for (p, m, l), s in self.calls.items()],
+                "locators": {l: h.to_dict() for l, h in self.locators.items()},
+            }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            for c in data.get("calls", []):
+                key = (c["page"], c["method"], c["locator"])
+                stat = self.calls.get(key)
+                if stat is None:
+                    stat = self.calls[key] = _CallStat(c["category"])
+                stat.hist.merge(Histogram.from_dict(c["hist"]))
+                stat.self_ms += c["self_ms"]
+                stat.top_ms += c["top_ms"]
+                stat.top_count += c["top_count"]
+                stat.errors += c["errors"]
+            for l, h in data.get("locators", {}).items():
+                self.locators.setdefault(l, Histogram()).merge(Histogram.from_dict(h))
+
+    # ---- report ----
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """Categories (self time), slowest page objects / methods (test-level calls), locators, calls."""
+        categories: Dict[str, float] = {}
+        pages: Dict[str, List[float]] = {}
+        methods: Dict[str, List[float]] = {}
+        for (page, method, _), s in self.calls.items():
+            categories[s.category] = categories.get(s.category, 0.0) + s.self_ms
+            if s.top_count:
+                for table, key in ((pages, page), (methods, f"{page}.{method}")):
+                    row = table.setdefault(key, [0.0, 0])
+                    row[0] += s.top_ms
+                    row[1] += s.top_count
+        wall = sum(categories.values()) or 1.0
+
+        def ranked(table: Dict[str, List[float]], label: str) -> List[Dict[str, Any]]:
+            return [{label: k, "total_ms": round(ms, 1), "calls": n}
+                    for k, (ms, n) in sorted(table.items(), key=lambda kv: -kv[1][0])[:top]]
+
+        return {
+            "total_ms": round(sum(categories.values()), 1),
+            "categories": [{"category": c, "self_ms": round(ms, 1), "share": round(ms / wall, 3)}
+                           for c, ms in sorted(categories.items(), key=lambda kv: -kv[1])],
+            "page_objects": ranked(pages, "page"),
+            "methods": ranked(methods, "method"),
+            "locators": [{"locator": l, **h.stats()}
+                         for l, h in sorted(self.locators.items(), key=lambda kv: -kv[1].total)[:top]],
+            "calls": [{"page": p, "method": m, "locator": l, "category": s.category, **s.hist.stats(),
+                       "self_ms": round(s.self_ms, 1), "errors": s.errors}
+                      for (p, m, l), s in sorted(self.calls.items(), key=lambda kv: -kv[1].hist.total)],
+        }
+
+    def write_report(self, path: Union[str, Path]) -> Optional[Path]:
+        """`path`.json (everything) and `path`.html (ranked tables); returns the HTML path."""
+        if not self.calls:
+            return None
+        data = self.report()
+        base = Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        base.with_suffix(".json").write_text(json.dumps(data, indent=1), "utf-8")
+        out = base.with_suffix(".html")
+        out.write_text(_html(data), "utf-8")
+        return out
+
+    def summary(self, top: int = 3) -> List[str]:
+        data = self.report(top)
+        lines = ["where the time went: " + ", ".join(
+            f"{c['category']} {c['self_ms'] / 1000:.1f}s ({c['share']:.0%})" for c in data["categories"])]
+        lines += [f"  {m['method']}: {m['total_ms'] / 1000:.1f}s in {m['calls']} calls" for m in data["methods"]]
+        lines += [f"  {l['locator']}: {l['total_ms'] / 1000:.1f}s, p95 {l['p95_ms']:.0f}ms" for l in data["locators"]]
+        return lines
+
+
+def _table(title: str, rows: Iterable[Dict[str, Any]]) -> str:
+    rows = list(rows)
+    if not rows:
+        return ""
+    cols = list(rows[0])
+    head = "".join(f"<th>{html.escape(c)}</th>" for c in cols)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(str(r[c]))}</td>" for c in cols) + "</tr>" for r in rows)
+    return f"<h2>{html.escape(title)}</h2><table><tr>{head}</tr>{body}</table>"
+
+
+def _html(data: Dict[str, Any]) -> str:
+    style = ("body{font:13px sans-serif;margin:20px}table{border-collapse:collapse;margin-bottom:18px}"
+             "td,th{border:1px solid #ccc;padding:3px 8px;text-align:left}th{background:#eee}")
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Action timings</title>"
+            f"<style>{style}</style></head><body><h1>Action timings ({data['total_ms'] / 1000:.1f}s instrumented)</h1>"
+            + _table("Time per category (self time)", data["categories"])
+            + _table("Slowest page objects (calls made by tests)", data["page_objects"])
+            + _table("Slowest page object methods", data["methods"])
+            + _table("Slowest locators", data["locators"])
+            + _table("All calls", data["calls"][:200])
+            + "</body></html>")
+
+
+_TIMINGS: Optional[ActionTimings] = None
+
+
+def get_timings() -> Optional[ActionTimings]:
+    return _TIMINGS
+
+
+def set_timings(timings: Optional[ActionTimings]) -> None:
+    global _TIMINGS
+    _TIMINGS = timings
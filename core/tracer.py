@@ -0,0 +1,206 @@
+# core/tracer.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from allure_commons import hookimpl, plugin_manager
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.logger import get_logger
+from core.retry import Deadline, RetryPolicy
+
+log = get_logger("CommandTracer")
+
+# WebDriver command name -> summary category (everything else is "other")
+COMMAND_CATEGORIES = {
+    Command.GET: "navigation",
+    Command.GO_BACK: "navigation",
+    Command.GO_FORWARD: "navigation",
+    Command.REFRESH: "navigation",
+    Command.SEND_KEYS_TO_ELEMENT: "typing",
+    Command.CLEAR_ELEMENT: "typing",
+    Command.SCREENSHOT: "screenshot",
+    Command.ELEMENT_SCREENSHOT: "screenshot",
+    Command.GET_PAGE_SOURCE: "screenshot",
+    Command.FIND_ELEMENT: "find",
+    Command.FIND_ELEMENTS: "find",
+    Command.FIND_CHILD_ELEMENT: "find",
+    Command.FIND_CHILD_ELEMENTS: "find",
+    Command.W3C_EXECUTE_SCRIPT: "script",
+    Command.W3C_EXECUTE_SCRIPT_ASYNC: "script",
+    Command.CLICK_ELEMENT: "interaction",
+    Command.W3C_ACTIONS: "interaction",
+}
+
+
+class CommandTracer:
+    """
+    Times every WebDriver HTTP command of the drivers it is attached to (local or Remote: it wraps
+    `command_executor.execute`). Per test it writes a Chrome trace-event JSON (chrome://tracing,
+    ui.perfetto.dev) with one slice per command, allure step and RetryPolicy action, and returns a
+    summary: command count and wall time in waits, navigation, typing and screenshots.
+    """
+
+    def __init__(self, out_dir: Union[str, Path] = "traces"):
+        self.out_dir = Path(out_dir)
+        self.summaries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._test: Optional[str] = None
+        self._thread: Optional[int] = None
+        self._t0 = 0.0
+        self._events: List[Dict[str, Any]] = []
+        self._by_category: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._steps: Dict[str, Any] = {}
+        self._step_stack: List[str] = []
+        self._wait_depth = 0
+        self._wait_s = 0.0
+
+    # ---- wiring ----
+    def install(self, policy: RetryPolicy) -> "CommandTracer":
+        """Listen to allure steps and RetryPolicy actions (once per session)."""
+        plugin_manager.register(self)
+        policy.listeners.append(self._on_action)
+        return self
+
+    def uninstall(self, policy: RetryPolicy) -> None:
+        try:
+            plugin_manager.unregister(self)
+        except Exception:
+            pass
+        if self._on_action in policy.listeners:
+            policy.listeners.remove(self._on_action)
+
+    def attach(self, driver: WebDriver) -> WebDriver:
+        """Wrap the driver's command executor (idempotent; pooled drivers are attached once)."""
+        executor = driver.command_executor
+        if getattr(executor, "_command_tracer", None) is self:
+            return driver
+        original = executor.execute
+
+        def execute(command, params):
+            if not self._recording():
+                return original(command, params)
+            start = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                self._record_command(command, start, time.perf_counter())
+
+        executor.execute = execute
+        executor._command_tracer = self
+        return driver
+
+    # ---- per test ----
+    def begin_test(self, nodeid: str) -> None:
+        with self._lock:
+            self._test = nodeid
+            self._thread = threading.get_ident()
+            self._t0 = time.perf_counter()
+            self._events = []
+            self._by_category = defaultdict(lambda: [0, 0.0])
+            self._steps = {}
+            self._step_stack = []
+            self._wait_depth = 0
+            self._wait_s = 0.0
+
+    def end_test(self) -> Dict[str, Any]:
+        """Stop recording, write the trace file and return the test's summary."""
+        with self._lock:
+            test, events, by_cat = self._test, self._events, dict(self._by_category)
+            wall = time.perf_counter() - self._t0
+            wait_s = self._wait_s
+            self._test = None
+        summary = {
+            "test": test,
+            "commands": int(sum(c for c, _ in by_cat.values())),
+            "wall_s": round(wall, 3),
+            "command_s": round(sum(s for _, s in by_cat.values()), 3),
+            "wait_s": round(wait_s, 3),
+            "navigation_s": round(by_cat.get("navigation", (0, 0.0))[1], 3),
+            "typing_s": round(by_cat.get("typing", (0, 0.0))[1], 3),
+            "screenshot_s": round(by_cat.get("screenshot", (0, 0.0))[1], 3),
+            "by_category": {k: {"count": int(c), "s": round(s, 3)} for k, (c, s) in sorted(by_cat.items())},
+        }
+        summary["trace"] = str(self._write(test or "session", events, summary))
+        self.summaries.append(summary)
+        return summary
+
+    def _write(self, test: str, events: List[Dict[str, Any]], summary: Dict[str, Any]) -> Path:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / (re.sub(r"[^\w.-]+", "_", test).strip("_")[:150] + ".json")
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": self._thread or 0,
+                 "args": {"name": test}}]
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms",
+                       "otherData": {"test": test, "summary": summary}}, f)
+        return path
+
+    # ---- recording ----
+    def _recording(self) -> bool:
+        # commands from background threads (e.g. DriverPool recycling) don't belong to the test
+        return self._test is not None and threading.get_ident() == self._thread
+
+    def _slice(self, name: str, cat: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        self._events.append({
+            "name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": self._thread,
+            "ts": round((start - self._t0) * 1e6, 1), "dur": round((end - start) * 1e6, 1), "args": args,
+        })
+
+    def _record_command(self, command: str, start: float, end: float) -> None:
+        cat = COMMAND_CATEGORIES.get(command, "other")
+        with self._lock:
+            if self._test is None:
+                return
+            stats = self._by_category[cat]
+            stats[0] += 1
+            stats[1] += end - start
+            self._slice(command, cat, start, end, {
+                "test": self._test,
+                "step": self._step_stack[-1] if self._step_stack else "",
+                "in_wait": self._wait_depth > 0,
+            })
+
+    # allure-commons hooks (registered by install())
+    @hookimpl
+    def start_step(self, uuid, title, params):
+        if self._recording():
+            with self._lock:
+                self._steps[uuid] = (title, time.perf_counter())
+                self._step_stack.append(title)
+
+    @hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        if not self._recording():
+            return
+        with self._lock:
+            started = self._steps.pop(uuid, None)
+            if started is None:
+                return
+            title, start = started
+            if self._step_stack and self._step_stack[-1] == title:
+                self._step_stack.pop()
+            self._slice(title, "step", start, time.perf_counter(), {"failed": exc_type is not None})
+
+    # RetryPolicy listener: BasePage actions and Waiter waits as slices; outermost waits add to wait_s
+    def _on_action(self, event: str, dl: Deadline, ok: Optional[bool]) -> None:
+        if not self._recording():
+            return
+        is_wait = dl.name.startswith("wait.")
+        with self._lock:
+            if event == "start":
+                self._wait_depth += is_wait
+                return
+            self._wait_depth -= is_wait
+            if is_wait and self._wait_depth == 0:
+                self._wait_s += dl.elapsed
+            end = time.perf_counter()
+            self._slice(dl.name, "wait" if is_wait else "action", end - dl.elapsed, end,
+                        {"target": str(dl.target or ""), "attempts": dl.attempts, "ok": ok})
@@ -0,0 +1,116 @@
+# core/user_seed.py
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import allure
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.logger import get_logger
+
+log = get_logger("UserSeed")
+
+USERS_KEY = "yuvanbank_users"
+
+# WebDriver sends script arguments as one JSON body; keep each call well under what
+# drivers/grids accept (Selenium Grid's default is a few MB) and under the storage quota.
+MAX_CHUNK_BYTES = 512 * 1024
+
+# execute_script(SEED_JS, key, users, first, last, replace) -> counts
+# Chunks are merged into a Map kept on window between calls; localStorage is parsed on the first
+# chunk and written once on the last, so 10k users cost one JSON.parse + one setItem.
+SEED_JS = r"""
+var key = arguments[0], users = arguments[1], first = arguments[2], last = arguments[3], replace = arguments[4];
+if (first) {
+  var existing = [];
+  if (!replace) { try { existing = JSON.parse(localStorage.getItem(key) || '[]') || []; } catch (e) { existing = []; } }
+  var m = new Map();
+  existing.forEach(function (u) { m.set(u.email || u.Email, u); });
+  window.__userSeed = {map: m, before: m.size, added: 0, updated: 0};
+}
+var s = window.__userSeed;
+users.forEach(function (u) {
+  if (s.map.has(u.email)) { s.updated++; s.map.delete(u.email); } else { s.added++; }
+  s.map.set(u.email, u);
+});
+if (!last) return null;
+localStorage.setItem(key, JSON.stringify(Array.from(s.map.values())));
+delete window.__userSeed;
+return {before: s.before, added: s.added, updated: s.updated, total: s.map.size};
+"""
+
+
+def user_record(row: Any) -> Optional[Dict[str, str]]:
+    """App user from a data row (FirstName/LastName/Email/Password); None when it has no email."""
+    email = str(row.get("Email") or "").strip()
+    if not email:
+        return None
+    return {
+        "first": str(row.get("FirstName") or "Seed"),
+        "last": str(row.get("LastName") or "User"),
+        "email": email,
+        "password": str(row.get("Password") or "Seed@123"),
+    }
+
+
+def _chunks(users: List[Dict[str, str]], max_bytes: int) -> Iterator[List[Dict[str, str]]]:
+    chunk: List[Dict[str, str]] = []
+    size = 2
+    for u in users:
+        n = len(json.dumps(u, ensure_ascii=False).encode("utf-8")) + 1
+        if chunk and size + n > max_bytes:
+            yield chunk
+            chunk, size = [], 2
+        chunk.append(u)
+        size += n
+    yield chunk
+
+
+def seed_users(driver: WebDriver, rows: Iterable[Any], base_url: str = "", key: str = USERS_KEY,
+               replace: bool = False, max_chunk_bytes: int = MAX_CHUNK_BYTES) -> Dict[str, Any]:
+    """
+    Merge user rows (dicts, data_reader Rows, a DataSource...) into the app's `key` list in
+    localStorage. Rows are deduped by email (the last one wins, as do rows over users already
+    stored); rows without an email are skipped. `replace=True` drops the existing users first.
+
+    Returns counts and timing: {rows, skipped, unique, before, added, updated, total, chunks, bytes, elapsed_s}.
+    """
+    started = time.perf_counter()
+    by_email: Dict[str, Dict[str, str]] = {}
+    received = skipped = 0
+    for row in rows:
+        received += 1
+        user = user_record(row)
+        if user is None:
+            skipped += 1
+            continue
+        by_email.pop(user["email"], None)  # keep the latest row, in its position
+        by_email[user["email"]] = user
+    users = list(by_email.values())
+
+    with allure.step(f"Seed {len(users)} users into localStorage '{key}'"):
+        # storage belongs to the app's origin: navigate only when the session is elsewhere
+        if base_url and not (driver.current_url or "").startswith(base_url):
+            driver.get(base_url.rstrip("/") + "/")
+        chunks = list(_chunks(users, max_chunk_bytes))
+        result: Dict[str, Any] = {}
+        for i, chunk in enumerate(chunks):
+            result = driver.execute_script(SEED_JS, key, chunk, i == 0, i == len(chunks) - 1, replace) or result
+
+    result = {
+        "rows": received,
+        "skipped": skipped,
+        "unique": len(users),
+        "before": result.get("before", 0),
+        "added": result.get("added", 0),
+        "updated": result.get("updated", 0),
+        "total": result.get("total", 0),
+        "chunks": len(chunks),
+        "bytes": len(json.dumps(users, ensure_ascii=False).encode("utf-8")),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+    log.info(f"Seeded {result['unique']} users into '{key}' ({result['added']} added, {result['updated']} updated, "
+             f"{result['total']} total) in {result['chunks']} call(s), {result['elapsed_s']}s")
+    return result
@@ -0,0 +1,125 @@
+# core/validation_batch.py
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Sequence, Tuple
+
+import allure
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from core.base_page import BasePage, FormValue, Locator, _form_text, _preview
+from core.dom_scripts import BATCH_PRIME_JS, BATCH_ROW_JS
+from core.logger import get_logger
+from core.retry import get_policy
+
+log = get_logger("ValidationBatch")
+
+
+class ValidationBatch:
+    """
+    Client-side validation matrix on one loaded form: `open_form(page)` runs once, then every case
+    resets the form in place (error elements back to how they loaded, form.reset()), fills its
+    fields through the same setter + input/change/blur path as fill_form(), optionally clicks
+    `submit`, and reads the `errors` texts — one script call per case instead of two page loads.
+
+    `errors` are the messages the case expects: the script waits until all of them show text that
+    has stayed the same for `settle_ms`, at most `timeout` seconds (the RetryPolicy action timeout
+    by default), the same bound a wait_visible() per message had.
+
+    If a case navigates away (the row was valid and the form really submitted), the form is
+    reopened for the next case.
+    """
+
+    def __init__(self, page: BasePage, open_form: Callable[[BasePage], Any], errors: Sequence[Locator],
+                 submit: Optional[Locator] = None, settle_ms: int = 50, timeout: Optional[float] = None):
+        self.page = page
+        self.open_form = open_form
+        self.errors = list(errors)
+        self.submit = submit
+        self.settle_ms = settle_ms
+        self.timeout = timeout
+        self.loads = 0
+        self._primed = False
+        self._script_limit: Optional[float] = None
+
+    def _limit_ms(self) -> int:
+        """Wait bound for one case, kept under the session's async script timeout."""
+        if self._script_limit is None:
+            try:
+                self._script_limit = float(self.page.driver.timeouts.script)
+            except Exception:
+                self._script_limit = 30.0  # WebDriver default
+        timeout = get_policy().timeout if self.timeout is None else self.timeout
+        return int(max(0.0, min(timeout, self._script_limit - 1.0)) * 1000)
+
+    def _load(self) -> None:
+        self.open_form(self.page)
+        found = self.page.driver.execute_script(BATCH_PRIME_JS, [list(loc) for loc in self.errors])
+        if found < len(self.errors):
+            log.warning(f"Only {found} of {len(self.errors)} error elements exist on the loaded form")
+        self.loads += 1
+        self._primed = True
+
+    def check(self, fields: Mapping[Locator, Any]) -> Dict[str, Any]:
+        """One case -> {"errors": {locator: visible text ('' when hidden)}, "url", "elapsed_s"}."""
+        try:
+            return self._check(fields)
+        except Exception:
+            self._primed = False  # the next case starts from a fresh form load
+            raise
+
+    def _check(self, fields: Mapping[Locator, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        payload = [[loc[0], loc[1], _form_text(v.value if isinstance(v, FormValue) else v)]
+                   for loc, v in fields.items()]
+        submit = list(self.submit) if self.submit else None
+        res = None
+        for _ in range(2):
+            if not self._primed:
+                self._load()
+            try:
+                res = self.page.driver.execute_async_script(
+                    BATCH_ROW_JS, payload, submit, [list(loc) for loc in self.errors], self.settle_ms,
+                    self._limit_ms())
+            except WebDriverException as e:
+                if "unload" not in str(e).lower():
+                    raise
+                # the form really submitted and the document went away: no client-side errors shown
+                res = {"primed": True, "navigated": True, "url": "", "fill": [],
+                       "errors": [{"visible": False, "text": ""} for _ in self.errors]}
+            if res.get("primed"):
+                break
+            self._primed = False  # a new document (earlier case navigated late): prime it again
+        if not res or not res.get("primed"):
+            raise WebDriverException("Validation batch: the form could not be reset for this case")
+
+        for (loc, v), r in zip(fields.items(), res["fill"]):
+            if not r.get("ok"):
+                raise NoSuchElementException(f"Validation batch: {loc} {r.get('error')}")
+            secret = (isinstance(v, FormValue) and v.secret) or r.get("type") == "password"
+            log.info(f"Set {loc}: '{_preview(_form_text(v.value if isinstance(v, FormValue) else v), secret)}'")
+        if len(res["fill"]) > len(fields):
+            raise NoSuchElementException(f"Validation batch: {self.submit} {res['fill'][-1].get('error')}")
+        # a case that navigated must not leak into the next one
+        if res.get("navigated"):
+            self._primed = False
+        return {
+            "errors": {loc: e["text"] for loc, e in zip(self.errors, res["errors"])},
+            "url": res["url"],
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+
+    def run(self, cases: Iterable[Tuple[Hashable, Mapping[Locator, Any]]]) -> Dict[Hashable, Any]:
+        """{key: check() result, or the exception the case raised} for every (key, fields) case."""
+        started = time.perf_counter()
+        results: Dict[Hashable, Any] = {}
+        cases = list(cases)
+        with allure.step(f"Run validation batch ({len(cases)} cases)"):
+            for key, fields in cases:
+                try:
+                    results[key] = self.check(fields)
+                except Exception as e:
+                    results[key] = e
+        log.info(f"Validation batch: {len(cases)} cases, {self.loads} form load(s), "
+                 f"{time.perf_counter() - started:.2f}s")
+        return results
@@ -1,4 +1,5 @@
-from typing import Tuple, Optional
+import time
+from typing import Any, Dict, Sequence, Tuple, Optional
 from selenium.webdriver.remote.webdriver import WebDriver, WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -6,95 +7,255 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
     ElementClickInterceptedException,
+    JavascriptException,
     TimeoutException,
 )
 
+from core.dom_scripts import JS_STRATEGIES, OBSERVE_JS, PROBE_JS, SNAPSHOT_JS
+from core.retry import get_policy
+
+# Longest single execute_async_script call; stays below the default 30 s session script timeout.
+_OBSERVE_CHUNK = 20.0
+
 
 class Waiter:
     """
     Handy explicit waits for Selenium.
     `locator` is a tuple like: (By.ID, "username")
+
+    mode="poll"    -> WebDriverWait, one round trip per `poll` seconds.
+    mode="observe" -> element waits install a MutationObserver via execute_async_script and
+                      return as soon as the condition holds (one round trip per wait).
+                      Frames, alerts, URL/title and custom conditions always poll.
+
+    Every wait accepts `timeout=` and runs under the session RetryPolicy, so a wait nested in a
+    BasePage action never outlives that action's deadline (nor the per-test time budget).
     """
 
-    def __init__(self, driver: WebDriver, timeout: int = 15, poll: float = 0.3):
+    # Session-wide default, set from Config/--wait-mode by conftest
+    default_mode = "poll"
+    # Poll interval cap on stable-UI sessions (no transitions/animations: nothing to settle)
+    stable_poll = 0.1
+
+    def __init__(self, driver: WebDriver, timeout: int = 15, poll: float = 0.3, mode: Optional[str] = None):
         self.driver = driver
+        self.timeout = timeout
+        self.stable_ui = getattr(driver, "stable_ui", None) is not None
+        self.poll = min(poll, self.stable_poll) if self.stable_ui else poll
+        self.mode = (mode or self.default_mode).lower()
         self.wait = WebDriverWait(
             driver,
             timeout=timeout,
-            poll_frequency=poll,
+            poll_frequency=self.poll,
             ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
         )
 
+    # --- Deadline-bound waiting ---
+    def _budget(self, timeout: Optional[float]) -> float:
+        return float(self.timeout if timeout is None else timeout)
+
+    def _until(self, condition, name: str, target: Any = None, timeout: Optional[float] = None, message: str = ""):
+        """
+        WebDriverWait.until() under a RetryPolicy action: an enclosing action (e.g. BasePage.click)
+        or the per-test budget can only shorten the wait. Always checks the condition at least once.
+        """
+        policy = get_policy()
+        with policy.action(f"wait.{name}", target, self._budget(timeout)) as dl:
+            wait = WebDriverWait(
+                self.driver,
+                timeout=dl.remaining(),
+                poll_frequency=self.poll,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+            )
+            try:
+                return wait.until(condition, message)
+            except TimeoutException:
+                if policy.budget_exhausted:
+                    raise TimeoutException(f"Test time budget exhausted waiting for {name} {target or ''}".rstrip())
+                raise
+
     # --- Common element waits ---
-    def visible(self, locator: Tuple[str, str]) -> WebElement:
-        return self.wait.until(EC.visibility_of_element_located(locator))
+    def visible(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> WebElement:
+        if self._observing(locator):
+            return self._observe("visible", locator, timeout=timeout)
+        return self._until(EC.visibility_of_element_located(locator), "visible", locator, timeout)
+
+    def clickable(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> WebElement:
+        if self._observing(locator):
+            return self._observe("clickable", locator, timeout=timeout)
+        return self._until(EC.element_to_be_clickable(locator), "clickable", locator, timeout)
+
+    def present(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> WebElement:
+        if self._observing(locator):
+            return self._observe("present", locator, timeout=timeout)
+        return self._until(EC.presence_of_element_located(locator), "present", locator, timeout)
+
+    def visible_all(self, locator: Tuple[str, str], timeout: Optional[float] = None):
+        return self._until(EC.visibility_of_all_elements_located(locator), "visible_all", locator, timeout)
+
+    def present_all(self, locator: Tuple[str, str], timeout: Optional[float] = None):
+        return self._until(EC.presence_of_all_elements_located(locator), "present_all", locator, timeout)
 
-    def clickable(self, locator: Tuple[str, str]) -> WebElement:
-        return self.wait.until(EC.element_to_be_clickable(locator))
+    def invisible(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> bool:
+        if self._observing(locator):
+            return self._observe("invisible", locator, timeout=timeout)
+        return self._until(EC.invisibility_of_element_located(locator), "invisible", locator, timeout)
 
-    def present(self, locator: Tuple[str, str]) -> WebElement:
-        return self.wait.until(EC.presence_of_element_located(locator))
+    def staleness(self, element: WebElement, timeout: Optional[float] = None) -> bool:
+        return self._until(EC.staleness_of(element), "staleness", None, timeout)
 
-    def visible_all(self, locator: Tuple[str, str]):
-        return self.wait.until(EC.visibility_of_all_elements_located(locator))
+    # --- Event-driven (MutationObserver) waits ---
+    def _observing(self, locator: Tuple[str, str]) -> bool:
+        return self.mode == "observe" and locator[0] in JS_STRATEGIES
 
-    def present_all(self, locator: Tuple[str, str]):
-        return self.wait.until(EC.presence_of_all_elements_located(locator))
+    def _observe(self, kind: str, locator: Tuple[Any, Any], text: Any = None, timeout: Optional[float] = None) -> Any:
+        """
+        One execute_async_script per wait (chunked under the script timeout). A navigation
+        unloading the document mid-wait just re-installs the observer on the new page.
+        """
+        by, value = locator
+        policy = get_policy()
+        target = locator if by != "batch" else None
+        with policy.action(f"wait.{kind}", target, self._budget(timeout)) as dl:
+            first = True
+            while True:
+                remaining = dl.remaining()
+                if remaining <= 0 and not first:
+                    if policy.budget_exhausted:
+                        raise TimeoutException(f"Test time budget exhausted waiting for {kind} {locator}")
+                    raise TimeoutException(f"Timed out after {dl.timeout}s waiting for {kind} {locator}")
+                first = False
+                chunk_ms = int(min(remaining, _OBSERVE_CHUNK) * 1000)
+                try:
+                    result = self.driver.execute_async_script(OBSERVE_JS, kind, by, value, text, chunk_ms)
+                except JavascriptException as e:
+                    if "unload" not in str(e).lower():
+                        raise
+                    # document unloaded while waiting: page is navigating, try again on the new one
+                    time.sleep(min(self.poll, dl.remaining()))
+                    continue
+                except TimeoutException:
+                    # session script timeout shorter than our chunk; the loop re-checks the deadline
+                    continue
+                if result and not (isinstance(result, dict) and result.get("__timeout")):
+                    return result
+
+    # --- Batched waits / reads: every locator resolved in one script call ---
+    @staticmethod
+    def _js_capable(locators: Sequence[Tuple[str, str]]) -> bool:
+        return all(loc[0] in JS_STRATEGIES for loc in locators)
+
+    def snapshot(self, *locators: Tuple[str, str], attrs: Sequence[str] = ()) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        No waiting: {locator: {"element", "present", "visible", "text", "attrs"}} for all
+        locators in ONE execute_script. `text` is the trimmed visible text ('' when hidden).
+        """
+        if not self._js_capable(locators):
+            raise ValueError(f"snapshot() supports By strategies {sorted(JS_STRATEGIES)}; got {locators}")
+        rows = self.driver.execute_script(SNAPSHOT_JS, [list(loc) for loc in locators], list(attrs))
+        return dict(zip(locators, rows))
+
+    def probe(self, locator: Tuple[str, str]) -> Dict[str, Any]:
+        """No waiting: {"present", "visible", "clickable", "text"} of the first match in one round trip."""
+        if locator[0] in JS_STRATEGIES:
+            return self.driver.execute_script(PROBE_JS, locator[0], locator[1])
+        els = self.driver.find_elements(*locator)
+        if not els:
+            return {"present": False, "visible": False, "clickable": False, "text": ""}
+        try:
+            vis = els[0].is_displayed()
+            return {"present": True, "visible": vis, "clickable": vis and els[0].is_enabled(),
+                    "text": els[0].text if vis else ""}
+        except StaleElementReferenceException:
+            return {"present": False, "visible": False, "clickable": False, "text": ""}
+
+    def visible_many(
+        self, *locators: Tuple[str, str], attrs: Sequence[str] = (), timeout: Optional[float] = None
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Wait until ALL locators are visible and return their snapshot() rows.
+        One round trip per check (poll) or per wait (observe) instead of one per locator.
+        """
+        if not self._js_capable(locators):
+            rows = {}
+            for loc in locators:
+                el = self.visible(loc, timeout=timeout)
+                rows[loc] = {"element": el, "present": True, "visible": True, "text": el.text,
+                             "attrs": {a: el.get_attribute(a) for a in attrs}}
+            return rows
 
-    def invisible(self, locator: Tuple[str, str]) -> bool:
-        return self.wait.until(EC.invisibility_of_element_located(locator))
+        locs = [list(loc) for loc in locators]
+        if self.mode == "observe":
+            return dict(zip(locators, self._observe("all_visible", ("batch", locs), list(attrs), timeout=timeout)))
 
-    def staleness(self, element: WebElement) -> bool:
-        return self.wait.until(EC.staleness_of(element))
+        last = []
+
+        def _all_visible(d):
+            rows = d.execute_script(SNAPSHOT_JS, locs, list(attrs))
+            last[:] = rows
+            return rows if all(r["visible"] for r in rows) else False
+
+        try:
+            return dict(zip(locators, self._until(_all_visible, "visible_many", None, timeout)))
+        except TimeoutException as e:
+            missing = [loc for loc, r in zip(locators, last) if not r["visible"]] or list(locators)
+            raise TimeoutException(f"{e.msg or f'Timed out after {self._budget(timeout)}s'}; not visible: {missing}")
 
     # --- Text / attribute waits ---
-    def text_in(self, locator: Tuple[str, str], text: str) -> bool:
-        return self.wait.until(EC.text_to_be_present_in_element(locator, text))
+    def text_in(self, locator: Tuple[str, str], text: str, timeout: Optional[float] = None) -> bool:
+        if self._observing(locator):
+            return self._observe("text", locator, text, timeout=timeout)
+        return self._until(EC.text_to_be_present_in_element(locator, text), "text_in", locator, timeout)
 
-    def value_not_empty(self, locator: Tuple[str, str]) -> WebElement:
+    def value_not_empty(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> WebElement:
         def _non_empty_value(_driver):
             el = _driver.find_element(*locator)
             return el if (el.get_attribute("value") or "").strip() != "" else False
 
-        return self.wait.until(_non_empty_value)
+        return self._until(_non_empty_value, "value_not_empty", locator, timeout)
 
-    def attr_contains(self, locator: Tuple[str, str], attr: str, substring: str) -> WebElement:
+    def attr_contains(
+        self, locator: Tuple[str, str], attr: str, substring: str, timeout: Optional[float] = None
+    ) -> WebElement:
         def _attr_has(_driver):
             el = _driver.find_element(*locator)
             val = el.get_attribute(attr) or ""
             return el if substring in val else False
 
-        return self.wait.until(_attr_has)
+        return self._until(_attr_has, "attr_contains", locator, timeout)
 
     # --- Navigation / context waits ---
-    def url_contains(self, fragment: str) -> bool:
-        return self.wait.until(EC.url_contains(fragment))
+    def url_contains(self, fragment: str, timeout: Optional[float] = None) -> bool:
+        return self._until(EC.url_contains(fragment), "url_contains", fragment, timeout)
 
-    def title_is(self, title: str) -> bool:
-        return self.wait.until(EC.title_is(title))
+    def title_is(self, title: str, timeout: Optional[float] = None) -> bool:
+        return self._until(EC.title_is(title), "title_is", title, timeout)
 
-    def title_contains(self, text: str) -> bool:
-        return self.wait.until(EC.title_contains(text))
+    def title_contains(self, text: str, timeout: Optional[float] = None) -> bool:
+        return self._until(EC.title_contains(text), "title_contains", text, timeout)
 
-    def frame_and_switch(self, locator: Tuple[str, str]) -> bool:
-        return self.wait.until(EC.frame_to_be_available_and_switch_to_it(locator))
+    def frame_and_switch(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> bool:
+        return self._until(EC.frame_to_be_available_and_switch_to_it(locator), "frame", locator, timeout)
 
     # --- Page readiness / network helpers ---
-    def js_ready(self) -> bool:
-        """Document readyState == 'complete'."""
-        return self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+    def js_ready(self, interactive_ok: bool = False, timeout: Optional[float] = None) -> bool:
+        """Document readyState == 'complete' (or 'interactive' too, for eager page loads)."""
+        states = ("interactive", "complete") if interactive_ok else ("complete",)
+        return self._until(lambda d: d.execute_script("return document.readyState") in states,
+                           "js_ready", None, timeout)
 
-    def ajax_complete(self, timeout_ok: bool = True) -> bool:
+    def ajax_complete(self, timeout_ok: bool = True, timeout: Optional[float] = None) -> bool:
         """
         Wait until jQuery AJAX is idle (if jQuery exists). If no jQuery on page:
         - returns True immediately.
         If timeout_ok is True and it times out, returns False instead of raising.
         """
         try:
-            return self.wait.until(
+            return self._until(
                 lambda d: d.execute_script(
                     "return !!window.jQuery ? (jQuery.active === 0) : true;"
-                )
+                ),
+                "ajax_complete", None, timeout,
             )
         except TimeoutException:
             if timeout_ok:
@@ -102,8 +263,8 @@ class Waiter:
             raise
 
     # --- Small action helpers using waits ---
-    def wait_and_click(self, locator: Tuple[str, str]) -> WebElement:
-        el = self.clickable(locator)
+    def wait_and_click(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> WebElement:
+        el = self.clickable(locator, timeout=timeout)
         try:
             el.click()
         except ElementClickInterceptedException:
@@ -111,8 +272,10 @@ class Waiter:
             el.click()
         return el
 
-    def wait_and_type(self, locator: Tuple[str, str], text: str, clear: bool = True) -> WebElement:
-        el = self.visible(locator)
+    def wait_and_type(
+        self, locator: Tuple[str, str], text: str, clear: bool = True, timeout: Optional[float] = None
+    ) -> WebElement:
+        el = self.visible(locator, timeout=timeout)
         if clear:
             el.clear()
         el.send_keys(text)
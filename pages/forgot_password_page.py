@@ -13,14 +13,16 @@ class ForgotPasswordPage(BasePage):
     def __init__(self, driver, env):
         super().__init__(driver, env)
 
-    def open_forgot_password_page(self):
-        self.open("/passwordrecovery")
+    def open_forgot_password_page(self, plan=None):
+        self.open("/passwordrecovery", ready=self._forgot_password_page_ready, plan=plan)
+
+    def _forgot_password_page_ready(self):
         self.wait_url_contains("/passwordrecovery")
         self.wait_visible(self.VERIFY_PAGE_RECOVER_PWD)
 
     # ---- Action Methods ----
     def enter_recover_email_address(self, email):
-        self.type(self.EMAIL_INPUT, email)
+        self.type(self.EMAIL_INPUT, email, secret=False)
 
     def click_recover_button(self):
         self.click(self.SUBMIT_BTN)
@@ -9,9 +9,8 @@ class HomePage(BasePage):
     def __init__(self, driver, env):
         super().__init__(driver, env)  # env can be 'qa' or a full URL
 
-    def open_home(self):
-        self.open("/")
-        self.wait_visible(self.LOGO_IMAGE)
+    def open_home(self, plan=None):
+        self.open("/", ready=lambda: self.wait_visible(self.LOGO_IMAGE), plan=plan)
 
     """Page object method"""
     def click_register_button(self):
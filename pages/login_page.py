@@ -2,7 +2,7 @@
 import allure
 from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from core.base_page import BasePage
+from core.base_page import BasePage, FormValue
 
 class LoginPage(BasePage):
     # --- Locators aligned to your UI ---
@@ -34,17 +34,21 @@ class LoginPage(BasePage):
     LOGOUT_BTN=(By.ID, "logoutBtn")
 
     @allure.step("Open Login Page")
-    def open_login_page(self):
-        self.open("/login.html")
+    def open_login_page(self, plan=None):
+        self.open("/login.html", plan=plan)
         # Avoid depending on BasePage.go_to (may not exist in your version)
 
     @allure.step("Enter email: {1}")
     def enter_email_address(self, email):
-        self.type(self.EMAIL_INPUT, email)
+        self.type(self.EMAIL_INPUT, email, secret=False)
 
     @allure.step("Enter password")
     def enter_password(self, password):
-        self.type(self.PASSWORD_INPUT, password)
+        self.type(self.PASSWORD_INPUT, password, secret=True)
+
+    @allure.step("Fill credentials: {email}")
+    def fill_credentials(self, email, password):
+        self.fill_form({self.EMAIL_INPUT: email, self.PASSWORD_INPUT: FormValue(password, secret=True)})
 
     @allure.step("Click Login")
     def click_login_btn(self):
@@ -79,11 +83,17 @@ class LoginPage(BasePage):
     def invalid_email_error(self):
         return self.text_of(self.LOGIN_INVALID_EMAIL_ERROR)
 
-    def verify_settings_button_visible(self):
-        return self.is_visible(self.SETTINGS_BTN)
+    def empty_form_errors(self):
+        """(banner, email required, password required) texts, waited for and read in one round trip."""
+        texts = self.texts_of(self.ERROR_BANNER, self.EMAIL_REQUIRED_ERROR, self.PASSWORD_REQUIRED_ERROR)
+        return texts[self.ERROR_BANNER], texts[self.EMAIL_REQUIRED_ERROR], texts[self.PASSWORD_REQUIRED_ERROR]
+
+    def verify_settings_button_visible(self, timeout=None, mode=None):
+        """mode="expect_absent" when checking a logged-out page (see BasePage.is_visible)."""
+        return self.is_visible(self.SETTINGS_BTN, timeout=timeout, mode=mode)
 
-    def verify_logout_button_visible(self):
-        return self.is_visible(self.LOGOUT_BTN)
+    def verify_logout_button_visible(self, timeout=None, mode=None):
+        return self.is_visible(self.LOGOUT_BTN, timeout=timeout, mode=mode)
 
     def verify_invalid_credentials(self):
         return self.text_of(self.INVALID_CREDENTIALS_ERROR)
\ No newline at end of file
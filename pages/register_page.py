@@ -1,5 +1,5 @@
 from selenium.webdriver.common.by import By
-from core.base_page import BasePage
+from core.base_page import BasePage, FormValue
 import allure
 
 
@@ -27,30 +27,50 @@ class RegisterPage(BasePage):
         super().__init__(driver, env)
 
     @allure.step("Open Register Page")
-    def open_register_page(self):
-        self.open("/register.html")
+    def open_register_page(self, plan=None):
+        self.open("/register.html", ready=self._register_page_ready, plan=plan)
+
+    def _register_page_ready(self):
         self.wait_url_contains("/register.html")
         self.wait_visible(self.REGISTER_BTN)
 
     @allure.step("Enter First Name: {v}")
     def enter_first_name(self, v):
-        self.type(self.FIRSTNAME, v)
+        self.type(self.FIRSTNAME, v, secret=False)
 
     @allure.step("Enter Last Name: {v}")
     def enter_last_name(self, v):
-        self.type(self.LASTNAME, v)
+        self.type(self.LASTNAME, v, secret=False)
 
     @allure.step("Enter Email Address: {v}")
     def enter_email_address(self, v):
-        self.type(self.EMAIL, v)
+        self.type(self.EMAIL, v, secret=False)
 
     @allure.step("Enter Password")
     def enter_password(self, v):
-        self.type(self.PASSWORD, v)
+        self.type(self.PASSWORD, v, secret=True)
 
     @allure.step("Enter Confirm Password")
     def enter_confirm_password(self, v):
-        self.type(self.CONFIRM_PWD, v)
+        self.type(self.CONFIRM_PWD, v, secret=True)
+
+    @classmethod
+    def registration_fields(cls, first, last, email, password, confirm):
+        """{locator: value} for the five fields; fields passed as None are left out."""
+        fields = {
+            cls.FIRSTNAME: first,
+            cls.LASTNAME: last,
+            cls.EMAIL: email,
+            cls.PASSWORD: FormValue(password, secret=True),
+            cls.CONFIRM_PWD: FormValue(confirm, secret=True),
+        }
+        return {loc: v for loc, v in fields.items()
+                if (v.value if isinstance(v, FormValue) else v) is not None}
+
+    @allure.step("Fill registration form: {first} {last} <{email}>")
+    def fill_registration_form(self, first, last, email, password, confirm):
+        """All five fields in one script call; fields passed as None are left untouched."""
+        self.fill_form(self.registration_fields(first, last, email, password, confirm))
 
     @allure.step("Click Register button")
     def click_register_button(self):
@@ -73,3 +93,8 @@ class RegisterPage(BasePage):
 
     def get_first_name_error_text(self):
         return self.text_of(self.FIRST_NAME_ERROR_MESSAGE)
+
+    def get_password_required_error_texts(self):
+        """(passErr, confirmErr) texts, waited for and read in one round trip."""
+        texts = self.texts_of(self.PASSWORD_REQUIRED, self.CONFIRM_PASSWORD_REQUIRED)
+        return texts[self.PASSWORD_REQUIRED], texts[self.CONFIRM_PASSWORD_REQUIRED]
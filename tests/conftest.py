@@ -1,11 +1,30 @@
 # conftest.py
 import os
+import allure
 import pytest
 from argparse import BooleanOptionalAction
 from pathlib import Path
 
-from core.driver_factory import DriverFactory
+from core.driver_factory import DriverFactory, DriverPool, SERVICES
+from core.fast_mode import FastMode
+from core.base_page import BasePage
+from core.browser_state import STATES
+from core.command_budget import CommandCounter, CommandHistory, over_budget
+from core.navigation import NavigationPlanner, get_planner, set_planner
+from core.negative_checks import NegativeCheckLint, get_lint, set_lint
+from core.retry import RetryPolicy, get_policy, set_policy
+from core.stable_ui import StableUI
+from core.timings import ActionTimings, get_timings, set_timings
+from core.tracer import CommandTracer
+from core.user_seed import seed_users
+from core.validation_batch import ValidationBatch
+from core.wait import Waiter
 from utils.config_reader import Config
+from utils.data_reader import DataSource, row_marks
+from utils.perf_history import PerfHistory, describe
+from utils.screenshots import SNAPSHOT_FORMATS, SnapshotService, get_snapshots, set_snapshots
+from utils.sharding import CostHistory, ShardPlanner, base_nodeid, case_key
+from utils.visual import VisualBaselines, get_visual, set_visual
 from core.logger import setup_logging, shutdown_logging, get_logger
 from config.config import DEFAULT_ENV
 
@@ -64,6 +83,395 @@ def pytest_addoption(parser):
         default=_region_normalize(os.getenv("SAUCE_REGION", "us")),
     )
 
+    parser.addoption(
+        "--shared-service",
+        action=BooleanOptionalAction,
+        default=_cfg.shared_service,
+        help="Reuse one local driver binary (chromedriver/geckodriver/msedgedriver) for all sessions."
+    )
+
+    parser.addoption(
+        "--fast-mode",
+        action=BooleanOptionalAction,
+        default=_cfg.fast_mode,
+        help="Eager page loads, blocked images/fonts/analytics and lean browser flags."
+    )
+    parser.addoption(
+        "--fast-mode-stats",
+        action=BooleanOptionalAction,
+        default=_cfg.fast_mode_stats,
+        help="With --fast-mode: log requests blocked / load time skipped per test (chromium: performance log)."
+    )
+    parser.addoption(
+        "--stable-ui",
+        action=BooleanOptionalAction,
+        default=_cfg.stable_ui,
+        help="Disable CSS transitions/animations, smooth scrolling and caret blink on every page (shorter waits)."
+    )
+
+    parser.addoption(
+        "--wait-mode",
+        action="store",
+        choices=["poll", "observe"],
+        default=_cfg.wait_mode,
+        help="Element waits: WebDriverWait polling, or an injected MutationObserver (one round trip per wait)."
+    )
+
+    # Warm session pool: > 0 leases a reset driver to every test instead of sharing one per worker
+    parser.addoption("--pool-size",       action="store", type=int,   default=_cfg.pool_size)
+    parser.addoption("--pool-max-leases", action="store", type=int,   default=_cfg.pool_max_leases)
+    parser.addoption("--pool-max-age",    action="store", type=float, default=_cfg.pool_max_age)
+
+    # Retry policy: one deadline per BasePage action; optional wall-clock budget per test
+    parser.addoption("--action-timeout", action="store", type=float, default=_cfg.action_timeout)
+    parser.addoption("--test-budget",    action="store", type=float, default=_cfg.test_budget,
+                     help="Seconds per test for all actions/waits (0 = none); override with @pytest.mark.time_budget(s).")
+
+    # WebDriver round trips per test: counted always, enforced per @pytest.mark.command_budget(n) or this default
+    parser.addoption("--command-budget", action="store", type=int, default=_cfg.command_budget,
+                     help="Max WebDriver commands per test (0 = only tests marked command_budget).")
+    parser.addoption("--command-budget-mode", action="store", choices=["fail", "warn"],
+                     default=_cfg.command_budget_mode,
+                     help="Over budget: fail the test or only warn (a marker's mode= wins).")
+
+    # Failure snapshots: screenshot + page source (gzipped when large), encoded in the background
+    parser.addoption("--snapshot-format", action="store", choices=SNAPSHOT_FORMATS, default=_cfg.snapshot_format,
+                     help="Screenshot encoding for failure snapshots.")
+    parser.addoption("--snapshot-max-per-test", action="store", type=int, default=_cfg.snapshot_max_per_test,
+                     help="Max failure snapshots attached per test (0 = no limit).")
+
+    # Visual checks: record the current screenshots as the new baselines
+    parser.addoption("--update-baselines", action=BooleanOptionalAction, default=_cfg.update_baselines,
+                     help="BasePage.check_visual(): overwrite the stored baselines instead of comparing.")
+    parser.addoption("--visual-tolerance", action="store", type=int, default=_cfg.visual_tolerance,
+                     help="Per-channel difference (0-255) a pixel may have before it counts as changed.")
+
+    # Negative checks: how long is_visible()/is_present()/safe_get() may take to answer "no"
+    parser.addoption(
+        "--query-mode",
+        action="store",
+        choices=["wait", "expect_absent", "now"],
+        default=_cfg.query_mode,
+        help="Default for is_visible/is_present/is_clickable_now/safe_get: full wait, short grace, or one probe."
+    )
+    parser.addoption("--negative-grace", action="store", type=float, default=_cfg.negative_grace)
+
+    parser.addoption(
+        "--trace-commands",
+        action=BooleanOptionalAction,
+        default=_cfg.trace_commands,
+        help="Time every WebDriver command; one chrome://tracing / Perfetto JSON per test in --trace-dir."
+    )
+    parser.addoption("--trace-dir", action="store", default=_cfg.trace_dir)
+    parser.addoption(
+        "--action-timings",
+        action=BooleanOptionalAction,
+        default=_cfg.action_timings,
+        help="Time every BasePage/Waiter/page object call; report slowest locators, page objects and categories."
+    )
+    parser.addoption("--action-timings-report", action="store", default=_cfg.action_timings_report,
+                     help="Report path without extension (.json and .html are written).")
+
+    # Run-over-run performance history (SQLite) and slowdown detection
+    parser.addoption("--perf-history", action=BooleanOptionalAction, default=_cfg.perf_history,
+                     help="Record per-test/per-step durations and command counts in --perf-history-db.")
+    parser.addoption("--perf-history-db", action="store", default=_cfg.perf_history_db)
+    parser.addoption("--perf-compare", action=BooleanOptionalAction, default=_cfg.perf_compare,
+                     help="Flag tests slower than their median over the last --perf-compare-runs runs.")
+    parser.addoption("--perf-compare-runs", action="store", type=int, default=_cfg.perf_compare_runs)
+    parser.addoption("--perf-threshold", action="store", type=float, default=_cfg.perf_regression_threshold,
+                     help="Relative slowdown that counts as a regression (0.2 = +20%%).")
+
+    # Split cases over CI nodes: data rows by stable key, balanced by historical cost
+    parser.addoption("--shard-index", action="store", type=int, default=_cfg.shard_index, help="0-based")
+    parser.addoption("--shard-count", action="store", type=int, default=_cfg.shard_count)
+    parser.addoption(
+        "--shard-key",
+        action="store",
+        default=",".join(_cfg.shard_key),
+        help="Comma-separated key columns identifying a data row (default: all columns)."
+    )
+
+    parser.addoption(
+        "--duration-schedule",
+        action=BooleanOptionalAction,
+        default=_cfg.duration_schedule,
+        help="With xdist (-n, --dist load): run the longest tests first, using durations from previous runs."
+    )
+
+    parser.addoption(
+        "--element-cache",
+        action=BooleanOptionalAction,
+        default=_cfg.element_cache,
+        help="Reuse resolved element handles per page object (invalidated on navigation/URL change/staleness)."
+    )
+    parser.addoption(
+        "--plan-navigation",
+        action=BooleanOptionalAction,
+        default=_cfg.navigation_planner,
+        help="BasePage.open(): skip reloading the page the session is already on."
+    )
+    parser.addoption(
+        "--defer-navigation",
+        action=BooleanOptionalAction,
+        default=_cfg.navigation_defer,
+        help="With --plan-navigation: postpone opens until the page is used (the load then runs inside that later command)."
+    )
+    parser.addoption(
+        "--batch-validation",
+        action=BooleanOptionalAction,
+        default=_cfg.batch_validation,
+        help="validation_batch tests: check all data rows on one form load (reset in place) instead of one load per row."
+    )
+    parser.addoption(
+        "--lint-negative-checks",
+        action="store",
+        type=float,
+        default=_cfg.negative_check_lint,
+        metavar="SECONDS",
+        help="Report call sites whose negative checks take longer than SECONDS (0 = off)."
+    )
+
+
+_FAST_MODE = None
+_STABLE_UI = None
+_COMMANDS = CommandCounter()
+_COMMAND_HISTORY = None
+_PERF = None
+_PERF_REGRESSIONS = None  # (tests compared, regressions) with --perf-compare
+_OUTCOMES = {}
+_TRACER = None
+_COSTS = None
+_SHARDS = None
+_SCHEDULER = None
+_VALIDATION_BATCH = {}  # "current" -> (test function, driver, ValidationBatch) whose form is loaded
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def pytest_configure(config):
+    global _FAST_MODE, _STABLE_UI, _TRACER, _COSTS, _SHARDS, _COMMAND_HISTORY, _PERF
+    Waiter.default_mode = config.getoption("wait_mode")
+    set_policy(RetryPolicy(
+        timeout=config.getoption("action_timeout"),
+        backoff=_cfg.retry_backoff,
+        backoff_max=_cfg.retry_backoff_max,
+        test_budget=config.getoption("test_budget"),
+    ))
+    BasePage.query_mode = config.getoption("query_mode")
+    BasePage.negative_grace = config.getoption("negative_grace")
+    BasePage.element_cache = config.getoption("element_cache")
+    set_snapshots(SnapshotService(
+        image_format=config.getoption("snapshot_format"),
+        quality=_cfg.snapshot_quality,
+        max_width=_cfg.snapshot_max_width,
+        max_per_test=config.getoption("snapshot_max_per_test"),
+        workers=_cfg.snapshot_workers,
+        gzip_html_over=_cfg.snapshot_gzip_html_over,
+    ))
+    set_visual(VisualBaselines(
+        _cfg.visual_baselines_dir,
+        update=config.getoption("update_baselines"),
+        tolerance=config.getoption("visual_tolerance"),
+        max_diff_ratio=_cfg.visual_max_diff_ratio,
+    ))
+    set_planner(NavigationPlanner(defer=config.getoption("defer_navigation"))
+                if config.getoption("plan_navigation") else None)
+    _COSTS = CostHistory(_cfg.test_costs_file)
+    _COMMAND_HISTORY = CommandHistory(_cfg.command_counts_file)
+    # comparing needs this run's timings, so --perf-compare records them too
+    if (config.getoption("perf_history") or config.getoption("perf_compare")) and not _is_xdist_worker(config):
+        _PERF = PerfHistory(config.getoption("perf_history_db"), browser=config.getoption("browser"),
+                            env=config.getoption("env") or config.getoption("base_url"))
+    if config.getoption("shard_count") > 1:
+        keys = [k.strip() for k in (config.getoption("shard_key") or "").split(",") if k.strip()]
+        _SHARDS = ShardPlanner(config.getoption("shard_index"), config.getoption("shard_count"), keys, _COSTS)
+    if config.getoption("action_timings"):
+        set_timings(ActionTimings().install(BasePage, Waiter))
+    if config.getoption("trace_commands"):
+        _TRACER = CommandTracer(config.getoption("trace_dir")).install(get_policy())
+    lint_after = config.getoption("lint_negative_checks")
+    set_lint(NegativeCheckLint(lint_after) if lint_after and lint_after > 0 else None)
+    if config.getoption("fast_mode"):
+        _FAST_MODE = FastMode(_cfg.fast_mode_block, stats=config.getoption("fast_mode_stats"))
+    if config.getoption("stable_ui"):
+        _STABLE_UI = StableUI()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _FAST_MODE and _FAST_MODE.totals["tests"]:
+        t = _FAST_MODE.totals
+        terminalreporter.write_line(
+            f"fast mode: {t['blocked']} requests blocked, ~{t['saved_s']}s of page load skipped over {t['tests']} tests"
+        )
+    if _TRACER and _TRACER.summaries:
+        n = len(_TRACER.summaries)
+        cmds = sum(s["commands"] for s in _TRACER.summaries)
+        terminalreporter.write_line(f"command trace: {cmds} WebDriver commands over {n} tests -> {_TRACER.out_dir}/")
+    if _SCHEDULER and _SCHEDULER.report():
+        terminalreporter.write_line(_SCHEDULER.report())
+    if _SHARDS and (_SHARDS.kept or _SHARDS.skipped):
+        terminalreporter.write_line(_SHARDS.summary())
+    c = BasePage.cache_totals
+    planner = get_planner()
+    if planner and (planner.skipped or planner.collapsed):
+        terminalreporter.write_line(planner.summary())
+    if STATES.built or STATES.restored:
+        terminalreporter.write_line(
+            f"browser states: {STATES.built} built through the UI, {STATES.restored} restored from snapshots"
+        )
+    if c["hits"] or c["misses"]:
+        terminalreporter.write_line(
+            f"element cache: {c['hits']} hits, {c['misses']} misses, {c['invalidations']} invalidations"
+        )
+    snapshots = get_snapshots()
+    if snapshots.totals["snapshots"] or snapshots.totals["duplicates"] or snapshots.totals["capped"]:
+        terminalreporter.write_line(snapshots.summary())
+    visual = get_visual()
+    if any(v for k, v in visual.totals.items() if k != "ms"):
+        terminalreporter.write_line(visual.summary())
+    if _COMMAND_HISTORY and _COMMAND_HISTORY.current:
+        terminalreporter.section("WebDriver commands per suite (vs previous run)")
+        for line in _COMMAND_HISTORY.table():
+            terminalreporter.write_line(line)
+        for line in _COMMAND_HISTORY.over:
+            terminalreporter.write_line(line)
+    if _PERF is not None and _PERF.run_id is not None:
+        terminalreporter.write_line(f"perf history: run #{_PERF.run_id} ({len(_PERF.tests)} tests, "
+                                    f"{_PERF.browser}/{_PERF.env} @ {_PERF.sha[:10] or '?'}) -> {_PERF.path}")
+    if _PERF_REGRESSIONS is not None:
+        compared, regressions = _PERF_REGRESSIONS
+        runs = terminalreporter.config.getoption("perf_compare_runs")
+        threshold = terminalreporter.config.getoption("perf_threshold")
+        if regressions:
+            terminalreporter.section(f"performance regressions (> +{threshold:.0%} vs median of last {runs} runs)")
+            for r in regressions:
+                terminalreporter.write_line(describe(r))
+        else:
+            terminalreporter.write_line(f"perf compare: no slowdowns over +{threshold:.0%} ({compared} tests compared "
+                                        f"with the last {runs} runs)")
+    timings = get_timings()
+    if timings is not None and timings.calls:
+        terminalreporter.section("action timings")
+        for line in timings.summary():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"report -> {terminalreporter.config.getoption('action_timings_report')}.html/.json")
+    lint = get_lint()
+    if lint and lint.sites:
+        terminalreporter.section(f"slow negative checks (> {lint.threshold}s)")
+        for line in lint.report():
+            terminalreporter.write_line(line)
+
+
+def pytest_generate_tests(metafunc):
+    """
+    @pytest.mark.data_source("data/users.csv", sheet=..., where={"Col": value}, marker="smoke",
+                             markers_column="Markers", id_column="Email", argname="data")
+    parametrizes `argname` from a streamed DataSource at collection time (no module-level reads).
+    Each row also gets the pytest marks listed in its markers column, so `-m` selects rows.
+    """
+    m = metafunc.definition.get_closest_marker("data_source")
+    if m is None:
+        return
+    opts = dict(m.kwargs)
+    argname = opts.pop("argname", "data")
+    where = opts.pop("where", None) or {}
+    marker = opts.pop("marker", None)
+    markers_column = opts.pop("markers_column", "Markers")
+    id_column = opts.pop("id_column", None)
+
+    source = DataSource.open(m.args[0], **opts).where(**where)
+    if marker:
+        source = source.tagged(marker, markers_column)
+    if _SHARDS is not None:
+        # pass 1 reads only row keys; pass 2 keeps the rows this shard owns, others never become items
+        fid = metafunc.definition.nodeid
+        owned = iter(_SHARDS.assign(_SHARDS.row_key(fid, row) for row in source))
+        source = source.where(lambda _row: next(owned))
+        _SHARDS.planned_functions.add(fid)
+    metafunc.parametrize(argname, [
+        pytest.param(
+            row,
+            marks=[getattr(pytest.mark, name) for name in row_marks(row, markers_column)],
+            id=str(row.get(id_column)) if id_column else None,
+        )
+        for row in source
+    ])
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    timings = get_timings()
+    if timings is not None:
+        timings.install(BasePage, Waiter)  # page objects imported by the test modules
+    # cost key travels with the report (xdist workers -> controller) for the cost history
+    keys = [_SHARDS.item_key(item) if _SHARDS else case_key(item) for item in items]
+    for item, key in zip(items, keys):
+        item.user_properties.append(("case_key", key))
+    if _SHARDS is None:
+        return
+    todo = [i for i, item in enumerate(items) if item.nodeid.split("[", 1)[0] not in _SHARDS.planned_functions]
+    owned = dict(zip(todo, _SHARDS.assign(keys[i] for i in todo)))
+    keep = [item for i, item in enumerate(items) if owned.get(i, True)]
+    dropped = [item for i, item in enumerate(items) if not owned.get(i, True)]
+    if dropped:
+        config.hook.pytest_deselected(items=dropped)
+        items[:] = keep
+
+
+_DURATIONS = {}
+
+
+def pytest_runtest_logreport(report):
+    """Record setup+call+teardown time per test (nodeid) and per data row (case_key); WebDriver command counts."""
+    if _COMMAND_HISTORY is not None and report.when == "call":
+        props = dict(report.user_properties)
+        if "webdriver_commands" in props:
+            _COMMAND_HISTORY.record(report.nodeid, props["webdriver_commands"])
+        if "command_budget_exceeded" in props:
+            _COMMAND_HISTORY.over.append(f"{report.nodeid}: {props['command_budget_exceeded']}")
+    if _COSTS is None and _PERF is None:
+        return
+    _DURATIONS[report.nodeid] = _DURATIONS.get(report.nodeid, 0.0) + report.duration
+    if report.failed or (report.skipped and _OUTCOMES.get(report.nodeid) != "failed"):
+        _OUTCOMES[report.nodeid] = report.outcome
+    if report.when == "teardown":
+        total = _DURATIONS.pop(report.nodeid)
+        outcome = _OUTCOMES.pop(report.nodeid, "passed")
+        props = dict(report.user_properties)
+        key = props.get("case_key")
+        if _COSTS is not None:
+            _COSTS.record(report.nodeid, total)
+            if key and key != report.nodeid:
+                _COSTS.record(key, total)
+        if _PERF is not None:
+            commands = props.get("webdriver_commands")
+            _PERF.record_test(report.nodeid, outcome, total, sum(commands.values()) if commands is not None else None,
+                              props.get("action_steps"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # xdist controller: fold each worker's action timings into the session report
+    timings = get_timings()
+    data = getattr(node, "workeroutput", {}).get("action_timings")
+    if timings is not None and data:
+        timings.merge(data)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """-n N with the default 'load' distribution: hand out tests longest-first from recorded durations."""
+    global _SCHEDULER
+    if config.getoption("dist") != "load" or not config.getoption("duration_schedule"):
+        return None
+    from utils.xdist_scheduler import DurationScheduling
+
+    _SCHEDULER = DurationScheduling(config, log, _COSTS)
+    return _SCHEDULER
+
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionstart(session):
@@ -72,6 +480,30 @@ def pytest_sessionstart(session):
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
+    SERVICES.shutdown()
+    get_snapshots().shutdown()
+    if _COSTS is not None and not _is_xdist_worker(session.config):
+        _COSTS.save()
+    if _COMMAND_HISTORY is not None and not _is_xdist_worker(session.config):
+        _COMMAND_HISTORY.save()
+    if _PERF is not None:
+        global _PERF_REGRESSIONS
+        if session.config.getoption("perf_compare"):
+            _PERF_REGRESSIONS = _PERF.regressions(
+                runs=session.config.getoption("perf_compare_runs"),
+                threshold=session.config.getoption("perf_threshold"),
+                min_delta_s=_cfg.perf_min_delta,
+            )
+        try:
+            _PERF.save()
+        except Exception as e:
+            get_logger("perf_history").warning(f"Performance history not saved to {_PERF.path}: {e}")
+    timings = get_timings()
+    if timings is not None:
+        if _is_xdist_worker(session.config):
+            session.config.workeroutput["action_timings"] = timings.to_dict()
+        else:
+            timings.write_report(session.config.getoption("action_timings_report"))
     shutdown_logging()
 
 
@@ -95,58 +527,100 @@ def _on_sauce(driver) -> bool:
     caps = getattr(driver, "capabilities", {}) or {}
     return any(str(k).startswith("sauce:") for k in caps.keys())
 
-@pytest.fixture(autouse=True, scope="session")
-def driver(request):
-    log = get_logger("driver")
-    browser  = str(request.config.getoption("browser") or "").strip().lower()
-    platform = str(request.config.getoption("platform") or "").strip()
-    cloud    = str(request.config.getoption("cloud") or "").strip().lower() or None
-    grid_url = str(request.config.getoption("grid_url") or "").strip() or None
-    remote   = bool(request.config.getoption("remote"))
-    headless = bool(request.config.getoption("headless"))
-
-    # Defaults (may be overridden inside DriverFactory via env for Sauce values only)
-    platform_name   = "Windows 11"
-    browser_version = "latest"
-    sauce_build     = os.getenv("SAUCE_BUILD", "Local/Test Run")
-    sauce_name      = getattr(request.node, "name", "PyTest Run")
-    sauce_tags      = os.getenv("SAUCE_TAGS", "pytest")
-    sauce_region    = _region_normalize(request.config.getoption("sauce_region"))
+def _driver_kwargs(config, session_name: str) -> dict:
+    """DriverFactory.create_driver kwargs from CLI options (shared by pooled and per-session drivers)."""
+    return dict(
+        browser=str(config.getoption("browser") or "").strip().lower(),
+        headless=bool(config.getoption("headless")),
+        remote=bool(config.getoption("remote")),
+        platform=str(config.getoption("platform") or "").strip(),
+        cloud=str(config.getoption("cloud") or "").strip().lower() or None,
+        grid_url=str(config.getoption("grid_url") or "").strip() or None,
+        # Defaults (may be overridden inside DriverFactory via env for Sauce values only)
+        platform_name="Windows 11",
+        browser_version="latest",
+        sauce_build=os.getenv("SAUCE_BUILD", "Local/Test Run"),
+        sauce_name=session_name,
+        sauce_tags=os.getenv("SAUCE_TAGS", "pytest"),
+        sauce_region=_region_normalize(config.getoption("sauce_region")),
+        shared_service=bool(config.getoption("shared_service")),
+        fast_mode=_FAST_MODE,
+        stable_ui=_STABLE_UI,
+    )
+
 
+def _skip_if_sauce_creds_missing(kw: dict) -> None:
     # If remote Sauce requested but creds missing, skip (avoids blowing up local runs)
-    if remote and (cloud == "saucelabs") and (not grid_url):
+    if kw["remote"] and (kw["cloud"] == "saucelabs") and (not kw["grid_url"]):
         if not (os.getenv("SAUCE_USERNAME") and os.getenv("SAUCE_ACCESS_KEY")):
             pytest.skip("SAUCE_USERNAME/SAUCE_ACCESS_KEY not set and no --grid-url provided; skipping Sauce run.")
 
-    drv = None
+
+def _mark_sauce_result(drv, failed: bool) -> None:
+    """Mark job result on Sauce (best-effort)."""
     try:
-        drv = DriverFactory.create_driver(
-            browser=browser,
-            headless=headless,
-            remote=remote,
-            platform=platform,
-            cloud=cloud,
-            grid_url=grid_url,
-            platform_name=platform_name,
-            browser_version=browser_version,
-            sauce_build=sauce_build,
-            sauce_name=sauce_name,
-            sauce_tags=sauce_tags,
-            sauce_region=sauce_region,
-        )
+        if _on_sauce(drv):
+            drv.execute_script(f"sauce:job-result={'failed' if failed else 'passed'}")
+    except Exception as e:
+        get_logger("driver").error(f"Could not set Sauce job result: {e}", exc_info=True)
+
+
+def _pool_enabled(config) -> bool:
+    return int(config.getoption("pool_size") or 0) > 0
+
+
+def _driver_scope(fixture_name, config) -> str:
+    # Pooled drivers are leased per test; otherwise one session per worker.
+    return "function" if _pool_enabled(config) else "session"
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Warm DriverPool for this worker (only used when --pool-size > 0)."""
+    kw = _driver_kwargs(request.config, getattr(request.node, "name", "PyTest Run"))
+    _skip_if_sauce_creds_missing(kw)
+
+    def _make():
+        drv = DriverFactory.create_driver(**kw)
         drv.implicitly_wait(0)
-        yield drv
+        return drv
+
+    pool = DriverPool(
+        _make,
+        size=request.config.getoption("pool_size"),
+        max_leases=request.config.getoption("pool_max_leases"),
+        max_age=request.config.getoption("pool_max_age"),
+        on_retire=lambda s: _mark_sauce_result(s.driver, s.failed),
+        origins=[BasePage(None, request.config.getoption("env") or request.config.getoption("base_url")).base_url],
+    ).start()
+    yield pool
+    pool.shutdown()
 
-        # Mark job result on Sauce (best-effort)
+
+@pytest.fixture(autouse=True, scope=_driver_scope)
+def driver(request):
+    if _pool_enabled(request.config):
+        pool = request.getfixturevalue("driver_pool")
+        drv = _COMMANDS.attach(pool.acquire())
         try:
-            if _on_sauce(drv):
-                outcome = "passed"
-                rep = getattr(request.node, "rep_call", None)
-                if rep and rep.failed:
-                    outcome = "failed"
-                drv.execute_script(f"sauce:job-result={outcome}")
-        except Exception as e:
-            log.error(f"Could not set Sauce job result: {e}", exc_info=True)
+            yield drv
+        finally:
+            rep = getattr(request.node, "rep_call", None)
+            pool.release(drv, failed=bool(rep and rep.failed))
+        return
+
+    log = get_logger("driver")
+    kw = _driver_kwargs(request.config, getattr(request.node, "name", "PyTest Run"))
+    _skip_if_sauce_creds_missing(kw)
+
+    drv = None
+    try:
+        drv = DriverFactory.create_driver(**kw)
+        drv.implicitly_wait(0)
+        yield _COMMANDS.attach(drv)
+
+        rep = getattr(request.node, "rep_call", None)
+        _mark_sauce_result(drv, failed=bool(rep and rep.failed))
     finally:
         try:
             if drv:
@@ -155,29 +629,149 @@ def driver(request):
             log.error(f"driver.quit() failed: {e}", exc_info=True)
 
 
+@pytest.fixture(autouse=True)
+def _command_count(driver, request):
+    """Count this test's WebDriver commands (budget checked in pytest_runtest_makereport)."""
+    _COMMANDS.begin_test(request.node.nodeid)
+    yield
+    _COMMANDS.end_test()
+
+
+@pytest.fixture(autouse=True)
+def _snapshot_scope(request):
+    """Per-test snapshot cap and "unchanged since the last snapshot" check."""
+    snapshots = get_snapshots()
+    snapshots.begin_test(request.node.nodeid)
+    yield
+    snapshots.end_test()
+
+
+@pytest.fixture(autouse=True)
+def _fast_mode_stats(driver, request):
+    """Report requests blocked / load time skipped by fast mode for each test (only with --fast-mode-stats)."""
+    yield
+    session = getattr(driver, "fast_mode", None)
+    if session and session.profile.stats:
+        stats = session.collect()
+        get_logger("fast_mode").info(
+            f"{request.node.nodeid}: blocked={stats['blocked']} {stats['blocked_by_type']} saved={stats['saved_s']}s"
+        )
+
+
+@pytest.fixture(autouse=True)
+def _command_trace(driver, request):
+    """Per-test WebDriver command trace + summary (only with --trace-commands)."""
+    if _TRACER is None:
+        yield
+        return
+    _TRACER.attach(driver)
+    _TRACER.begin_test(request.node.nodeid)
+    yield
+    s = _TRACER.end_test()
+    get_logger("trace").info(
+        f"{s['test']}: {s['commands']} commands in {s['command_s']}s of {s['wall_s']}s | waits {s['wait_s']}s, "
+        f"navigation {s['navigation_s']}s, typing {s['typing_s']}s, screenshots {s['screenshot_s']}s -> {s['trace']}"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _action_budget(request):
+    """Start the per-test time budget and log where the test's time went, per action."""
+    policy = get_policy()
+    marker = request.node.get_closest_marker("time_budget")
+    policy.begin_test(marker.args[0] if marker and marker.args else None)
+    yield
+    summary = RetryPolicy.summarize(policy.end_test())
+    # per-step durations for the performance history (travels with the teardown report)
+    request.node.user_properties.append(("action_steps", summary))
+    if summary:
+        parts = [f"{name}: {s['count']}x {s['total']}s (max {s['max']}s, failed {s['failed']})"
+                 for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["total"])]
+        get_logger("retry").info(f"{request.node.nodeid} actions | " + "; ".join(parts))
+
+
+@pytest.fixture(autouse=True)
+def _navigation_plan(driver):
+    """Drop an open() the test never used instead of loading it during teardown."""
+    yield
+    planner = get_planner()
+    if planner is not None:
+        planner.discard(driver)
+
+
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_runtest_makereport(item, call):
+    budget_msg = mode = None
+    if call.when == "call":
+        # user_properties go into the report (and travel back from xdist workers)
+        counts = _COMMANDS.snapshot()
+        item.user_properties.append(("webdriver_commands", counts))
+        marker = item.get_closest_marker("command_budget")
+        budget = marker.args[0] if marker and marker.args else item.config.getoption("command_budget")
+        mode = (marker.kwargs.get("mode") if marker else None) or item.config.getoption("command_budget_mode")
+        budget_msg = over_budget(counts, int(budget or 0))
+        if budget_msg:
+            item.user_properties.append(("command_budget_exceeded", budget_msg))
     outcome = yield
     rep = outcome.get_result()
     if rep.when == "call":
+        if budget_msg and mode == "fail" and rep.passed:
+            rep.outcome = "failed"
+            rep.longrepr = budget_msg
+        elif budget_msg:
+            item.warn(pytest.PytestWarning(budget_msg))
         setattr(item, "rep_call", rep)
 
 @pytest.fixture
-def seed_registered_user(driver, request):
-    """Ensure a user with given email already exists in localStorage."""
-    email = request.param["Email"]
-    user = {
-        "first": request.param.get("FirstName", "Seed"),
-        "last": request.param.get("LastName", "User"),
-        "email": email,
-        "password": request.param.get("Password", "Seed@123")
-    }
-    # Navigate once so JS context exists
-    driver.get("https://yuvanbank-qa-r1-test.netlify.app/")
-    driver.execute_script("""
-        const key = 'yuvanbank_users';
-        const existing = JSON.parse(localStorage.getItem(key) || '[]');
-        const filtered = existing.filter(u => u.email !== arguments[0].email);
-        filtered.push(arguments[0]);
-        localStorage.setItem(key, JSON.stringify(filtered));
-    """, user)
\ No newline at end of file
+def browser_state(driver, env):
+    """
+    browser_state("user registered", data): the first call per worker (and data row) runs the
+    @state_builder precondition through the UI and snapshots cookies/localStorage/sessionStorage;
+    later calls restore that snapshot in one script call instead.
+    """
+    def use(name, data=None, builder=None):
+        return STATES.ensure(driver, name, data, env, builder)
+    return use
+
+
+@pytest.fixture
+def validation_batch(driver, env, request):
+    """
+    validation_batch(PageClass, PageClass.open_form, inputs(row) -> {locator: value}, [error locators], submit=None)
+    returns this row's {error locator: text}. Each row checks only its own inputs, so its budgets,
+    timings and trace are its own. With --batch-validation consecutive rows of a test function on
+    the same session share one form load: the form is reset in place instead of reloaded.
+    """
+    def result(page_cls, open_form, inputs, errors, submit=None, argname="data"):
+        node = request.node
+        func = base_nodeid(node.nodeid)
+        current = _VALIDATION_BATCH.get("current")
+        if request.config.getoption("batch_validation") and current and current[0] == func and current[1] is driver:
+            batch = current[2]
+        else:
+            batch = ValidationBatch(page_cls(driver, env), open_form, errors, submit)
+            if request.config.getoption("batch_validation"):
+                _VALIDATION_BATCH["current"] = (func, driver, batch)
+        res = batch.check(inputs(node.callspec.params[argname]))
+        with allure.step(f"Validation errors ({res['elapsed_s']}s): "
+                         + "; ".join(f"{loc[1]}='{text}'" for loc, text in res["errors"].items())):
+            return res["errors"]
+    return result
+
+
+@pytest.fixture
+def user_seeder(driver, env):
+    """user_seeder(rows) merges any number of user rows into the app's localStorage (see core.user_seed)."""
+    base_url = BasePage(driver, env).base_url
+
+    def seed(rows, **kwargs):
+        return seed_users(driver, rows, base_url, **kwargs)
+    return seed
+
+
+@pytest.fixture
+def seed_registered_user(user_seeder, request):
+    """Ensure a user with given email already exists in localStorage (indirect param, else the test's `data` row)."""
+    row = request.param if hasattr(request, "param") else request.getfixturevalue("data")
+    if not user_seeder([row])["unique"]:
+        raise ValueError("seed_registered_user needs a row with an Email")
\ No newline at end of file
@@ -5,10 +5,6 @@ from core.wait import Waiter
 from pages.forgot_password_page import ForgotPasswordPage
 from pages.home_page import HomePage
 from utils.assertions import assert_equals
-from utils.data_reader import read_excel
-
-test_data = read_excel("data/register_test_data.xlsx")
-
 
 @allure.feature("ForgotPassword")
 @pytest.mark.regression
@@ -16,7 +12,7 @@ class TestForgotPassword:
 
     # @allure.story("Verify forgot password with valid email")
     # @pytest.mark.smoke
-    # @pytest.mark.parametrize("data", test_data)
+    # @pytest.mark.data_source("data/register_test_data.xlsx")
     def test_verify_forgot_password_functionality_with_valid_data(self, driver, data, env):
         hp = HomePage(driver, env)
         hp.open_home()
@@ -39,7 +35,7 @@ class TestForgotPassword:
 
     # @allure.story("Verify forgot password with invalid email")
     # @pytest.mark.regression
-    # @pytest.mark.parametrize("data", test_data)
+    # @pytest.mark.data_source("data/register_test_data.xlsx")
     def test_verify_forgot_password_functionality_with_invalid_data(self, driver, data, env):
         hp = HomePage(driver, env)
         hp.open_home()
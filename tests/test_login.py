@@ -1,17 +1,23 @@
 import allure
 import pytest
 
+from core.browser_state import state_builder
 from core.wait import Waiter
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.register_page import RegisterPage
 from utils.assertions import assert_equals, assert_true
-from utils.data_reader import read_excel
 
-test_data = read_excel("data/register_test_data.xlsx")
+# ---------- Precondition utils ----------
+USER_EXISTS_JS = """
+    const key='yuvanbank_users';
+    try {
+      const users = JSON.parse(localStorage.getItem(key) || '[]');
+      return users.some(u => (u.email || u.Email) === arguments[0]);
+    } catch(e) { return false; }
+"""
 
 
-# ---------- Precondition utils ----------
 def _resolve_creds(data):
     """Extract credentials from either *Login or register keys."""
     email = data.get("EmailIDLogin") or data.get("Email") or data.get("EmailID")
@@ -23,6 +29,7 @@ def _resolve_creds(data):
     return first, last, email, password
 
 
+@state_builder("user registered")
 @allure.step("Ensure the user is registered (precondition)")
 def ensure_registered(driver, env, data):
     hp = HomePage(driver, env)
@@ -30,26 +37,22 @@ def ensure_registered(driver, env, data):
     first, last, email, password = _resolve_creds(data)
 
     # Check localStorage (browser-side storage)
-    exists = driver.execute_script("""
-        const key='yuvanbank_users';
-        try {
-          const users = JSON.parse(localStorage.getItem(key) || '[]');
-          return users.some(u => (u.email || u.Email) === arguments[0]);
-        } catch(e) { return false; }
-    """, email)
+    exists = driver.execute_script(USER_EXISTS_JS, email)
     if exists:
         return  # already seeded
 
     # Otherwise register via UI
     rp = RegisterPage(driver, env)
     rp.open_register_page()
-    rp.enter_first_name(first)
-    rp.enter_last_name(last)
-    rp.enter_email_address(email)
-    rp.enter_password(password)
-    rp.enter_confirm_password(password)
+    rp.fill_registration_form(first, last, email, password, password)
     rp.click_register_button()
 
+    # The state is captured right after this returns: wait until the app has stored the user
+    # and moved on to the login page, not just until the click was sent
+    lp = LoginPage(driver, env)
+    lp.wait_visible(lp.WELCOME_TITLE)
+    Waiter(driver).wait.until(lambda d: d.execute_script(USER_EXISTS_JS, email))
+
 
 # ---------- Tests ----------
 @allure.feature("Login")
@@ -57,16 +60,15 @@ class TestLogin:
 
     @allure.story("Login with valid credentials")
     @pytest.mark.smoke
-    @pytest.mark.parametrize("data", test_data)
-    def test_login_with_valid_credentials(self, driver, data, env):
-        ensure_registered(driver, env, data)
+    @pytest.mark.data_source("data/register_test_data.xlsx")
+    def test_login_with_valid_credentials(self, driver, data, env, browser_state):
+        browser_state("user registered", data)
 
         lp = LoginPage(driver, env)
         lp.open_login_page()
 
         _, _, email, password = _resolve_creds(data)
-        lp.enter_email_address(email)
-        lp.enter_password(password)
+        lp.fill_credentials(email, password)
         lp.click_login_btn()
 
         Waiter(driver).visible(lp.SETTINGS_BTN)
@@ -82,21 +84,19 @@ class TestLogin:
         lp.open_login_page()
         lp.click_login_btn()
 
-        # Top red banner + field-level errors per UI
-        Waiter(driver).visible(lp.ERROR_BANNER)
-        assert_equals("Please fix the errors above.", lp.login_error_banner(),
+        # Top red banner + field-level errors per UI (waited for and read together)
+        banner, email_error, password_error = lp.empty_form_errors()
+        assert_equals("Please fix the errors above.", banner,
                       msg="Should show validation banner")
 
-        Waiter(driver).visible(lp.EMAIL_REQUIRED_ERROR)
-        Waiter(driver).visible(lp.PASSWORD_REQUIRED_ERROR)
-        assert lp.email_required_error() == "Email is required."
-        assert lp.password_required_error() == "Password is required."
+        assert email_error == "Email is required."
+        assert password_error == "Password is required."
 
     @allure.story("Login with invalid email")
     @pytest.mark.smoke
-    @pytest.mark.parametrize("data", test_data)
-    def test_login_with_invalid_email(self, driver, data, env):
-        ensure_registered(driver, env, data)
+    @pytest.mark.data_source("data/register_test_data.xlsx")
+    def test_login_with_invalid_email(self, driver, data, env, browser_state):
+        browser_state("user registered", data)
 
         lp = LoginPage(driver, env)
         lp.open_login_page()
@@ -113,16 +113,15 @@ class TestLogin:
 
     @allure.story("Login with invalid password")
     @pytest.mark.regression
-    @pytest.mark.parametrize("data", test_data)
-    def test_login_with_invalid_password(self, driver, data, env):
-        ensure_registered(driver, env, data)
+    @pytest.mark.data_source("data/register_test_data.xlsx")
+    def test_login_with_invalid_password(self, driver, data, env, browser_state):
+        browser_state("user registered", data)
 
         lp = LoginPage(driver, env)
         lp.open_login_page()
 
         _, _, email, _ = _resolve_creds(data)
-        lp.enter_email_address(email)
-        lp.enter_password("WrongPassword123")
+        lp.fill_credentials(email, "WrongPassword123")
         lp.click_login_btn()
 
         Waiter(driver).visible(lp.LOGIN_INVALID_CRED_ERROR)
@@ -134,13 +133,12 @@ class TestLogin:
 
     @allure.story("Verify login functionality with Non Registered email")
     @pytest.mark.smoke
-    @pytest.mark.parametrize("data", test_data)
+    @pytest.mark.data_source("data/register_test_data.xlsx")
     def test_login_with_non_registered_email(self,driver,data,env):
 
         lp = LoginPage(driver, env)
         lp.open_login_page()
-        lp.enter_email_address(data["Email"])
-        lp.enter_password(data["Password"])
+        lp.fill_credentials(data["Email"], data["Password"])
         lp.click_login_btn()
 
         assert lp.verify_invalid_credentials() == "Invalid credentials. Please try again."
\ No newline at end of file
@@ -0,0 +1,15 @@
+from core.command_budget import over_budget
+
+
+def test_within_budget_or_no_budget_is_fine():
+    counts = {"findElement": 3, "clickElement": 2}
+    assert over_budget(counts, 5) is None
+    assert over_budget(counts, 0) is None
+    assert over_budget(counts, -1) is None
+    assert over_budget({}, 1) is None
+
+
+def test_over_budget_names_the_total_and_the_biggest_commands_first():
+    msg = over_budget({"clickElement": 2, "findElement": 5, "executeScript": 3}, 6)
+    assert msg == ("WebDriver command budget exceeded: 10 commands > 6 "
+                   "(findElement 5, executeScript 3, clickElement 2)")
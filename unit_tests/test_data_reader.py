@@ -0,0 +1,100 @@
+import json
+
+import openpyxl
+import pytest
+
+from utils.data_reader import CsvSource, DataSource, ExcelSource, JsonLinesSource, row_type
+
+
+def _xlsx(path, rows, sheet="Users"):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    for r in rows:
+        ws.append(list(r))
+    wb.save(path)
+    return path
+
+
+def test_row_reads_like_the_dicts_read_excel_returns():
+    row = row_type(["Email", "First Name"])(("a@example.com", "Ann"))
+    assert row["Email"] == row.Email == row[0] == "a@example.com"
+    assert row.get("First Name") == "Ann" and row.get("Missing", "-") == "-"
+    assert "Email" in row and "Missing" not in row
+    assert dict(row.items()) == row.as_dict() == {"Email": "a@example.com", "First Name": "Ann"}
+    with pytest.raises(KeyError):
+        row["Missing"]
+    with pytest.raises(AttributeError):
+        row.Missing
+
+
+def test_blank_and_duplicate_headers_are_named_like_pandas():
+    assert row_type(["Email", None, "Email", " ", "Email"])._fields == (
+        "Email", "Unnamed: 1", "Email.1", "Unnamed: 3", "Email.2")
+
+
+def test_data_source_needs_a_backend():
+    with pytest.raises(TypeError):
+        DataSource("data.csv")
+    with pytest.raises(ValueError):
+        DataSource.open("data.txt")
+
+
+def test_excel_pads_short_rows_and_skips_empty_ones(tmp_path):
+    path = _xlsx(tmp_path / "users.xlsx", [("Email", "Password", "Markers"), ("a@example.com",),
+                                           (None, None, None), ("b@example.com", "pw", "smoke")])
+    rows = list(DataSource.open(path, sheet="Users"))
+    assert [r.as_dict() for r in rows] == [
+        {"Email": "a@example.com", "Password": None, "Markers": None},
+        {"Email": "b@example.com", "Password": "pw", "Markers": "smoke"},
+    ]
+    assert isinstance(DataSource.open(path), ExcelSource)
+    with pytest.raises(ValueError):
+        list(ExcelSource(path, sheet="Nope"))
+    with pytest.raises(IndexError):
+        list(ExcelSource(path, sheet=3))
+
+
+def test_csv_pads_short_rows_and_cuts_long_ones(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("Email,Password\na@example.com\n\nb@example.com,pw,extra\n", encoding="utf-8")
+    rows = list(CsvSource(path))
+    assert [r.values() for r in rows] == [("a@example.com", None), ("b@example.com", "pw")]
+
+
+def test_json_array_and_json_lines_give_the_same_rows(tmp_path):
+    objs = [{"Email": "a@example.com", "Age": 30}, {"Email": "b@example.com", "Country": "IN"}]
+    array = tmp_path / "users.json"
+    array.write_text("  \n" + json.dumps(objs), encoding="utf-8")
+    lines = tmp_path / "users.jsonl"
+    lines.write_text("\n".join(json.dumps(o) for o in objs) + "\n\n", encoding="utf-8")
+    assert [r.as_dict() for r in JsonLinesSource(array)] == objs
+    assert [r.as_dict() for r in DataSource.open(lines)] == objs
+
+
+def test_bad_json_line_names_the_line(tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"Email": "a@example.com"}\n{oops\n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"users\.jsonl:2:"):
+        list(JsonLinesSource(path))
+
+
+def test_where_and_tagged_filter_without_changing_the_source(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("Email,Country,Markers\n"
+                    "a@example.com,IN,\"smoke, regression\"\n"
+                    "b@example.com,US,regression\n"
+                    "c@example.com,IN,\n", encoding="utf-8")
+    source = CsvSource(path)
+    assert [r.Email for r in source.where(Country="IN")] == ["a@example.com", "c@example.com"]
+    assert [r.Email for r in source.where(Country=("US", "UK"))] == ["b@example.com"]
+    assert [r.Email for r in source.where(lambda r: r.Email.startswith("c"))] == ["c@example.com"]
+    assert [r.Email for r in source.tagged("regression")] == ["a@example.com", "b@example.com"]
+    assert [r.Email for r in source.tagged("smoke").where(Country="IN")] == ["a@example.com"]
+    assert len(list(source)) == 3
+
+
+def test_missing_file_fails_when_iterated(tmp_path):
+    source = CsvSource(tmp_path / "missing.csv")
+    with pytest.raises(FileNotFoundError):
+        list(source)
@@ -0,0 +1,52 @@
+from utils.perf_history import PerfHistory, describe
+
+
+def _run(path, durations, browser="chrome", env="qa", outcome="passed", commands=40):
+    history = PerfHistory(path, browser=browser, env=env, sha="abc")
+    for nodeid, seconds in durations.items():
+        history.record_test(nodeid, outcome, seconds, commands=commands)
+    return history
+
+
+def _past(path, runs, **kwargs):
+    for durations in runs:
+        _run(path, durations, **kwargs).save()
+
+
+def test_slower_than_median_by_threshold_and_delta_is_a_regression(tmp_path):
+    db = tmp_path / "perf.sqlite"
+    _past(db, [{"t::a": 10.0, "t::b": 1.0}, {"t::a": 11.0, "t::b": 1.1}, {"t::a": 9.0, "t::b": 0.9}])
+    compared, out = _run(db, {"t::a": 13.0, "t::b": 1.4}, commands=55).regressions()
+    assert compared == 2
+    # t::b is +40% but only 0.4s slower: under min_delta_s
+    assert [(r["nodeid"], r["median_s"], r["change"], r["median_commands"]) for r in out] == [("t::a", 10.0, 0.3, 40)]
+    assert describe(out[0]) == "t::a: 13.00s vs median 10.00s (+30%) over 3 runs; 55 WebDriver commands vs 40"
+
+
+def test_within_threshold_is_not_a_regression(tmp_path):
+    db = tmp_path / "perf.sqlite"
+    _past(db, [{"t::a": 10.0}] * 3)
+    assert _run(db, {"t::a": 11.9}).regressions() == (1, [])
+
+
+def test_too_few_runs_other_browsers_and_failures_are_not_judged(tmp_path):
+    db = tmp_path / "perf.sqlite"
+    _past(db, [{"t::a": 1.0}] * 2)
+    _past(db, [{"t::a": 1.0}] * 3, browser="firefox")
+    _past(db, [{"t::a": 1.0}] * 3, outcome="failed")
+    assert _run(db, {"t::a": 30.0}).regressions() == (0, [])
+    _past(db, [{"t::a": 1.0}])
+    assert _run(db, {"t::a": 30.0}, outcome="failed").regressions() == (0, [])
+    assert _run(db, {"t::a": 30.0}).regressions()[0] == 1
+
+
+def test_only_the_last_runs_count(tmp_path):
+    db = tmp_path / "perf.sqlite"
+    _past(db, [{"t::a": 1.0}] * 5 + [{"t::a": 10.0}] * 3)
+    assert _run(db, {"t::a": 11.0}).regressions(runs=3) == (1, [])
+    assert len(_run(db, {"t::a": 11.0}).regressions(runs=8)[1]) == 1
+
+
+def test_no_history_file_means_nothing_to_compare(tmp_path):
+    assert _run(tmp_path / "missing.sqlite", {"t::a": 1.0}).regressions() == (0, [])
+    assert not (tmp_path / "missing.sqlite").exists()
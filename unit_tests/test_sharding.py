@@ -0,0 +1,42 @@
+import random
+
+from utils.sharding import CostHistory, ShardPlanner, row_key
+
+
+def _keys(n=200):
+    return [row_key("tests/test_register.py::TestRegister::test_x", {"Email": f"user{i}@example.com", "Row": i})
+            for i in range(n)]
+
+
+def _history(tmp_path, seed, keys):
+    """What one node measured: only some rows, with its own timings."""
+    rng = random.Random(seed)
+    history = CostHistory(tmp_path / f"costs-{seed}.json")
+    for key in rng.sample(keys, len(keys) // 3):
+        history.record(key, rng.uniform(0.1, 30.0))
+    return history
+
+
+def test_every_row_has_exactly_one_owner_whatever_each_node_measured(tmp_path):
+    keys, count = _keys(), 3
+    plans = [ShardPlanner(i, count, history=_history(tmp_path, seed=i, keys=keys)).assign(keys) for i in range(count)]
+    owners = [sum(plan[k] for plan in plans) for k in range(len(keys))]
+    assert owners == [1] * len(keys)
+    assert all(any(plan) for plan in plans)
+
+
+def test_assign_accepts_generators_as_conftest_passes_them(tmp_path):
+    keys = _keys()
+    planner = ShardPlanner(0, 2, history=CostHistory(tmp_path / "costs.json"))
+    owned = planner.assign(key for key in keys)
+    assert len(owned) == len(keys)
+    assert planner.kept == sum(owned) and planner.skipped == len(keys) - sum(owned)
+
+
+def test_row_keeps_its_shard_when_rows_are_added_or_reordered(tmp_path):
+    keys = _keys()
+    before = dict(zip(keys, ShardPlanner(1, 4, history=CostHistory(tmp_path / "a.json")).assign(keys)))
+    more = _keys(260)
+    random.Random(7).shuffle(more)
+    after = dict(zip(more, ShardPlanner(1, 4, history=_history(tmp_path, seed=9, keys=more)).assign(more)))
+    assert all(after[k] == owned for k, owned in before.items())
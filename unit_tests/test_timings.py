@@ -0,0 +1,52 @@
+import random
+
+from core.timings import ActionTimings, Histogram
+
+
+def _hist(values):
+    h = Histogram()
+    for v in values:
+        h.add(v)
+    return h
+
+
+def test_percentiles_are_within_one_bucket_of_the_exact_value():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(3, 1) for _ in range(5000))
+    h = _hist(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert exact <= h.percentile(q) <= exact * 1.1 + 1e-9
+    assert h.percentile(1.0) == max(values)
+    assert h.stats()["count"] == 5000
+
+
+def test_tiny_zero_and_empty():
+    assert Histogram().percentile(0.5) == 0.0
+    h = _hist([0.0, 0.001, 0.0])
+    assert h.buckets == {0: 3}
+    assert h.percentile(0.95) == 0.001
+
+
+def test_merge_equals_recording_everything_in_one_histogram():
+    rng = random.Random(5)
+    a_values = [rng.uniform(1, 500) for _ in range(300)]
+    b_values = [rng.uniform(50, 5000) for _ in range(200)]
+    merged = _hist(a_values)
+    merged.merge(Histogram.from_dict(_hist(b_values).to_dict()))
+    whole = _hist(a_values + b_values)
+    assert (merged.count, merged.max, merged.buckets) == (whole.count, whole.max, whole.buckets)
+    assert abs(merged.total - whole.total) < 1e-6
+    assert merged.stats() == whole.stats()
+
+
+def test_worker_timings_merge_into_the_controller():
+    worker = ActionTimings()
+    worker._record("LoginPage", "click", "action", ("id", "login"), 120.0, 100.0, True, True, True)
+    worker._record("LoginPage", "click", "action", ("id", "login"), 80.0, 80.0, False, True, True)
+    controller = ActionTimings()
+    controller.merge(worker.to_dict())
+    controller.merge(worker.to_dict())
+    stat = controller.calls[("LoginPage", "click", "('id', 'login')")]
+    assert (stat.hist.count, stat.self_ms, stat.top_ms, stat.top_count, stat.errors) == (4, 360.0, 400.0, 4, 2)
+    assert controller.locators["('id', 'login')"].count == 4
@@ -0,0 +1,42 @@
+import json
+
+from core.user_seed import _chunks, user_record
+from utils.data_reader import row_type
+
+
+def _users(n):
+    return [{"first": "Seed", "last": "User", "email": f"user{i}@example.com", "password": "Seed@123"}
+            for i in range(n)]
+
+
+def test_user_record_maps_rows_and_fills_defaults():
+    assert user_record({"Email": " a@example.com ", "FirstName": "Ann", "Password": 1234}) == {
+        "first": "Ann", "last": "User", "email": "a@example.com", "password": "1234"}
+    row = row_type(["FirstName", "LastName", "Email", "Password"])(("Bo", "Lee", "b@example.com", None))
+    assert user_record(row) == {"first": "Bo", "last": "Lee", "email": "b@example.com", "password": "Seed@123"}
+
+
+def test_user_record_skips_rows_without_an_email():
+    assert user_record({"Email": "  "}) is None
+    assert user_record({"Email": None, "FirstName": "Ann"}) is None
+    assert user_record({}) is None
+
+
+def test_chunks_stay_under_the_byte_limit_and_keep_every_user_in_order():
+    users = _users(100)
+    chunks = list(_chunks(users, 1000))
+    assert len(chunks) > 1
+    assert [u for c in chunks for u in c] == users
+    assert all(len(json.dumps(c).encode("utf-8")) <= 1000 for c in chunks)
+
+
+def test_chunks_count_utf8_bytes_not_characters():
+    users = [dict(u, first="Ünïcødé" * 10) for u in _users(10)]
+    for chunk in _chunks(users, 600):
+        assert len(json.dumps(chunk, ensure_ascii=False).encode("utf-8")) <= 600
+
+
+def test_oversized_user_gets_a_chunk_of_its_own_and_nothing_gives_one_empty_chunk():
+    big = dict(_users(1)[0], first="x" * 500)
+    assert list(_chunks([_users(1)[0], big, _users(1)[0]], 200)) == [[_users(1)[0]], [big], [_users(1)[0]]]
+    assert list(_chunks([], 100)) == [[]]
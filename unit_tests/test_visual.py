@@ -0,0 +1,75 @@
+import io
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.visual import (VisualBaselines, _chunks, decode_png, hash_distance, perceptual_hash,
+                          pixel_diff)
+
+
+def _page(width=400, height=300, seed=1):
+    """A screenshot-like image: gradients, flat panels and a noisy block."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    img = np.stack([x * 255 // width, y * 255 // height, (x + y) * 127 // (width + height)], axis=2).astype(np.uint8)
+    img[20:60, 20:width - 20] = (240, 240, 245)
+    img[100:160, 80:300] = rng.integers(0, 256, (60, 220, 3), dtype=np.uint8)
+    return img
+
+
+def _png(pixels, **save_kwargs):
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG", **save_kwargs)
+    return buf.getvalue()
+
+
+def _row_filters(png):
+    idat = b"".join(body for ctype, body in _chunks(png) if ctype == b"IDAT")
+    height = next(int.from_bytes(body[4:8], "big") for ctype, body in _chunks(png) if ctype == b"IHDR")
+    return set(np.frombuffer(zlib.decompress(idat), np.uint8).reshape(height, -1)[:, 0].tolist())
+
+
+def test_decode_adaptively_filtered_png():
+    pixels = _page()
+    png = _png(pixels)
+    assert 4 in _row_filters(png)  # Paeth rows, as adaptive encoders (Chrome's, Pillow's) emit them
+    assert np.array_equal(decode_png(png), pixels)
+
+
+def test_hash_and_diff_on_adaptively_filtered_png():
+    pixels = _page()
+    changed = pixels.copy()
+    changed[200:220, 40:90] = (255, 0, 0)
+    actual, expected = decode_png(_png(changed)), decode_png(_png(pixels, compress_level=1))
+
+    assert perceptual_hash(expected) == perceptual_hash(pixels)
+    assert hash_distance(perceptual_hash(actual), perceptual_hash(expected)) > 0
+    differing, compared = pixel_diff(actual, expected, tolerance=16)
+    assert int(differing.sum()) == 20 * 50
+    ys, xs = np.nonzero(differing)
+    assert (ys.min(), ys.max(), xs.min(), xs.max()) == (200, 219, 40, 89)
+
+    differing, _ = pixel_diff(actual, expected, tolerance=16, regions=[(40, 200, 50, 20)])
+    assert not differing.any()
+
+
+def test_decode_full_hd_screenshot():
+    pixels = _page(1920, 1080)
+    assert np.array_equal(decode_png(_png(pixels)), pixels)
+
+
+@pytest.mark.parametrize("update", [False, True])
+def test_baseline_statuses(tmp_path, update):
+    visual = VisualBaselines(tmp_path, update=update)
+    pixels = _page()
+    assert visual.compare(_png(pixels), "page", "chrome")["status"] == ("updated" if update else "new")
+    if update:
+        return
+    assert visual.compare(_png(pixels), "page", "chrome")["status"] == "identical"
+    assert visual.compare(_png(pixels, compress_level=1), "page", "chrome")["status"] == "hash_match"
+    changed = pixels.copy()
+    changed[200:260, 40:200] = (255, 0, 0)
+    result = visual.compare(_png(changed), "page", "chrome")
+    assert result["status"] == "failed" and result["diff_pixels"] == 60 * 160
@@ -0,0 +1,72 @@
+from utils.sharding import CostHistory
+from utils.xdist_scheduler import DurationEstimator, DurationScheduling, page_objects
+
+TEST_MODULE = '''
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+
+
+def ensure_registered(driver):
+    RegisterPage(driver).open_register_page()
+
+
+class TestLogin:
+    def test_login(self, driver):
+        ensure_registered(driver)
+        LoginPage(driver).open_login_page()
+
+    def test_login_again(self, driver):
+        ensure_registered(driver)
+        LoginPage(driver).open_login_page()
+
+    def test_home(self, driver):
+        HomePage(driver).open_home()
+        LoginPage(driver).open_login_page()
+
+
+def test_nothing():
+    pass
+'''
+
+
+def _estimator(tmp_path, costs):
+    (tmp_path / "tests").mkdir(parents=True)
+    (tmp_path / "tests" / "test_login.py").write_text(TEST_MODULE, "utf-8")
+    history = CostHistory(tmp_path / "costs.json")
+    history.costs.update(costs)
+    return DurationEstimator(history, tmp_path)
+
+
+def test_page_objects_include_the_precondition_helpers_a_test_calls(tmp_path):
+    _estimator(tmp_path, {})
+    assert page_objects("tests/test_login.py::TestLogin::test_login[data1]", tmp_path) == {"LoginPage", "RegisterPage"}
+    assert page_objects("tests/test_login.py::test_nothing", tmp_path) == frozenset()
+    assert page_objects("tests/missing.py::test_x", tmp_path) == frozenset()
+
+
+def test_estimate_prefers_own_history_then_same_pages_then_shared_pages_then_file(tmp_path):
+    mod = "tests/test_login.py::"
+    estimator = _estimator(tmp_path, {mod + "TestLogin::test_login": 20.0, "tests/other.py::test_y": 4.0})
+    assert estimator.estimate([
+        mod + "TestLogin::test_login",        # own history
+        mod + "TestLogin::test_login_again",  # same page objects as test_login
+        mod + "TestLogin::test_home",         # shares LoginPage with test_login
+        mod + "test_nothing",                 # no page objects: same file
+        mod + "TestLogin::test_login",
+    ]) == [20.0, 20.0, 20.0, 20.0, 20.0]
+    assert estimator.estimated == 3
+
+
+def test_estimate_falls_back_to_the_mean_of_everything_known(tmp_path):
+    estimator = _estimator(tmp_path, {"tests/a.py::test_a": 2.0, "tests/b.py::test_b": 6.0})
+    assert estimator.estimate(["tests/c.py::test_c"]) == [4.0]
+    assert _estimator(tmp_path / "empty", {}).estimate(["tests/c.py::test_c"]) == [1.0]
+
+
+def test_makespan_of_longest_first_greedy_assignment():
+    assert DurationScheduling._makespan([8, 5, 4, 3, 2], 2) == 11
+    assert DurationScheduling._makespan([8, 5, 4, 3, 2], 1) == 22
+    assert DurationScheduling._makespan([3, 1], 4) == 3
+    assert DurationScheduling._makespan([], 3) == 0
+    assert DurationScheduling._makespan([2, 2], 0) == 4
@@ -70,6 +70,86 @@ class Config:
             # timeouts / waits
             "timeout": 15,                # explicit wait seconds
             "poll": 0.3,                  # polling frequency
+            "wait_mode": "poll",          # poll|observe (MutationObserver-driven element waits)
+
+            # retry policy: one deadline per BasePage action, backoff between attempts
+            "action_timeout": 15,         # seconds per action, across all of its retries
+            "retry_backoff": 0.25,        # first delay between attempts (doubles each time)
+            "retry_backoff_max": 2.0,     # cap for that delay
+            "test_budget": 0,             # wall-clock seconds per test for all actions (0 = none)
+
+            # negative checks (is_visible/is_present/safe_get answering "no")
+            "query_mode": "wait",         # wait|expect_absent|now
+            "negative_grace": 1.0,        # seconds an expect_absent check waits for the element
+            "negative_check_lint": 0,     # flag call sites spending > N s in negative checks (0 = off)
+
+            # reuse resolved element handles per page object (re-checked in one call, dropped when stale)
+            "element_cache": False,
+
+            # BasePage.open(): skip loads of the page the session is already on
+            "navigation_planner": True,
+            "navigation_defer": False,    # opt-in: also postpone opens until the page is used
+
+            # client-side validation matrices: consecutive rows of a test share one form load (ValidationBatch)
+            "batch_validation": True,
+
+            # reuse one chromedriver/geckodriver/msedgedriver process for all local sessions
+            "shared_service": True,
+
+            # eager loads, blocked images/fonts/analytics, lean browser flags
+            "fast_mode": False,
+            "fast_mode_block": [],        # URL patterns to block (empty = built-in list)
+            "fast_mode_stats": False,     # per-test blocked/saved stats (chromium: performance log)
+
+            # no CSS transitions/animations, smooth scroll or caret blink on any document (shorter waits)
+            "stable_ui": False,
+
+            # driver session pool (0 = one session per worker, no per-test reset)
+            "pool_size": 0,
+            "pool_max_leases": 25,        # recycle a session after N tests (0 = never)
+            "pool_max_age": 600,          # ...or after N seconds (0 = never)
+
+            # per-test WebDriver command traces (Chrome trace-event JSON)
+            "trace_commands": False,
+            "trace_dir": "traces",
+
+            # per page object/method/locator timings, merged over workers into a report (.json + .html)
+            "action_timings": False,
+            "action_timings_report": "reports/action_timings",
+
+            # WebDriver commands per test: default budget (0 = none), fail|warn, counts kept between runs
+            "command_budget": 0,
+            "command_budget_mode": "fail",
+            "command_counts_file": ".cache/command_counts.json",
+
+            # failure snapshots: encoded off the test thread, unchanged pages skipped
+            "snapshot_format": "webp",    # webp|jpeg|png
+            "snapshot_quality": 70,
+            "snapshot_max_width": 1280,   # downscale wider screenshots (0 = keep size)
+            "snapshot_max_per_test": 3,   # 0 = no limit
+            "snapshot_workers": 2,
+            "snapshot_gzip_html_over": 262144,   # page source above this many bytes is attached gzipped
+
+            # visual checks (BasePage.check_visual): baselines per browser, per-channel tolerance, allowed diff
+            "visual_baselines_dir": "data/visual_baselines",
+            "visual_tolerance": 16,
+            "visual_max_diff_ratio": 0.001,
+            "update_baselines": False,
+
+            # run-over-run timings (SQLite; keep as a CI cache) and slowdown detection; CI turns it on (PERF_HISTORY=true)
+            "perf_history": False,
+            "perf_history_db": ".cache/perf_history.sqlite",
+            "perf_compare": False,
+            "perf_compare_runs": 10,          # median over the last N runs
+            "perf_regression_threshold": 0.2, # flag tests > 20% slower than that median...
+            "perf_min_delta": 0.5,            # ...and at least this many seconds slower
+
+            # split cases over CI nodes (stable hash of row keys; not balanced by cost)
+            "shard_index": 0,
+            "shard_count": 1,
+            "shard_key": [],              # key columns of data rows (empty = all columns)
+            "test_costs_file": ".cache/test_costs.json",
+            "duration_schedule": True,    # xdist: longest tests first (from test_costs_file)
 
             # paths & logging
             "screenshots_dir": "screenshots",
@@ -116,6 +196,59 @@ class Config:
 
         self._data["timeout"] = _to_int(os.getenv("TIMEOUT", self._data.get("timeout")), self._data["timeout"])
         self._data["poll"] = _to_float(os.getenv("POLL", self._data.get("poll")), self._data["poll"])
+        self._data["wait_mode"] = str(os.getenv("WAIT_MODE", self._data.get("wait_mode")) or "poll").lower()
+        self._data["action_timeout"] = _to_float(os.getenv("ACTION_TIMEOUT", self._data.get("action_timeout")), 15.0)
+        self._data["retry_backoff"] = _to_float(os.getenv("RETRY_BACKOFF", self._data.get("retry_backoff")), 0.25)
+        self._data["retry_backoff_max"] = _to_float(os.getenv("RETRY_BACKOFF_MAX", self._data.get("retry_backoff_max")), 2.0)
+        self._data["test_budget"] = _to_float(os.getenv("TEST_BUDGET", self._data.get("test_budget")), 0.0)
+        self._data["query_mode"] = str(os.getenv("QUERY_MODE", self._data.get("query_mode")) or "wait").lower()
+        self._data["negative_grace"] = _to_float(os.getenv("NEGATIVE_GRACE", self._data.get("negative_grace")), 1.0)
+        self._data["negative_check_lint"] = _to_float(os.getenv("NEGATIVE_CHECK_LINT", self._data.get("negative_check_lint")), 0.0)
+        self._data["element_cache"] = _to_bool(os.getenv("ELEMENT_CACHE", self._data.get("element_cache")))
+        self._data["navigation_planner"] = _to_bool(os.getenv("NAVIGATION_PLANNER", self._data.get("navigation_planner")))
+        self._data["navigation_defer"] = _to_bool(os.getenv("NAVIGATION_DEFER", self._data.get("navigation_defer")))
+        self._data["batch_validation"] = _to_bool(os.getenv("BATCH_VALIDATION", self._data.get("batch_validation")))
+
+        self._data["shared_service"] = _to_bool(os.getenv("SHARED_SERVICE", self._data.get("shared_service")))
+        self._data["fast_mode"] = _to_bool(os.getenv("FAST_MODE", self._data.get("fast_mode")))
+        self._data["fast_mode_block"] = _to_list(os.getenv("FAST_MODE_BLOCK", self._data.get("fast_mode_block")))
+        self._data["fast_mode_stats"] = _to_bool(os.getenv("FAST_MODE_STATS", self._data.get("fast_mode_stats")))
+        self._data["stable_ui"] = _to_bool(os.getenv("STABLE_UI", self._data.get("stable_ui")))
+        self._data["pool_size"] = _to_int(os.getenv("POOL_SIZE", self._data.get("pool_size")), 0)
+        self._data["pool_max_leases"] = _to_int(os.getenv("POOL_MAX_LEASES", self._data.get("pool_max_leases")), 25)
+        self._data["pool_max_age"] = _to_float(os.getenv("POOL_MAX_AGE", self._data.get("pool_max_age")), 600.0)
+
+        self._data["trace_commands"] = _to_bool(os.getenv("TRACE_COMMANDS", self._data.get("trace_commands")))
+        self._data["trace_dir"] = os.getenv("TRACE_DIR", self._data.get("trace_dir"))
+        self._data["action_timings"] = _to_bool(os.getenv("ACTION_TIMINGS", self._data.get("action_timings")))
+        self._data["action_timings_report"] = os.getenv("ACTION_TIMINGS_REPORT", self._data.get("action_timings_report"))
+        self._data["command_budget"] = _to_int(os.getenv("COMMAND_BUDGET", self._data.get("command_budget")), 0)
+        self._data["command_budget_mode"] = str(os.getenv("COMMAND_BUDGET_MODE", self._data.get("command_budget_mode")) or "fail").lower()
+        self._data["command_counts_file"] = os.getenv("COMMAND_COUNTS_FILE", self._data.get("command_counts_file"))
+        self._data["snapshot_format"] = str(os.getenv("SNAPSHOT_FORMAT", self._data.get("snapshot_format")) or "webp").lower()
+        self._data["snapshot_quality"] = _to_int(os.getenv("SNAPSHOT_QUALITY", self._data.get("snapshot_quality")), 70)
+        self._data["snapshot_max_width"] = _to_int(os.getenv("SNAPSHOT_MAX_WIDTH", self._data.get("snapshot_max_width")), 1280)
+        self._data["snapshot_max_per_test"] = _to_int(os.getenv("SNAPSHOT_MAX_PER_TEST", self._data.get("snapshot_max_per_test")), 3)
+        self._data["snapshot_workers"] = _to_int(os.getenv("SNAPSHOT_WORKERS", self._data.get("snapshot_workers")), 2)
+        self._data["snapshot_gzip_html_over"] = _to_int(
+            os.getenv("SNAPSHOT_GZIP_HTML_OVER", self._data.get("snapshot_gzip_html_over")), 262144)
+        self._data["visual_baselines_dir"] = os.getenv("VISUAL_BASELINES_DIR", self._data.get("visual_baselines_dir"))
+        self._data["visual_tolerance"] = _to_int(os.getenv("VISUAL_TOLERANCE", self._data.get("visual_tolerance")), 16)
+        self._data["visual_max_diff_ratio"] = _to_float(os.getenv("VISUAL_MAX_DIFF_RATIO", self._data.get("visual_max_diff_ratio")), 0.001)
+        self._data["update_baselines"] = _to_bool(os.getenv("UPDATE_BASELINES", self._data.get("update_baselines")))
+
+        self._data["perf_history"] = _to_bool(os.getenv("PERF_HISTORY", self._data.get("perf_history")))
+        self._data["perf_history_db"] = os.getenv("PERF_HISTORY_DB", self._data.get("perf_history_db"))
+        self._data["perf_compare"] = _to_bool(os.getenv("PERF_COMPARE", self._data.get("perf_compare")))
+        self._data["perf_compare_runs"] = _to_int(os.getenv("PERF_COMPARE_RUNS", self._data.get("perf_compare_runs")), 10)
+        self._data["perf_regression_threshold"] = _to_float(os.getenv("PERF_REGRESSION_THRESHOLD", self._data.get("perf_regression_threshold")), 0.2)
+        self._data["perf_min_delta"] = _to_float(os.getenv("PERF_MIN_DELTA", self._data.get("perf_min_delta")), 0.5)
+
+        self._data["shard_index"] = _to_int(os.getenv("SHARD_INDEX", self._data.get("shard_index")), 0)
+        self._data["shard_count"] = _to_int(os.getenv("SHARD_COUNT", self._data.get("shard_count")), 1)
+        self._data["shard_key"] = _to_list(os.getenv("SHARD_KEY", self._data.get("shard_key")))
+        self._data["test_costs_file"] = os.getenv("TEST_COSTS_FILE", self._data.get("test_costs_file"))
+        self._data["duration_schedule"] = _to_bool(os.getenv("DURATION_SCHEDULE", self._data.get("duration_schedule")))
 
         self._data["screenshots_dir"] = os.getenv("SCREENSHOTS_DIR", self._data.get("screenshots_dir"))
         self._data["downloads_dir"] = os.getenv("DOWNLOADS_DIR", self._data.get("downloads_dir"))
@@ -168,6 +301,102 @@ class Config:
     @property
     def poll(self) -> float: return float(self._data["poll"])
     @property
+    def wait_mode(self) -> str: return self._data["wait_mode"]
+    @property
+    def action_timeout(self) -> float: return float(self._data["action_timeout"])
+    @property
+    def retry_backoff(self) -> float: return float(self._data["retry_backoff"])
+    @property
+    def retry_backoff_max(self) -> float: return float(self._data["retry_backoff_max"])
+    @property
+    def test_budget(self) -> float: return float(self._data["test_budget"])
+    @property
+    def query_mode(self) -> str: return self._data["query_mode"]
+    @property
+    def negative_grace(self) -> float: return float(self._data["negative_grace"])
+    @property
+    def negative_check_lint(self) -> float: return float(self._data["negative_check_lint"])
+    @property
+    def element_cache(self) -> bool: return bool(self._data["element_cache"])
+    @property
+    def navigation_planner(self) -> bool: return bool(self._data["navigation_planner"])
+    @property
+    def navigation_defer(self) -> bool: return bool(self._data["navigation_defer"])
+    @property
+    def batch_validation(self) -> bool: return bool(self._data["batch_validation"])
+    @property
+    def shared_service(self) -> bool: return bool(self._data["shared_service"])
+    @property
+    def fast_mode(self) -> bool: return bool(self._data["fast_mode"])
+    @property
+    def fast_mode_block(self) -> List[str]: return list(self._data["fast_mode_block"])
+    @property
+    def fast_mode_stats(self) -> bool: return bool(self._data["fast_mode_stats"])
+    @property
+    def stable_ui(self) -> bool: return bool(self._data["stable_ui"])
+    @property
+    def pool_size(self) -> int: return int(self._data["pool_size"])
+    @property
+    def pool_max_leases(self) -> int: return int(self._data["pool_max_leases"])
+    @property
+    def pool_max_age(self) -> float: return float(self._data["pool_max_age"])
+    @property
+    def trace_commands(self) -> bool: return bool(self._data["trace_commands"])
+    @property
+    def trace_dir(self) -> str: return self._data["trace_dir"]
+    @property
+    def action_timings(self) -> bool: return bool(self._data["action_timings"])
+    @property
+    def action_timings_report(self) -> str: return self._data["action_timings_report"]
+    @property
+    def command_budget(self) -> int: return int(self._data["command_budget"])
+    @property
+    def command_budget_mode(self) -> str: return self._data["command_budget_mode"]
+    @property
+    def command_counts_file(self) -> str: return self._data["command_counts_file"]
+    @property
+    def snapshot_format(self) -> str: return self._data["snapshot_format"]
+    @property
+    def snapshot_quality(self) -> int: return int(self._data["snapshot_quality"])
+    @property
+    def snapshot_max_width(self) -> int: return int(self._data["snapshot_max_width"])
+    @property
+    def snapshot_max_per_test(self) -> int: return int(self._data["snapshot_max_per_test"])
+    @property
+    def snapshot_workers(self) -> int: return int(self._data["snapshot_workers"])
+    @property
+    def snapshot_gzip_html_over(self) -> int: return int(self._data["snapshot_gzip_html_over"])
+    @property
+    def visual_baselines_dir(self) -> str: return self._data["visual_baselines_dir"]
+    @property
+    def visual_tolerance(self) -> int: return int(self._data["visual_tolerance"])
+    @property
+    def visual_max_diff_ratio(self) -> float: return float(self._data["visual_max_diff_ratio"])
+    @property
+    def update_baselines(self) -> bool: return bool(self._data["update_baselines"])
+    @property
+    def perf_history(self) -> bool: return bool(self._data["perf_history"])
+    @property
+    def perf_history_db(self) -> str: return self._data["perf_history_db"]
+    @property
+    def perf_compare(self) -> bool: return bool(self._data["perf_compare"])
+    @property
+    def perf_compare_runs(self) -> int: return int(self._data["perf_compare_runs"])
+    @property
+    def perf_regression_threshold(self) -> float: return float(self._data["perf_regression_threshold"])
+    @property
+    def perf_min_delta(self) -> float: return float(self._data["perf_min_delta"])
+    @property
+    def shard_index(self) -> int: return int(self._data["shard_index"])
+    @property
+    def shard_count(self) -> int: return int(self._data["shard_count"])
+    @property
+    def shard_key(self) -> List[str]: return list(self._data["shard_key"])
+    @property
+    def test_costs_file(self) -> str: return self._data["test_costs_file"]
+    @property
+    def duration_schedule(self) -> bool: return bool(self._data["duration_schedule"])
+    @property
     def sauce(self) -> Dict[str, Optional[str]]: return self._data["sauce"]
     @property
     def browserstack(self) -> Dict[str, Optional[str]]: return self._data["browserstack"]
@@ -1,12 +1,28 @@
-import pandas as pd
+import abc
+import argparse
+import csv
+import hashlib
+import json
+import os
+from datetime import date, datetime, time
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+# Parsed workbooks are cached here as JSON of plain Python rows (no pandas needed to load them;
+# JSON so a cache file can only ever hold data, never code). DATA_CACHE=0 disables the on-disk
+# cache; the per-process memo is always on.
+CACHE_DIR = Path(os.getenv("DATA_CACHE_DIR", ".cache/data"))
+_CACHE_VERSION = 2
+
+# {resolved path: (mtime_ns, size, workbook)} - one parse/load per process
+_MEMO: Dict[str, tuple] = {}
 
 
 def read_excel(file_path: str, sheet_name: Union[str, int] = 0):
     """
     Read exactly ONE sheet and return list[dict].
     Fails if sheet_name is None or a list.
+    The whole workbook is parsed once and cached (see load_workbook).
     """
     if sheet_name is None:
         raise ValueError("sheet_name cannot be None. Pass a sheet NAME (str) or INDEX (int).")
@@ -17,8 +33,384 @@ def read_excel(file_path: str, sheet_name: Union[str, int] = 0):
     if not path.exists():
         raise FileNotFoundError(f"Excel file not found: {file_path}")
 
-    df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-    # Safety: pandas returns a dict only if None/list was passed
-    if isinstance(df, dict):
-        raise RuntimeError("Multiple sheets were loaded unexpectedly. Ensure sheet_name is str/int.")
-    return df.to_dict(orient="records")
\ No newline at end of file
+    book = load_workbook(path)
+    names = book["order"]
+    if isinstance(sheet_name, int):
+        if not -len(names) <= sheet_name < len(names):
+            raise IndexError(f"Worksheet index {sheet_name} is invalid, {len(names)} worksheets found")
+        sheet_name = names[sheet_name]
+    if sheet_name not in book["sheets"]:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    # callers may mutate rows; hand out copies, not the cached dicts
+    return [dict(row) for row in book["sheets"][sheet_name]]
+
+
+def load_workbook(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    {"order": [sheet names], "sheets": {name: list[dict]}} for a workbook.
+    Served from memory, then from the on-disk cache (valid while mtime+size match, or the
+    content hash does), and only parsed with pandas when neither is usable.
+    """
+    path = Path(file_path).resolve()
+    st = path.stat()
+    key = str(path)
+    memo = _MEMO.get(key)
+    if memo and memo[:2] == (st.st_mtime_ns, st.st_size):
+        return memo[2]
+
+    book = _load_cached(path, st) if _cache_enabled() else None
+    if book is None:
+        book = _parse(path)
+        if _cache_enabled():
+            _store(path, st, book)
+    _MEMO[key] = (st.st_mtime_ns, st.st_size, book)
+    return book
+
+
+def warm_cache(paths: Iterable[Union[str, Path]]) -> List[Path]:
+    """Parse and cache the given workbooks (CI pre-warm step). Returns the cache files."""
+    out = []
+    for p in paths:
+        load_workbook(p)
+        out.append(_cache_file(Path(p).resolve()))
+    return out
+
+
+# ---------------- cache internals ----------------
+def _cache_enabled() -> bool:
+    return os.getenv("DATA_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _cache_file(path: Path) -> Path:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{path.stem}-{digest}.json"
+
+
+# cell values JSON has no type for are stored tagged: {"__datetime__": "2024-01-31T00:00:00"}
+_TAGGED = {"__datetime__": datetime, "__date__": date, "__time__": time}
+
+
+def _json_default(value: Any) -> Dict[str, str]:
+    for tag, cls in _TAGGED.items():
+        if type(value) is cls:
+            return {tag: value.isoformat()}
+    raise TypeError(f"{type(value).__name__} values can't be cached")
+
+
+def _json_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+        if tag in _TAGGED:
+            return _TAGGED[tag].fromisoformat(value)
+    return obj
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_cached(path: Path, st: os.stat_result) -> Union[Dict[str, Any], None]:
+    cache = _cache_file(path)
+    try:
+        with cache.open("r", encoding="utf-8") as f:
+            entry = json.load(f, object_hook=_json_object)
+    except Exception:
+        return None
+    if entry.get("version") != _CACHE_VERSION:
+        return None
+    if (entry["mtime_ns"], entry["size"]) == (st.st_mtime_ns, st.st_size):
+        return entry["book"]
+    # touched (checkout, copy) but maybe not changed: the content hash decides
+    if entry["size"] == st.st_size and entry["sha256"] == _file_hash(path):
+        _store(path, st, entry["book"], entry["sha256"])
+        return entry["book"]
+    return None
+
+
+def _store(path: Path, st: os.stat_result, book: Dict[str, Any], sha256: str = "") -> None:
+    cache = _cache_file(path)
+    entry = {
+        "version": _CACHE_VERSION,
+        "source": str(path),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": sha256 or _file_hash(path),
+        "book": book,
+    }
+    try:
+        text = json.dumps(entry, default=_json_default)
+    except (TypeError, ValueError):
+        return  # a cell type JSON can't hold: this workbook is just not cached on disk
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # xdist workers may warm the same file at once: write aside, then swap in atomically
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # read-only checkout etc.: still works, just without the disk cache
+
+
+def _plain(value: Any) -> Any:
+    # numpy scalars / pandas timestamps -> builtins, so loading the cache never needs pandas
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()
+    return value
+
+
+def _parse(path: Path) -> Dict[str, Any]:
+    import pandas as pd  # only when the cache can't serve the file
+
+    frames = pd.read_excel(path, sheet_name=None, engine="openpyxl")
+    sheets = {
+        str(name): [{str(k): _plain(v) for k, v in row.items()} for row in df.to_dict(orient="records")]
+        for name, df in frames.items()
+    }
+    return {"order": list(sheets), "sheets": sheets}
+
+
+# ---------------- streaming sources ----------------
+class Row(tuple):
+    """
+    Compact read-only row: a plain tuple plus the column index shared by every row of its source
+    (namedtuple-style, but works for any header text). Reads like the dicts read_excel returns:
+    row["Email"], row.get("Email"), row.keys(), dict(row); row.Email for identifier-like headers.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return tuple.__getitem__(self, self._index[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(self)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._fields, self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+    def __repr__(self) -> str:
+        return "Row(" + ", ".join(f"{k}={v!r}" for k, v in self.items()) + ")"
+
+
+def row_type(columns: Sequence[Any]) -> type:
+    """A Row subclass for one header; blank/duplicate headers are named like pandas does."""
+    fields: List[str] = []
+    for i, c in enumerate(columns):
+        name = f"Unnamed: {i}" if c is None or str(c).strip() == "" else str(c)
+        base, n = name, 0
+        while name in fields:
+            n += 1
+            name = f"{base}.{n}"
+        fields.append(name)
+    return type("Row", (Row,), {"__slots__": (), "_fields": tuple(fields),
+                                "_index": {f: i for i, f in enumerate(fields)}})
+
+
+def _matches(value: Any, expected: Any) -> bool:
+    if callable(expected):
+        return bool(expected(value))
+    if isinstance(expected, (list, tuple, set, frozenset)):
+        return value in expected
+    return value == expected
+
+
+def row_marks(row: Row, column: str = "Markers") -> List[str]:
+    """Marker names listed in a row's marker column ('smoke, regression' / 'smoke regression')."""
+    raw = row.get(column)
+    if raw is None or (isinstance(raw, float) and raw != raw):
+        return []
+    return [m for m in str(raw).replace(",", " ").split() if m]
+
+
+class DataSource(abc.ABC):
+    """
+    Iterates a data file row by row without loading it whole; rows are compact Row tuples.
+    DataSource.open() picks the backend from the suffix (.xlsx/.xlsm, .csv, .jsonl/.json).
+    where()/tagged() return filtered copies; filters run while streaming, so rejected rows
+    are never kept.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._filters: List[Callable[[Row], bool]] = []
+
+    @staticmethod
+    def open(path: Union[str, Path], **options) -> "DataSource":
+        suffix = Path(path).suffix.lower()
+        backends = {".xlsx": ExcelSource, ".xlsm": ExcelSource, ".csv": CsvSource,
+                    ".jsonl": JsonLinesSource, ".json": JsonLinesSource}
+        if suffix not in backends:
+            raise ValueError(f"Unsupported data file type '{suffix}' ({path}); expected one of {sorted(backends)}")
+        return backends[suffix](path, **options)
+
+    def where(self, predicate: Callable[[Row], bool] = None, **columns: Any) -> "DataSource":
+        """Keep rows passing predicate(row) and column tests (value, collection of values or callable)."""
+        clone = self._copy()
+        if predicate is not None:
+            clone._filters.append(predicate)
+        for col, expected in columns.items():
+            clone._filters.append(lambda r, c=col, e=expected: _matches(r.get(c), e))
+        return clone
+
+    def tagged(self, marker: str, column: str = "Markers") -> "DataSource":
+        """Keep rows whose marker column lists `marker`."""
+        return self.where(lambda r: marker in row_marks(r, column))
+
+    def _copy(self) -> "DataSource":
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._filters = list(self._filters)
+        return clone
+
+    def __iter__(self) -> Iterator[Row]:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Data file not found: {self.path}")
+        for row in self._rows():
+            if all(f(row) for f in self._filters):
+                yield row
+
+    @abc.abstractmethod
+    def _rows(self) -> Iterator[Row]:
+        """Every row of the file, unfiltered."""
+
+
+class ExcelSource(DataSource):
+    """One sheet (name or index) via openpyxl read-only mode: rows are streamed from the zip."""
+
+    def __init__(self, path: Union[str, Path], sheet: Union[str, int] = 0):
+        super().__init__(path)
+        self.sheet = sheet
+
+    def _rows(self) -> Iterator[Row]:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            if isinstance(self.sheet, int):
+                if not -len(wb.worksheets) <= self.sheet < len(wb.worksheets):
+                    raise IndexError(f"Worksheet index {self.sheet} is invalid, {len(wb.worksheets)} worksheets found")
+                ws = wb.worksheets[self.sheet]
+            elif self.sheet in wb.sheetnames:
+                ws = wb[self.sheet]
+            else:
+                raise ValueError(f"Worksheet named '{self.sheet}' not found")
+            values = ws.iter_rows(values_only=True)
+            header = next(values, None)
+            if header is None:
+                return
+            make, width = row_type(header), len(header)
+            for cells in values:
+                if all(c is None for c in cells):
+                    continue  # formatted-but-empty rows at the end of a sheet
+                cells = tuple(cells[:width]) + (None,) * (width - len(cells))
+                yield make(cells)
+        finally:
+            wb.close()
+
+
+class CsvSource(DataSource):
+    """CSV with a header row; values stay strings. Extra options go to csv.reader (delimiter=...)."""
+
+    def __init__(self, path: Union[str, Path], encoding: str = "utf-8-sig", **csv_options):
+        super().__init__(path)
+        self.encoding = encoding
+        self.csv_options = csv_options
+
+    def _rows(self) -> Iterator[Row]:
+        with self.path.open("r", encoding=self.encoding, newline="") as f:
+            reader = csv.reader(f, **self.csv_options)
+            header = next(reader, None)
+            if header is None:
+                return
+            make, width = row_type(header), len(header)
+            for cells in reader:
+                if not any(cells):
+                    continue
+                yield make(tuple(cells[:width]) + (None,) * (width - len(cells)))
+
+
+class JsonLinesSource(DataSource):
+    """
+    One JSON object per line. A file holding a single JSON array is accepted too, but is
+    parsed whole (no streaming) - convert big ones to JSON-lines.
+    """
+
+    def _rows(self) -> Iterator[Row]:
+        types: Dict[Tuple[str, ...], type] = {}
+
+        def make(obj: Dict[str, Any]) -> Row:
+            keys = tuple(obj)
+            if keys not in types:
+                types[keys] = row_type(keys)
+            return types[keys](tuple(obj.values()))
+
+        with self.path.open("r", encoding="utf-8") as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+            if first == "[":
+                f.seek(0)
+                for obj in json.load(f):
+                    yield make(obj)
+                return
+            f.seek(0)
+            for n, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{self.path}:{n}: invalid JSON line: {e}") from e
+                yield make(obj)
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.data_reader",
+        description="Pre-warm the test data cache (parse each workbook once, e.g. as a CI step).",
+    )
+    parser.add_argument("files", nargs="*", help="Workbooks to cache (default: data/*.xlsx)")
+    args = parser.parse_args(argv)
+    files = args.files or sorted(str(p) for p in Path("data").glob("*.xlsx"))
+    for src, cache in zip(files, warm_cache(files)):
+        book = load_workbook(src)
+        rows = sum(len(r) for r in book["sheets"].values())
+        print(f"{src}: {len(book['order'])} sheets, {rows} rows -> {cache}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
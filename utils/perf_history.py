@@ -0,0 +1,157 @@
+# utils/perf_history.py
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from config.config import DEFAULT_ENV, ENVIRONMENTS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT, git_sha TEXT, browser TEXT, env TEXT, base_url TEXT, tests INTEGER, duration_s REAL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER REFERENCES runs(id), nodeid TEXT, outcome TEXT, duration_s REAL, commands INTEGER,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER REFERENCES runs(id), nodeid TEXT, action TEXT, count INTEGER, total_s REAL, max_s REAL,
+    failed INTEGER
+);
+CREATE INDEX IF NOT EXISTS tests_by_nodeid ON tests (nodeid, run_id);
+"""
+
+
+def git_sha() -> str:
+    """Commit under test: CI variables first, then `git rev-parse`; '' outside a checkout."""
+    for var in ("GIT_COMMIT", "GITHUB_SHA", "CI_COMMIT_SHA"):
+        if os.getenv(var):
+            return os.environ[var]
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() if out.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def env_alias(value: str) -> Tuple[str, str]:
+    """--env value (alias or URL) -> (alias from config.ENVIRONMENTS or 'custom', base URL)."""
+    v = (value or DEFAULT_ENV).strip()
+    if v in ENVIRONMENTS:
+        return v, ENVIRONMENTS[v].rstrip("/")
+    for alias, url in ENVIRONMENTS.items():
+        if url.rstrip("/") == v.rstrip("/"):
+            return alias, v.rstrip("/")
+    return "custom", v.rstrip("/")
+
+
+class PerfHistory:
+    """
+    Run-over-run timings in a local SQLite file: one `runs` row per session (git SHA, browser,
+    environment), per-test duration/outcome/WebDriver command count in `tests`, and the
+    test's top-level actions (RetryPolicy summary) in `steps`. Keep the file as a CI cache.
+
+    regressions() compares this run's passed tests with their median over the last N runs on
+    the same browser and environment.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cache/perf_history.sqlite", browser: str = "",
+                 env: str = DEFAULT_ENV, sha: Optional[str] = None):
+        self.path = Path(path)
+        self.browser = browser
+        self.env, self.base_url = env_alias(env)
+        self.sha = git_sha() if sha is None else sha
+        self.started = time.time()
+        self.run_id: Optional[int] = None
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    def record_test(self, nodeid: str, outcome: str, duration_s: float, commands: Optional[int] = None,
+                    steps: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.tests[nodeid] = {"outcome": outcome, "duration_s": round(duration_s, 3),
+                              "commands": commands, "steps": steps or {}}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def save(self) -> Optional[int]:
+        """Write this run (one transaction); returns its run id."""
+        if not self.tests:
+            return None
+        conn = self._connect()
+        try:
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO runs (started_at, git_sha, browser, env, base_url, tests, duration_s) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)), self.sha, self.browser,
+                     self.env, self.base_url, len(self.tests), round(time.time() - self.started, 1)))
+                self.run_id = cur.lastrowid
+                conn.executemany(
+                    "INSERT INTO tests (run_id, nodeid, outcome, duration_s, commands) VALUES (?, ?, ?, ?, ?)",
+                    [(self.run_id, n, t["outcome"], t["duration_s"], t["commands"]) for n, t in self.tests.items()])
+                conn.executemany(
+                    "INSERT INTO steps (run_id, nodeid, action, count, total_s, max_s, failed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(self.run_id, n, action, s["count"], s["total"], s["max"], s["failed"])
+                     for n, t in self.tests.items() for action, s in t["steps"].items()])
+        finally:
+            conn.close()
+        return self.run_id
+
+    def regressions(self, runs: int = 10, threshold: float = 0.2, min_delta_s: float = 0.5,
+                    min_runs: int = 3) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        (tests compared, regressions): passed tests slower than their median over the last `runs`
+        earlier runs (same browser/env) by more than `threshold` (0.2 = +20%) and `min_delta_s`.
+        Tests with fewer than `min_runs` earlier passes are not judged. Call before save().
+        """
+        current = {n: t for n, t in self.tests.items() if t["outcome"] == "passed"}
+        if not current or not self.path.exists():
+            return 0, []
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT t.nodeid, t.duration_s, t.commands FROM tests t WHERE t.outcome = 'passed' AND t.run_id IN "
+                "(SELECT id FROM runs WHERE browser = ? AND env = ? ORDER BY id DESC LIMIT ?)",
+                (self.browser, self.env, runs)).fetchall()
+        finally:
+            conn.close()
+        past: Dict[str, List[Tuple[float, Optional[int]]]] = {}
+        for nodeid, duration, commands in rows:
+            if nodeid in current:
+                past.setdefault(nodeid, []).append((duration, commands))
+        compared, out = 0, []
+        for nodeid, history in past.items():
+            if len(history) < min_runs:
+                continue
+            compared += 1
+            median = statistics.median(d for d, _ in history)
+            now = current[nodeid]["duration_s"]
+            if now - median < min_delta_s or now <= median * (1 + threshold):
+                continue
+            counts = [c for _, c in history if c is not None]
+            out.append({
+                "nodeid": nodeid, "duration_s": now, "median_s": round(median, 3), "runs": len(history),
+                "change": round(now / median - 1, 3) if median else None,
+                "commands": current[nodeid]["commands"],
+                "median_commands": statistics.median(counts) if counts else None,
+            })
+        out.sort(key=lambda r: r["median_s"] - r["duration_s"])
+        return compared, out
+
+
+def describe(r: Dict[str, Any]) -> str:
+    """One summary line for a regressions() entry."""
+    change = f" (+{r['change']:.0%})" if r["change"] is not None else ""
+    line = f"{r['nodeid']}: {r['duration_s']:.2f}s vs median {r['median_s']:.2f}s{change} over {r['runs']} runs"
+    if r["commands"] is not None and r["median_commands"] is not None:
+        line += f"; {r['commands']} WebDriver commands vs {r['median_commands']:g}"
+    return line
@@ -0,0 +1,216 @@
+# utils/screenshots.py
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import io
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from allure_commons import plugin_manager
+from allure_commons.types import AttachmentType
+from PIL import Image
+
+from core.logger import get_logger
+
+log = get_logger("Snapshots")
+
+SNAPSHOT_FORMATS = ("webp", "jpeg", "png")
+
+# format -> (attachment type/mime, file extension, Pillow format)
+_IMAGE_TYPES = {
+    "webp": ("image/webp", "webp", "WEBP"),
+    "jpeg": (AttachmentType.JPG, None, "JPEG"),
+    "png": (AttachmentType.PNG, None, "PNG"),
+}
+_HTML = (AttachmentType.HTML, None)
+_HTML_GZ = ("application/gzip", "html.gz")
+
+
+def _sha1(data: str) -> str:
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def _allure_lifecycle():
+    """allure-pytest's lifecycle when it is reporting (--alluredir given), else None."""
+    for plugin in plugin_manager.get_plugins():
+        lifecycle = getattr(plugin, "allure_logger", None)
+        if lifecycle is not None:
+            return lifecycle
+    return None
+
+
+class SnapshotService:
+    """
+    Failure snapshots (screenshot + page source) for the Allure report, off the test thread:
+      - the test thread only captures (base64 screenshot, page_source), hashes, and adds the
+        attachment entries to the step that is open right now (the one that failed);
+      - a small worker pool decodes, downscales and re-encodes the screenshot (WebP/JPEG/PNG)
+        and writes the attachment files while the test goes on; page source is attached as
+        text/html, gzipped only when larger than `gzip_html_over` bytes;
+      - a screenshot or page source identical to the test's previous snapshot is not attached
+        again, and a test gets at most `max_per_test` snapshots (0 = no limit).
+    Without an active Allure run nothing is captured at all.
+    """
+
+    def __init__(self, image_format: str = "webp", quality: int = 70, max_width: int = 1280,
+                 max_per_test: int = 3, workers: int = 2, gzip_html_over: int = 256 * 1024):
+        image_format = (image_format or "webp").lower()
+        if image_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"snapshot format must be one of {SNAPSHOT_FORMATS}; got {image_format!r}")
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.max_per_test = max_per_test
+        self.workers = max(1, workers)
+        self.gzip_html_over = gzip_html_over
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self._test: Optional[str] = None
+        self._last: Tuple[Optional[str], Optional[str]] = (None, None)  # (screenshot, html) hashes
+        self._in_test = 0
+        self.totals: Dict[str, Any] = {
+            "snapshots": 0, "duplicates": 0, "capped": 0,
+            "raw_bytes": 0, "written_bytes": 0, "capture_s": 0.0,
+        }
+
+    # ---- per test ----
+    def begin_test(self, nodeid: str) -> None:
+        self._test = nodeid
+        self._last = (None, None)
+        self._in_test = 0
+
+    def end_test(self) -> int:
+        """Snapshots taken in the test that just ended."""
+        n, self._test = self._in_test, None
+        return n
+
+    # ---- capture (test thread) ----
+    def capture(self, driver, title: str) -> bool:
+        """Snapshot the page for `title` (best-effort); False when skipped (no Allure, capped, unchanged)."""
+        lifecycle = _allure_lifecycle()
+        if lifecycle is None:
+            return False
+        if self.max_per_test and self._in_test >= self.max_per_test:
+            self.totals["capped"] += 1
+            log.info(f"Snapshot '{title}' skipped: {self.max_per_test} already taken in {self._test or 'this test'}")
+            return False
+        started = time.perf_counter()
+        try:
+            shot = driver.get_screenshot_as_base64()
+        except Exception:
+            shot = None
+        try:
+            html = driver.page_source
+        except Exception:
+            html = None
+        if not shot and not html:
+            return False
+        hashes = (_sha1(shot) if shot else None, _sha1(html) if html else None)
+        if shot and hashes[0] == self._last[0]:
+            shot = None
+        if html and hashes[1] == self._last[1]:
+            html = None
+        self._last = (hashes[0] or self._last[0], hashes[1] or self._last[1])
+        if not shot and not html:
+            self.totals["duplicates"] += 1
+            self.totals["capture_s"] += time.perf_counter() - started
+            log.info(f"Snapshot '{title}' skipped: page unchanged since the previous snapshot")
+            return False
+
+        if shot:
+            mime, ext, _ = _IMAGE_TYPES[self.image_format]
+            self._submit(lifecycle, self._encode_image, shot, f"{title} - screenshot", mime, ext)
+        if html:
+            gz = len(html) > self.gzip_html_over
+            self._submit(lifecycle, self._encode_html if gz else self._plain_html, html,
+                         f"{title} - page source", *(_HTML_GZ if gz else _HTML))
+        self._in_test += 1
+        self.totals["snapshots"] += 1
+        self.totals["capture_s"] += time.perf_counter() - started
+        return True
+
+    # ---- attach (test thread) + encode/write (workers) ----
+    def _submit(self, lifecycle, encode, data: str, name: str, attachment_type, extension) -> None:
+        # the entry goes into the currently open step now; its file is written once encoded
+        file_name = lifecycle._attach(uuid4(), name=name, attachment_type=attachment_type, extension=extension)
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="snapshot")
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(self._pool.submit(self._write, encode, data, name, file_name))
+
+    def _write(self, encode, data: str, name: str, file_name: str) -> None:
+        try:
+            raw, body = encode(data)
+            plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+        except Exception as e:
+            log.warning(f"Snapshot attachment '{name}' not written: {e}")
+            return
+        with self._lock:
+            self.totals["raw_bytes"] += raw
+            self.totals["written_bytes"] += len(body)
+
+    def flush(self) -> None:
+        """Wait until every captured snapshot has been written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def _encode_image(self, shot: str) -> Tuple[int, bytes]:
+        png = base64.b64decode(shot)
+        img = Image.open(io.BytesIO(png))
+        if self.image_format == "png" and not (self.max_width and img.width > self.max_width):
+            return len(png), png
+        if self.max_width and img.width > self.max_width:
+            img = img.resize((self.max_width, max(1, round(img.height * self.max_width / img.width))))
+        out = io.BytesIO()
+        pil_format = _IMAGE_TYPES[self.image_format][2]
+        if pil_format == "PNG":
+            img.save(out, pil_format, optimize=True)
+        else:
+            img.convert("RGB").save(out, pil_format, quality=self.quality)
+        return len(png), out.getvalue()
+
+    @staticmethod
+    def _plain_html(html: str) -> Tuple[int, bytes]:
+        raw = html.encode("utf-8")
+        return len(raw), raw
+
+    @staticmethod
+    def _encode_html(html: str) -> Tuple[int, bytes]:
+        raw = html.encode("utf-8")
+        return len(raw), gzip.compress(raw, compresslevel=6)
+
+    def shutdown(self) -> None:
+        """End of session: finish writing every snapshot, then stop the workers."""
+        self.flush()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def summary(self) -> str:
+        t = self.totals
+        return (f"snapshots: {t['snapshots']} attached ({t['raw_bytes'] / 1e6:.1f} MB captured -> "
+                f"{t['written_bytes'] / 1e6:.1f} MB written), {t['duplicates']} unchanged and "
+                f"{t['capped']} over the per-test cap skipped, {t['capture_s']:.2f}s on test threads")
+
+
+_SNAPSHOTS = SnapshotService()
+
+
+def get_snapshots() -> SnapshotService:
+    return _SNAPSHOTS
+
+
+def set_snapshots(service: SnapshotService) -> None:
+    """Install the session-wide snapshot service (conftest does this from Config)."""
+    global _SNAPSHOTS
+    _SNAPSHOTS = service
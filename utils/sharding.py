@@ -0,0 +1,126 @@
+# utils/sharding.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+
+def _stable_hash(key: str) -> int:
+    # not hash(): that is salted per process, and every node/worker must agree
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+def base_nodeid(nodeid: str) -> str:
+    """'tests/x.py::T::test_a[data3]' -> 'tests/x.py::T::test_a'"""
+    return nodeid.split("[", 1)[0]
+
+
+def row_key(function_id: str, row: Any, key_columns: Sequence[str] = ()) -> str:
+    """Stable key for one data row (Row or dict) of one test function."""
+    cols = list(key_columns) or list(row.keys())
+    return function_id + "|" + json.dumps([row.get(c) for c in cols], default=str, ensure_ascii=False)
+
+
+def case_key(item, key_columns: Sequence[str] = (), argname: str = "data") -> str:
+    """Cost/shard key of a collected item: its data row's key, or its nodeid when not data-driven."""
+    callspec = getattr(item, "callspec", None)
+    row = callspec.params.get(argname) if callspec else None
+    if row is not None and hasattr(row, "keys") and hasattr(row, "get"):
+        return row_key(base_nodeid(item.nodeid), row, key_columns)
+    return item.nodeid
+
+
+class CostHistory:
+    """
+    Measured call durations (seconds) per test/row key, kept as a moving average in a JSON file.
+    Shared by row sharding and the xdist scheduler; restore/save the file as a CI cache to
+    carry it between runs.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".cache/test_costs.json", alpha: float = 0.5):
+        self.path = Path(path)
+        self.alpha = alpha
+        self.costs: Dict[str, float] = {}
+        self._dirty = False
+        try:
+            self.costs = {str(k): float(v) for k, v in json.loads(self.path.read_text("utf-8")).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, key: str, default: Optional[float] = None) -> float:
+        if key in self.costs:
+            return self.costs[key]
+        return self.default if default is None else default
+
+    @property
+    def default(self) -> float:
+        """Cost assumed for unseen keys: the mean of what we know (1s when nothing is known)."""
+        return sum(self.costs.values()) / len(self.costs) if self.costs else 1.0
+
+    def record(self, key: str, seconds: float) -> None:
+        old = self.costs.get(key)
+        self.costs[key] = round(seconds if old is None else old + self.alpha * (seconds - old), 4)
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.costs, indent=0, sort_keys=True), "utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+class ShardPlanner:
+    """
+    Splits collected cases over `count` shards (CI nodes); this process keeps shard `index`.
+
+    Data rows are identified by their test function plus the values of `key_columns` (all
+    columns when empty), so a row keeps its identity when rows are reordered or added. A case
+    belongs to shard `stable hash of its key % count`, which every node computes the same way
+    whatever it has measured; historical cost only estimates the shard loads (and orders work
+    within a node, see the xdist scheduler), it never moves a case between shards.
+    """
+
+    def __init__(self, index: int, count: int, key_columns: Sequence[str] = (),
+                 history: Optional[CostHistory] = None):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"shard index must be in [0, {count}); got {index} of {count}")
+        self.index = index
+        self.count = count
+        self.key_columns = list(key_columns)
+        self.history = history or CostHistory()
+        self.loads = [0.0] * count
+        self.planned_functions: set = set()
+        self.kept = 0
+        self.skipped = 0
+
+    def row_key(self, function_id: str, row: Any) -> str:
+        return row_key(function_id, row, self.key_columns)
+
+    def item_key(self, item, argname: str = "data") -> str:
+        return case_key(item, self.key_columns, argname)
+
+    # ---- planning ----
+    def shard_of(self, key: str) -> int:
+        return _stable_hash(key) % self.count
+
+    def assign(self, keys: Iterable[str]) -> List[bool]:
+        """For each key (in order): does this shard own it? Updates the estimated shard loads."""
+        owned = []
+        for key in keys:
+            shard = self.shard_of(key)
+            self.loads[shard] += self.history.get(key)
+            owned.append(shard == self.index)
+        n_owned = sum(owned)
+        self.kept += n_owned
+        self.skipped += len(owned) - n_owned
+        return owned
+
+    def summary(self) -> str:
+        return (f"shard {self.index + 1}/{self.count}: {self.kept} cases kept, {self.skipped} skipped, "
+                f"~{self.loads[self.index]:.1f}s of ~{sum(self.loads):.1f}s planned")
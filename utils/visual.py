@@ -0,0 +1,265 @@
+# utils/visual.py
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import allure
+import numpy as np
+from allure_commons.types import AttachmentType
+from PIL import Image
+
+from core.logger import get_logger
+
+log = get_logger("Visual")
+
+_PNG_SIG = b"\x89PNG\r\n\x1a\n"
+_HASH_KEY = "visual-phash"
+
+Rect = Sequence[int]  # (x, y, width, height) in image pixels
+
+
+# ---------------- PNG ----------------
+def _chunks(data: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    if data[:8] != _PNG_SIG:
+        raise ValueError("not a PNG image")
+    pos = 8
+    while pos + 8 <= len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        yield ctype, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if ctype == b"IEND":
+            return
+
+
+def _chunk(ctype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + ctype + body + struct.pack(">I", zlib.crc32(ctype + body) & 0xFFFFFFFF)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """PNG bytes -> RGB uint8 array (height, width, 3); alpha is dropped (screenshots are opaque)."""
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+def encode_png(pixels: np.ndarray, text: Optional[Dict[str, str]] = None) -> bytes:
+    """RGB uint8 array -> PNG bytes (unfiltered rows, for diff images and the like)."""
+    height, width = pixels.shape[:2]
+    rows = np.hstack([np.zeros((height, 1), np.uint8), np.ascontiguousarray(pixels, np.uint8).reshape(height, -1)])
+    out = [_PNG_SIG, _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))]
+    out += [_chunk(b"tEXt", f"{k}\0{v}".encode("latin-1")) for k, v in (text or {}).items()]
+    out += [_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)), _chunk(b"IEND", b"")]
+    return b"".join(out)
+
+
+def png_text(data: bytes) -> Dict[str, str]:
+    """tEXt entries of a PNG (without decompressing the image)."""
+    out = {}
+    for ctype, body in _chunks(data):
+        if ctype == b"tEXt" and b"\0" in body:
+            k, v = body.split(b"\0", 1)
+            out[k.decode("latin-1")] = v.decode("latin-1")
+    return out
+
+
+def _with_text(data: bytes, key: str, value: str) -> bytes:
+    """The same PNG with a tEXt entry added before IEND."""
+    iend = data.rindex(b"IEND") - 4
+    return data[:iend] + _chunk(b"tEXt", f"{key}\0{value}".encode("latin-1")) + data[iend:]
+
+
+def _pixel_digest(data: bytes) -> str:
+    """Digest of header + compressed pixel data: equal for byte-identical screenshots, whatever the metadata."""
+    h = hashlib.sha1()
+    for ctype, body in _chunks(data):
+        if ctype in (b"IHDR", b"PLTE", b"IDAT"):
+            h.update(body)
+    return h.hexdigest()
+
+
+# ---------------- comparison ----------------
+def perceptual_hash(pixels: np.ndarray, size: int = 16) -> str:
+    """
+    Difference hash: grayscale, block-averaged to size x (size + 1), one bit per horizontal
+    neighbour pair (brighter or not). size=16 -> 256 bits, as hex. Blocks are averaged over a
+    sample grid of about 8x8 pixels each, which is all the precision the bits need.
+    """
+    step = max(1, min(pixels.shape[:2]) // (size * 8))
+    px = pixels[::step, ::step].astype(np.float32)
+    gray = px[:, :, 0] * 0.299 + px[:, :, 1] * 0.587 + px[:, :, 2] * 0.114
+    h, w = gray.shape
+    rows = np.add.reduceat(gray, (np.arange(size) * h) // size, axis=0)
+    small = np.add.reduceat(rows, (np.arange(size + 1) * w) // (size + 1), axis=1)
+    small /= np.outer(np.diff(np.append((np.arange(size) * h) // size, h)),
+                      np.diff(np.append((np.arange(size + 1) * w) // (size + 1), w)))
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes().hex()
+
+
+def hash_distance(a: str, b: str) -> int:
+    """Hamming distance of two perceptual hashes (bits)."""
+    if len(a) != len(b):
+        return max(len(a), len(b)) * 4
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def ignore_mask(shape: Tuple[int, int], regions: Iterable[Rect]) -> np.ndarray:
+    """True where pixels are compared, False inside the ignore regions (clipped to the image)."""
+    mask = np.ones(shape, bool)
+    for x, y, w, h in regions:
+        mask[max(0, int(y)):max(0, int(y + h)), max(0, int(x)):max(0, int(x + w))] = False
+    return mask
+
+
+def pixel_diff(actual: np.ndarray, expected: np.ndarray, tolerance: int = 16,
+               regions: Iterable[Rect] = ()) -> Tuple[np.ndarray, np.ndarray]:
+    """(differing, compared) masks: a pixel differs when any channel is off by more than `tolerance`."""
+    compared = ignore_mask(actual.shape[:2], regions)
+    delta = np.maximum(actual, expected)
+    delta -= np.minimum(actual, expected)  # |a - b| without leaving uint8
+    delta = np.maximum(np.maximum(delta[:, :, 0], delta[:, :, 1]), delta[:, :, 2])
+    return (delta > tolerance) & compared, compared
+
+
+def diff_image(actual: np.ndarray, differing: np.ndarray, compared: np.ndarray) -> np.ndarray:
+    """The actual image faded to gray, differing pixels red, ignored regions blue."""
+    gray = (actual.astype(np.uint16).sum(axis=2) // 3 // 3 + 170).astype(np.uint8)
+    out = np.repeat(gray[:, :, None], 3, axis=2)
+    out[~compared] = (190, 205, 255)
+    out[differing] = (255, 0, 0)
+    return out
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name.strip()).strip("_") or "page"
+
+
+class VisualBaselines:
+    """
+    Screenshots compared with stored baselines (`<directory>/<browser>/<name>.png`), cheapest check first:
+      1. byte-identical pixel data -> same (no decoding);
+      2. same perceptual hash (the baseline's is kept in a PNG tEXt entry) -> same;
+      3. otherwise a per-pixel diff outside the ignore regions: differs when more than
+         `max_diff_ratio` of the compared pixels are off by more than `tolerance` per channel.
+    A failed comparison attaches the baseline, the actual screenshot and a diff image to Allure.
+    Missing baselines are recorded from the current screenshot; update=True re-records all of them.
+    """
+
+    def __init__(self, directory: Union[str, Path] = "data/visual_baselines", update: bool = False,
+                 tolerance: int = 16, max_diff_ratio: float = 0.001, hash_size: int = 16):
+        self.directory = Path(directory)
+        self.update = update
+        self.tolerance = tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.hash_size = hash_size
+        self.totals: Dict[str, Any] = {
+            "identical": 0, "hash_match": 0, "within_tolerance": 0, "failed": 0,
+            "new": 0, "updated": 0, "ms": 0.0,
+        }
+
+    def path(self, name: str, browser: str = "") -> Path:
+        return self.directory / _safe_name(browser or "any") / f"{_safe_name(name)}.png"
+
+    def _save(self, path: Path, png: bytes, phash: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(_with_text(png, _HASH_KEY, phash))
+        os.replace(tmp, path)
+
+    def compare(self, png: bytes, name: str, browser: str = "", ignore: Iterable[Rect] = (),
+                tolerance: Optional[int] = None, max_diff_ratio: Optional[float] = None) -> Dict[str, Any]:
+        """
+        -> {"name", "status", "baseline", "hash_distance", "diff_pixels", "diff_ratio", "elapsed_ms", "message"};
+        status: identical | hash_match | within_tolerance | failed | new | updated.
+        """
+        started = time.perf_counter()
+        tolerance = self.tolerance if tolerance is None else tolerance
+        max_diff_ratio = self.max_diff_ratio if max_diff_ratio is None else max_diff_ratio
+        path = self.path(name, browser)
+        result: Dict[str, Any] = {"name": name, "baseline": str(path), "hash_distance": 0,
+                                  "diff_pixels": 0, "diff_ratio": 0.0, "message": ""}
+
+        baseline = None if self.update else (path.read_bytes() if path.exists() else None)
+        if baseline is not None and _pixel_digest(baseline) == _pixel_digest(png):
+            return self._done(result, "identical", started)
+
+        actual = decode_png(png)
+        phash = perceptual_hash(actual, self.hash_size)
+        if baseline is None:
+            self._save(path, png, phash)
+            status = "updated" if self.update else "new"
+            result["message"] = f"baseline {'updated' if self.update else 'recorded'}: {path}"
+            log.info(f"Visual '{name}': {result['message']}")
+            return self._done(result, status, started)
+
+        expected_hash = png_text(baseline).get(_HASH_KEY)
+        expected = None
+        if expected_hash is None:
+            expected = decode_png(baseline)
+            expected_hash = perceptual_hash(expected, self.hash_size)
+        result["hash_distance"] = hash_distance(phash, expected_hash)
+        if result["hash_distance"] == 0:
+            return self._done(result, "hash_match", started)
+
+        expected = decode_png(baseline) if expected is None else expected
+        if expected.shape != actual.shape:
+            result["message"] = (f"visual '{name}' differs: size {actual.shape[1]}x{actual.shape[0]}, "
+                                 f"baseline {expected.shape[1]}x{expected.shape[0]} ({path})")
+            self._attach(name, baseline, png, None)
+            return self._done(result, "failed", started)
+
+        differing, compared = pixel_diff(actual, expected, tolerance, ignore)
+        n = int(differing.sum())
+        result["diff_pixels"] = n
+        result["diff_ratio"] = round(n / max(1, int(compared.sum())), 6)
+        if result["diff_ratio"] <= max_diff_ratio:
+            return self._done(result, "within_tolerance", started)
+
+        ys, xs = np.nonzero(differing)
+        result["message"] = (f"visual '{name}' differs: {n} pixels ({result['diff_ratio']:.3%} > {max_diff_ratio:.3%}) "
+                             f"in x {xs.min()}..{xs.max()}, y {ys.min()}..{ys.max()} (tolerance {tolerance}; {path})")
+        self._attach(name, baseline, png, encode_png(diff_image(actual, differing, compared)))
+        return self._done(result, "failed", started)
+
+    def _done(self, result: Dict[str, Any], status: str, started: float) -> Dict[str, Any]:
+        ms = (time.perf_counter() - started) * 1000
+        result["status"] = status
+        result["elapsed_ms"] = round(ms, 2)
+        self.totals[status] += 1
+        self.totals["ms"] += ms
+        log.info(f"Visual '{result['name']}': {status} in {ms:.1f}ms")
+        return result
+
+    @staticmethod
+    def _attach(name: str, baseline: bytes, actual: bytes, diff: Optional[bytes]) -> None:
+        allure.attach(baseline, name=f"{name} - baseline", attachment_type=AttachmentType.PNG)
+        allure.attach(actual, name=f"{name} - actual", attachment_type=AttachmentType.PNG)
+        if diff is not None:
+            allure.attach(diff, name=f"{name} - diff", attachment_type=AttachmentType.PNG)
+
+    def summary(self) -> str:
+        t = self.totals
+        compared = t["identical"] + t["hash_match"] + t["within_tolerance"] + t["failed"]
+        images = compared + t["new"] + t["updated"]
+        return (f"visual: {compared} compared ({t['identical']} identical, {t['hash_match']} hash match, "
+                f"{t['within_tolerance']} within tolerance, {t['failed']} failed), {t['new']} new / "
+                f"{t['updated']} updated baselines, {t['ms'] / max(1, images):.1f}ms per image")
+
+
+_VISUAL = VisualBaselines()
+
+
+def get_visual() -> VisualBaselines:
+    return _VISUAL
+
+
+def set_visual(baselines: VisualBaselines) -> None:
+    """Install the session-wide baselines (conftest does this from Config)."""
+    global _VISUAL
+    _VISUAL = baselines
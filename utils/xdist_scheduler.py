@@ -0,0 +1,141 @@
+# utils/xdist_scheduler.py
+from __future__ import annotations
+
+import ast
+import time
+from functools import lru_cache
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+from xdist.scheduler import LoadScheduling
+
+from utils.sharding import CostHistory, base_nodeid
+
+
+@lru_cache(maxsize=None)
+def _module_page_objects(path: str) -> Dict[str, FrozenSet[str]]:
+    """{'Class::test_fn' or 'test_fn': page object classes it uses} for one test file (static, no import)."""
+    try:
+        tree = ast.parse(Path(path).read_text("utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    pages = {alias.asname or alias.name
+             for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and (node.module or "").startswith("pages")
+             for alias in node.names}
+    helpers: Dict[str, FrozenSet[str]] = {}
+    out: Dict[str, FrozenSet[str]] = {}
+
+    def used(fn) -> FrozenSet[str]:
+        names = {n.id for n in ast.walk(fn) if isinstance(n, ast.Name)}
+        # precondition helpers (module-level functions) count for the tests calling them
+        return frozenset(names & pages).union(*(helpers.get(n, frozenset()) for n in names))
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and not node.name.startswith("test"):
+            helpers[node.name] = frozenset({n.id for n in ast.walk(node) if isinstance(n, ast.Name)} & pages)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+            out[node.name] = used(node)
+        elif isinstance(node, ast.ClassDef):
+            for fn in node.body:
+                if isinstance(fn, ast.FunctionDef) and fn.name.startswith("test"):
+                    out[f"{node.name}::{fn.name}"] = used(fn)
+    return out
+
+
+def page_objects(nodeid: str, rootdir: Path = Path(".")) -> FrozenSet[str]:
+    path, _, rest = base_nodeid(nodeid).partition("::")
+    return _module_page_objects(str(rootdir / path)).get(rest, frozenset())
+
+
+class DurationEstimator:
+    """
+    Expected duration per nodeid: its own history, else the mean of known tests using the same
+    page objects (then any shared page object, then the same file), else the overall mean.
+    """
+
+    def __init__(self, history: CostHistory, rootdir: Path = Path(".")):
+        self.history = history
+        self.rootdir = rootdir
+        self.estimated = 0  # how many tests had no history of their own
+
+    def estimate(self, nodeids: Sequence[str]) -> List[float]:
+        known = {n: self.history.costs[n] for n in nodeids if n in self.history.costs}
+        pages = {n: page_objects(n, self.rootdir) for n in nodeids}
+        out = []
+        for n in nodeids:
+            if n in known:
+                out.append(known[n])
+                continue
+            self.estimated += 1
+            out.append(self._similar(n, pages, known))
+        return out
+
+    def _similar(self, nodeid: str, pages: Dict[str, FrozenSet[str]], known: Dict[str, float]) -> float:
+        mine = pages[nodeid]
+        same = [s for k, s in known.items() if mine and pages[k] == mine]
+        if not same and mine:
+            best = max((len(mine & pages[k]) for k in known), default=0)
+            same = [s for k, s in known.items() if best and len(mine & pages[k]) == best]
+        if not same:
+            path = nodeid.split("::", 1)[0]
+            same = [s for k, s in known.items() if k.split("::", 1)[0] == path]
+        return sum(same) / len(same) if same else self.history.default
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    xdist 'load' scheduling, but tests are handed out longest-first (from recorded durations), a
+    couple at a time, so long UI flows start early and no worker is left with one at the end.
+    """
+
+    def __init__(self, config, log=None, history: Optional[CostHistory] = None):
+        super().__init__(config, log)
+        self.estimator = DurationEstimator(history or CostHistory(), Path(str(config.rootpath)))
+        self.predicted_s: Optional[float] = None
+        self.started: Optional[float] = None
+        self.workers = 0
+        if self.maxschedchunk is None:
+            # keep each worker's queue short so the order stays close to longest-first
+            self.maxschedchunk = 2
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        if self.collection is not None:
+            return super().schedule()
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        collection = next(iter(self.node2collection.values()))
+        estimates = self.estimator.estimate(collection)
+        self.collection = collection
+        self.pending[:] = sorted(range(len(collection)), key=lambda i: (-estimates[i], i))
+        self.started = time.monotonic()
+        if not collection:
+            return
+        self.workers = len(self.nodes)
+        self.predicted_s = self._makespan([estimates[i] for i in self.pending], self.workers)
+
+        # longest tests start first, one per worker per round; the rest flow in via check_schedule
+        nodes = cycle(self.nodes)
+        for _ in range(min(len(self.pending), 2 * len(self.nodes))):
+            self._send_tests(next(nodes), 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    @staticmethod
+    def _makespan(durations: Sequence[float], workers: int) -> float:
+        loads = [0.0] * max(1, workers)
+        for d in durations:
+            loads[loads.index(min(loads))] += d
+        return max(loads)
+
+    def report(self) -> Optional[str]:
+        if self.predicted_s is None or self.started is None:
+            return None
+        actual = time.monotonic() - self.started
+        return (f"xdist duration schedule: predicted ~{self.predicted_s:.1f}s, actual {actual:.1f}s "
+                f"over {self.workers} workers ({self.estimator.estimated} tests had no history)")